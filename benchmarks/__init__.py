@@ -0,0 +1 @@
+"""Benchmarks for the Wakapi SDK and MCP tools."""
@@ -0,0 +1,223 @@
+"""
+Performance regression gate.
+
+Compares benchmark results against a stored baseline and exits non-zero when
+a tracked metric regresses beyond its tolerance. Without `--results` the
+suite is rerun with the baseline's configuration first, on a synthetic
+dataset ending on the same day as the baseline's:
+
+    python -m benchmarks.compare baseline.json
+    python -m benchmarks.compare baseline.json --results results.json
+
+Tracked metrics are p50/p95 latency, peak traced allocation, peak RSS and
+upstream Wakapi requests per call. Upstream requests have zero tolerance by
+default: a tool that starts making more Wakapi calls fails the gate even if
+it got no slower against the in-process fake.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import Any, Optional
+
+from .suite import SuiteConfig, run_suite
+
+LATENCY = "latency"
+ALLOCATIONS = "allocations"
+RSS = "rss"
+UPSTREAM = "upstream_requests"
+
+
+@dataclass
+class Tolerances:
+    """Allowed relative increase per metric kind."""
+
+    latency: float = 0.25
+    allocations: float = 0.10
+    rss: float = 0.10
+    upstream_requests: float = 0.0
+    # Latency changes smaller than this are treated as noise
+    latency_floor_seconds: float = 0.001
+
+    def for_kind(self, kind: str) -> float:
+        """Return the relative tolerance of a metric kind."""
+        return getattr(self, kind)
+
+
+@dataclass
+class Comparison:
+    """Baseline and current value of one tracked metric."""
+
+    metric: str
+    kind: str
+    baseline: Optional[float]
+    current: Optional[float]
+    limit: Optional[float]
+
+    @property
+    def regressed(self) -> bool:
+        """Whether the current value exceeds the allowed limit."""
+        if self.baseline is None or self.current is None or self.limit is None:
+            return False
+        return self.current > self.limit
+
+    @property
+    def change(self) -> Optional[float]:
+        """Relative change against the baseline."""
+        if self.baseline is None or self.current is None:
+            return None
+        if self.baseline == 0:
+            return 0.0 if self.current == 0 else float("inf")
+        return self.current / self.baseline - 1
+
+
+def tracked_metrics(results: dict[str, Any]) -> dict[str, tuple[str, float]]:
+    """Flatten a results document into `{metric: (kind, value)}`."""
+    metrics: dict[str, tuple[str, float]] = {}
+    for name, tool in results.get("tools", {}).items():
+        if "skipped" in tool:
+            continue
+        prefix = f"tools.{name}"
+        metrics[f"{prefix}.latency_p50"] = (LATENCY, tool["latency_seconds"]["p50"])
+        metrics[f"{prefix}.latency_p95"] = (LATENCY, tool["latency_seconds"]["p95"])
+        metrics[f"{prefix}.alloc_peak_bytes"] = (ALLOCATIONS, tool["alloc_peak_bytes"])
+        metrics[f"{prefix}.upstream_requests"] = (UPSTREAM, tool["upstream_requests"])
+        for endpoint, count in tool.get("upstream_by_endpoint", {}).items():
+            metrics[f"{prefix}.upstream.{endpoint}"] = (UPSTREAM, count)
+    for name, method in results.get("client", {}).items():
+        prefix = f"client.{name}"
+        metrics[f"{prefix}.latency_p50"] = (LATENCY, method["total_seconds"]["p50"])
+        metrics[f"{prefix}.latency_p95"] = (LATENCY, method["total_seconds"]["p95"])
+        metrics[f"{prefix}.upstream_requests"] = (
+            UPSTREAM,
+            method["upstream_requests"],
+        )
+    for name, case in results.get("memory", {}).items():
+        prefix = f"memory.{name}"
+        metrics[f"{prefix}.alloc_peak_bytes"] = (ALLOCATIONS, case["alloc_peak_bytes"])
+        metrics[f"{prefix}.peak_rss_bytes"] = (RSS, case["peak_rss_bytes"])
+        metrics[f"{prefix}.upstream_requests"] = (UPSTREAM, case["upstream_requests"])
+    return metrics
+
+
+def compare(
+    baseline: dict[str, Any],
+    current: dict[str, Any],
+    tolerances: Optional[Tolerances] = None,
+) -> list[Comparison]:
+    """Compare every tracked metric of current against baseline."""
+    tolerances = tolerances or Tolerances()
+    base = tracked_metrics(baseline)
+    now = tracked_metrics(current)
+    comparisons = []
+    for metric in sorted(base.keys() | now.keys()):
+        kind = (base.get(metric) or now[metric])[0]
+        base_value = base[metric][1] if metric in base else None
+        parent, _, _ = metric.partition(".upstream.")
+        if base_value is None and f"{parent}.upstream_requests" in base:
+            # A tool calling an endpoint it never called before is a regression
+            base_value = 0.0
+        current_value = now[metric][1] if metric in now else None
+        limit = None
+        if base_value is not None:
+            limit = base_value * (1 + tolerances.for_kind(kind))
+            if kind == LATENCY:
+                limit = max(limit, base_value + tolerances.latency_floor_seconds)
+        comparisons.append(Comparison(metric, kind, base_value, current_value, limit))
+    return comparisons
+
+
+def _format(value: Optional[float], kind: str) -> str:
+    if value is None:
+        return "-"
+    if kind == LATENCY:
+        return f"{value * 1000:.2f}ms"
+    if kind in (ALLOCATIONS, RSS):
+        return f"{value / 1024 / 1024:.1f}MiB"
+    return f"{value:g}"
+
+
+def report(comparisons: list[Comparison], verbose: bool = False) -> str:
+    """Render comparisons as a text table; only changes unless verbose."""
+    lines = [f"{'metric':<55} {'baseline':>12} {'current':>12} {'change':>8}"]
+    for item in comparisons:
+        missing = item.baseline is None or item.current is None
+        if not (verbose or item.regressed or missing):
+            continue
+        change = item.change
+        if missing:
+            status = "new" if item.baseline is None else "missing"
+        else:
+            status = "REGRESSED" if item.regressed else ""
+        lines.append(
+            f"{item.metric:<55} {_format(item.baseline, item.kind):>12} "
+            f"{_format(item.current, item.kind):>12} "
+            f"{'' if change is None else f'{change:+.0%}':>8} {status}"
+        )
+    regressions = sum(item.regressed for item in comparisons)
+    lines.append(f"{regressions} regression(s) in {len(comparisons)} metrics")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(
+        description="Compare benchmark results against a baseline"
+    )
+    parser.add_argument("baseline", help="Baseline results JSON")
+    parser.add_argument(
+        "--results", help="Results JSON to check (default: rerun the suite)"
+    )
+    parser.add_argument("--save", help="Write the rerun results to this file")
+    defaults = Tolerances()
+    parser.add_argument("--latency-tolerance", type=float, default=defaults.latency)
+    parser.add_argument(
+        "--allocation-tolerance", type=float, default=defaults.allocations
+    )
+    parser.add_argument("--rss-tolerance", type=float, default=defaults.rss)
+    parser.add_argument(
+        "--upstream-tolerance", type=float, default=defaults.upstream_requests
+    )
+    parser.add_argument(
+        "--latency-floor-ms",
+        type=float,
+        default=defaults.latency_floor_seconds * 1000,
+    )
+    parser.add_argument("--verbose", "-v", action="store_true")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING, force=True)
+
+    baseline = json.loads(Path(args.baseline).read_text())
+    if args.results:
+        current = json.loads(Path(args.results).read_text())
+    else:
+        # Rerun with the baseline's workload so the numbers are comparable
+        known = {item.name for item in fields(SuiteConfig)}
+        config = SuiteConfig(
+            **{key: value for key, value in baseline["config"].items() if key in known}
+        )
+        current = asyncio.run(run_suite(config, memory=bool(baseline.get("memory"))))
+        if args.save:
+            Path(args.save).write_text(json.dumps(current, indent=2) + "\n")
+
+    comparisons = compare(
+        baseline,
+        current,
+        Tolerances(
+            latency=args.latency_tolerance,
+            allocations=args.allocation_tolerance,
+            rss=args.rss_tolerance,
+            upstream_requests=args.upstream_tolerance,
+            latency_floor_seconds=args.latency_floor_ms / 1000,
+        ),
+    )
+    print(report(comparisons, args.verbose))
+    sys.exit(1 if any(item.regressed for item in comparisons) else 0)
+
+
+if __name__ == "__main__":
+    main()
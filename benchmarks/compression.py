@@ -0,0 +1,139 @@
+"""
+Compression benchmark for WakapiClient.
+
+Fetches large heartbeats and summaries payloads from the local fake Wakapi
+with each Accept-Encoding setting and reports bytes on the wire, decoded
+bytes, decode time and an estimated transfer time over a WAN link.
+
+    python -m benchmarks.compression --heartbeats 20000 --bandwidth-mbps 20
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from datetime import timedelta
+from typing import Any
+
+import httpx
+
+from wakapi_sdk.client import WakapiClient, WakapiConfig
+from wakapi_sdk.core.compression import CompressionConfig, supported_encodings
+
+from .fake_wakapi import FakeWakapi
+from .synthetic import SyntheticConfig, SyntheticDataset
+
+
+async def run_setting(
+    app: FakeWakapi, accept_encoding: str, repeat: int, days: int
+) -> dict[str, Any]:
+    """Measure one Accept-Encoding setting."""
+    client = WakapiClient(
+        WakapiConfig(
+            base_url="http://fake-wakapi",
+            api_key="bench",
+            compression=CompressionConfig(accept_encoding=accept_encoding),
+        ),
+        transport=httpx.ASGITransport(app=app),
+    )
+    today = app.today
+    start = (today - timedelta(days=days - 1)).isoformat()
+    # Warm the server-side body cache so only the client is measured
+    await client.get_heartbeats(date=today.isoformat())
+    await client.get_summaries(start=start, end=today.isoformat())
+    client.metrics.reset()
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        await client.get_heartbeats(date=today.isoformat())
+        await client.get_summaries(start=start, end=today.isoformat())
+    elapsed = time.perf_counter() - started
+    await client.client.aclose()
+
+    snapshot = client.metrics.snapshot()
+    compressed = sum(
+        value
+        for key, value in snapshot["counters"].items()
+        if key.startswith("content_bytes_compressed")
+    )
+    decoded = sum(
+        value
+        for key, value in snapshot["counters"].items()
+        if key.startswith("content_bytes_decoded")
+    )
+    decode_seconds = sum(
+        summary["sum"]
+        for key, summary in snapshot["samples"].items()
+        if key.startswith("content_decode_seconds")
+    )
+    requests = repeat * 2
+    return {
+        "accept_encoding": accept_encoding,
+        "requests": requests,
+        "bytes_on_wire": compressed / requests,
+        "bytes_decoded": decoded / requests,
+        "ratio": decoded / compressed if compressed else 0.0,
+        "decode_ms": decode_seconds / requests * 1000,
+        "client_ms": elapsed / requests * 1000,
+    }
+
+
+def estimate_wan_ms(result: dict[str, Any], bandwidth_mbps: float, rtt_ms: float):
+    """Estimate per-request latency over a link of the given bandwidth and RTT."""
+    transfer_ms = result["bytes_on_wire"] * 8 / (bandwidth_mbps * 1_000_000) * 1000
+    return rtt_ms + transfer_ms + result["client_ms"]
+
+
+async def main_async(args: argparse.Namespace) -> list[dict[str, Any]]:
+    """Run the benchmark for every setting."""
+    app = FakeWakapi(
+        SyntheticDataset(
+            SyntheticConfig(
+                seed=args.seed, days=args.days, heartbeats_per_day=args.heartbeats
+            )
+        )
+    )
+    settings = ["identity"] + supported_encodings()
+    settings.append(", ".join(reversed(supported_encodings())))
+    results = []
+    for setting in settings:
+        result = await run_setting(app, setting, args.repeat, args.days)
+        result["estimated_wan_ms"] = estimate_wan_ms(
+            result, args.bandwidth_mbps, args.rtt_ms
+        )
+        results.append(result)
+    return results
+
+
+def main() -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--heartbeats", type=int, default=5000)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--bandwidth-mbps", type=float, default=20.0)
+    parser.add_argument("--rtt-ms", type=float, default=40.0)
+    parser.add_argument("--json", action="store_true", help="Print raw JSON")
+    args = parser.parse_args()
+
+    results = asyncio.run(main_async(args))
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(
+        f"{'accept-encoding':<20} {'wire KiB':>10} {'decoded KiB':>12} "
+        f"{'ratio':>6} {'decode ms':>10} {'client ms':>10} {'WAN ms':>8}"
+    )
+    for r in results:
+        print(
+            f"{r['accept_encoding']:<20} {r['bytes_on_wire'] / 1024:>10.1f} "
+            f"{r['bytes_decoded'] / 1024:>12.1f} {r['ratio']:>6.1f} "
+            f"{r['decode_ms']:>10.2f} {r['client_ms']:>10.2f} "
+            f"{r['estimated_wan_ms']:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
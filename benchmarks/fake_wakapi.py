@@ -0,0 +1,641 @@
+"""
+Local stand-in for a Wakapi server.
+
+`FakeWakapi` is a plain ASGI application implementing every endpoint that
+WakapiClient calls, backed by a `SyntheticDataset`. It is meant for offline
+load testing: latency, error injection and rate limiting are configurable,
+responses honour `Accept-Encoding` (gzip, deflate and, when installed,
+brotli) and carry an `ETag`, and encoded bodies are cached so the server side
+does not dominate client measurements.
+
+Run it standalone with:
+
+    python -m benchmarks.fake_wakapi --port 3000 --days 365
+"""
+
+import argparse
+import asyncio
+import base64
+import gzip
+import hashlib
+import json
+import random
+import re
+import time
+import zlib
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Optional
+from urllib.parse import parse_qs, quote
+
+from .synthetic import SyntheticConfig, SyntheticDataset
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on the installed extras
+    brotli = None
+
+
+API_PREFIX = "/api/compat/wakatime/v1"
+HEALTH_PATH = "/api/health"
+
+
+@dataclass
+class FakeWakapiConfig:
+    """Fake Wakapi behaviour configuration data class."""
+
+    # Fixed delay added to every response, plus uniform jitter on top
+    latency_seconds: float = 0.0
+    latency_jitter_seconds: float = 0.0
+    # Per-endpoint delay overriding latency_seconds, e.g. {"get_stats": 0.2}
+    endpoint_latency: dict[str, float] = field(default_factory=dict)
+    # Fraction of requests answered with error_status
+    error_rate: float = 0.0
+    error_status: int = 503
+    # Restrict error injection to these endpoints; None means all
+    error_endpoints: Optional[list[str]] = None
+    # Server-side token bucket; None disables rate limiting
+    rate_limit_per_second: Optional[float] = None
+    rate_limit_burst: int = 10
+    # Require this API key when set
+    api_key: Optional[str] = None
+    fault_seed: int = 0
+    body_cache_size: int = 256
+
+
+class ApiRequestError(Exception):
+    """Error answered to the client with a status code."""
+
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def negotiate_encoding(accept_encoding: str) -> str:
+    """Pick the first acceptable encoding the server supports."""
+    supported = {"gzip", "deflate"} | ({"br"} if brotli is not None else set())
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        if params.strip() in ("q=0", "q=0.0"):
+            continue
+        if name in supported:
+            return name
+    return "identity"
+
+
+def _encode(body: bytes, encoding: str) -> bytes:
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=6)
+    if encoding == "deflate":
+        return zlib.compress(body, 6)
+    if encoding == "br":
+        return brotli.compress(body, quality=5)
+    return body
+
+
+def resolve_range(name: str, today: date, first_day: date) -> tuple[date, date]:
+    """Translate a Wakapi range identifier into start and end dates."""
+    if name == "today":
+        return today, today
+    if name == "yesterday":
+        yesterday = today - timedelta(days=1)
+        return yesterday, yesterday
+    if name == "week":
+        return today - timedelta(days=today.weekday()), today
+    if name == "month":
+        return today.replace(day=1), today
+    if name == "year":
+        return today.replace(month=1, day=1), today
+    if name == "last_year":
+        return date(today.year - 1, 1, 1), date(today.year - 1, 12, 31)
+    if name in ("any", "all_time"):
+        return first_day, today
+    days = {
+        "7_days": 7,
+        "last_7_days": 7,
+        "30_days": 30,
+        "last_30_days": 30,
+        "6_months": 183,
+        "last_6_months": 183,
+        "12_months": 365,
+        "last_12_months": 365,
+    }.get(name)
+    if days is None:
+        raise ApiRequestError(400, f"invalid range: {name}")
+    return today - timedelta(days=days - 1), today
+
+
+def _text(seconds: float) -> str:
+    return f"{int(seconds // 3600)} hrs {int(seconds % 3600 // 60)} mins"
+
+
+def _digital(seconds: float) -> str:
+    return f"{int(seconds // 3600)}:{int(seconds % 3600 // 60):02d}"
+
+
+def _entries(values: dict[str, float], total: float) -> list[dict[str, Any]]:
+    """Render seconds per name as Wakapi summary entries, largest first."""
+    return [
+        {
+            "name": name,
+            "percent": round(seconds / total * 100, 2) if total else 0.0,
+            "total_seconds": seconds,
+            "text": _text(seconds),
+            "digital": _digital(seconds),
+            "hours": int(seconds // 3600),
+            "minutes": int(seconds % 3600 // 60),
+            "seconds": int(seconds % 60),
+        }
+        for name, seconds in sorted(values.items(), key=lambda item: -item[1])
+    ]
+
+
+class FakeWakapi:
+    """ASGI application emulating the Wakapi API used by WakapiClient."""
+
+    def __init__(
+        self,
+        dataset: Optional[SyntheticDataset] = None,
+        config: Optional[FakeWakapiConfig] = None,
+    ) -> None:
+        """Initialize the server."""
+        self.dataset = dataset or SyntheticDataset()
+        self.config = config or FakeWakapiConfig()
+        self.request_counts: Counter[str] = Counter()
+        self.status_counts: Counter[int] = Counter()
+        self._faults = random.Random(self.config.fault_seed)
+        self._bodies: OrderedDict[tuple, tuple[bytes, str]] = OrderedDict()
+        self._tokens = float(self.config.rate_limit_burst)
+        self._refilled_at = time.monotonic()
+        self._routes: list[tuple[str, re.Pattern, Callable[..., dict]]] = [
+            ("get_heartbeats", re.compile(r"/users/[^/]+/heartbeats"), self.heartbeats),
+            (
+                "get_stats",
+                re.compile(r"/users/[^/]+/stats/(?P<range>[^/]+)"),
+                self.stats,
+            ),
+            ("get_summaries", re.compile(r"/users/[^/]+/summaries"), self.summaries),
+            ("get_projects", re.compile(r"/users/[^/]+/projects"), self.projects),
+            (
+                "get_project_detail",
+                re.compile(r"/users/[^/]+/projects/(?P<id>[^/]+)"),
+                self.project_detail,
+            ),
+            (
+                "get_all_time_since_today",
+                re.compile(r"/users/[^/]+/all_time_since_today"),
+                self.all_time,
+            ),
+            ("get_user", re.compile(r"/users/[^/]+"), self.user),
+            ("get_leaders", re.compile(r"/leaders"), self.leaders),
+        ]
+
+    @property
+    def today(self) -> date:
+        """Last day of the synthetic dataset."""
+        return self.dataset.end_date
+
+    def reset_counts(self) -> None:
+        """Forget request and status counts."""
+        self.request_counts.clear()
+        self.status_counts.clear()
+
+    # Endpoints
+
+    def heartbeats(self, query: dict[str, str], **_: str) -> dict[str, Any]:
+        """GET /users/{user}/heartbeats"""
+        if "date" not in query:
+            raise ApiRequestError(400, "missing date parameter")
+        try:
+            day = date.fromisoformat(query["date"])
+        except ValueError as e:
+            raise ApiRequestError(400, f"invalid date: {query['date']}") from e
+        data = self.dataset.heartbeats(day, project=query.get("project"))
+        if query.get("limit"):
+            data = data[: int(query["limit"])]
+        start = datetime.combine(day, datetime.min.time(), self.dataset.tz)
+        return {
+            "data": data,
+            "start": start.isoformat(),
+            "end": (start + timedelta(days=1)).isoformat(),
+            "timezone": self.dataset.config.timezone,
+        }
+
+    def stats(self, query: dict[str, str], range: str, **_: str) -> dict[str, Any]:
+        """GET /users/{user}/stats/{range}"""
+        start, end = resolve_range(range, self.today, self.dataset.start_date)
+        total, dims = self.dataset.totals(
+            start, end, project=query.get("project"), language=query.get("language")
+        )
+        days = (end - start).days + 1
+        username = self.dataset.config.username
+        return {
+            "data": {
+                "total_seconds": total,
+                "human_readable_total": _text(total),
+                "daily_average": total / days,
+                "human_readable_daily_average": _text(total / days),
+                "languages": _entries(dims["languages"], total),
+                "projects": _entries(dims["projects"], total),
+                "editors": _entries(dims["editors"], total),
+                "operating_systems": _entries(dims["operating_systems"], total),
+                "machines": _entries(dims["machines"], total),
+                "branches": _entries(dims["branches"], total),
+                "categories": _entries(dims["categories"], total),
+                "range": range,
+                "human_readable_range": range.replace("_", " "),
+                "start": f"{start.isoformat()}T00:00:00Z",
+                "end": f"{end.isoformat()}T23:59:59Z",
+                "status": "ok",
+                "is_coding_activity_visible": True,
+                "is_other_usage_visible": True,
+                "days_including_holidays": days,
+                "user_id": username,
+                "username": username,
+            }
+        }
+
+    def summaries(self, query: dict[str, str], **_: str) -> dict[str, Any]:
+        """GET /users/{user}/summaries"""
+        if "range" in query:
+            start, end = resolve_range(
+                query["range"], self.today, self.dataset.start_date
+            )
+        elif "start" in query and "end" in query:
+            try:
+                start = date.fromisoformat(query["start"][:10])
+                end = date.fromisoformat(query["end"][:10])
+            except ValueError as e:
+                raise ApiRequestError(400, "invalid start or end date") from e
+        else:
+            raise ApiRequestError(400, "missing range or start and end parameters")
+
+        filters = {"project": query.get("project"), "language": query.get("language")}
+        days = []
+        cumulative = 0.0
+        current = start
+        while current <= end:
+            total, dims = self.dataset.totals(current, current, **filters)
+            cumulative += total
+            days.append(
+                {
+                    **{name: _entries(dims[name], total) for name in dims},
+                    "dependencies": [],
+                    "grand_total": {
+                        "digital": _digital(total),
+                        "hours": int(total // 3600),
+                        "minutes": int(total % 3600 // 60),
+                        "text": _text(total),
+                        "total_seconds": total,
+                    },
+                    "range": {
+                        "date": current.isoformat(),
+                        "end": f"{current.isoformat()}T23:59:59Z",
+                        "start": f"{current.isoformat()}T00:00:00Z",
+                        "text": current.isoformat(),
+                        "timezone": self.dataset.config.timezone,
+                    },
+                }
+            )
+            current += timedelta(days=1)
+
+        count = max(1, len(days))
+        average = cumulative / count
+        return {
+            "cumulative_total": {
+                "decimal": f"{cumulative / 3600:.2f}",
+                "digital": _digital(cumulative),
+                "seconds": cumulative,
+                "text": _text(cumulative),
+            },
+            "daily_average": {
+                "days_including_holidays": count,
+                "days_minus_holidays": count,
+                "holidays": 0,
+                "seconds": int(average),
+                "seconds_including_other_language": int(average),
+                "text": _text(average),
+                "text_including_other_language": _text(average),
+            },
+            "data": days,
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+        }
+
+    def _project(self, name: str, last_heartbeat: float) -> dict[str, Any]:
+        created = datetime.combine(
+            self.dataset.start_date, datetime.min.time(), timezone.utc
+        )
+        return {
+            "id": quote(name, safe=""),
+            "name": name,
+            "urlencoded_name": quote(name, safe=""),
+            "created_at": created.isoformat(),
+            "last_heartbeat_at": datetime.fromtimestamp(
+                last_heartbeat, timezone.utc
+            ).isoformat(),
+            "human_readable_last_heartbeat_at": datetime.fromtimestamp(
+                last_heartbeat, timezone.utc
+            ).strftime("%Y-%m-%d %H:%M"),
+        }
+
+    def projects(self, query: dict[str, str], **_: str) -> dict[str, Any]:
+        """GET /users/{user}/projects"""
+        latest = self.dataset.last_heartbeats()
+        names = sorted(latest, key=lambda name: -latest[name])
+        if query.get("q"):
+            names = [name for name in names if query["q"].lower() in name.lower()]
+        return {"data": [self._project(name, latest[name]) for name in names]}
+
+    def project_detail(
+        self, query: dict[str, str], id: str, **_: str
+    ) -> dict[str, Any]:
+        """GET /users/{user}/projects/{id}"""
+        latest = self.dataset.last_heartbeats()
+        for name, at in latest.items():
+            if id in (name, quote(name, safe="")):
+                return {"data": self._project(name, at)}
+        raise ApiRequestError(404, f"project not found: {id}")
+
+    def _user(self, username: str) -> dict[str, Any]:
+        latest = self.dataset.last_heartbeats()
+        last_project = max(latest, key=latest.get) if latest else ""
+        last_at = (
+            datetime.fromtimestamp(latest[last_project], timezone.utc).isoformat()
+            if latest
+            else ""
+        )
+        created = datetime.combine(
+            self.dataset.start_date, datetime.min.time(), timezone.utc
+        ).isoformat()
+        return {
+            "id": username,
+            "username": username,
+            "display_name": username,
+            "full_name": username.title(),
+            "email": f"{username}@example.com",
+            "photo": "",
+            "website": "",
+            "timezone": self.dataset.config.timezone,
+            "created_at": created,
+            "modified_at": created,
+            "last_heartbeat_at": last_at,
+            "last_plugin_name": "vscode",
+            "last_project": last_project,
+            "is_email_confirmed": True,
+            "is_email_public": False,
+        }
+
+    def user(self, query: dict[str, str], **_: str) -> dict[str, Any]:
+        """GET /users/{user}"""
+        return {"data": self._user(self.dataset.config.username)}
+
+    def all_time(self, query: dict[str, str], **_: str) -> dict[str, Any]:
+        """GET /users/{user}/all_time_since_today"""
+        first, today = self.dataset.start_date, self.today
+        total, _ = self.dataset.totals(first, today)
+        return {
+            "data": {
+                "total_seconds": total,
+                "text": _text(total),
+                "is_up_to_date": True,
+                "range": {
+                    "start": f"{first.isoformat()}T00:00:00Z",
+                    "start_date": first.isoformat(),
+                    "end": f"{today.isoformat()}T23:59:59Z",
+                    "end_date": today.isoformat(),
+                    "timezone": self.dataset.config.timezone,
+                },
+            }
+        }
+
+    def leaders(self, query: dict[str, str], **_: str) -> dict[str, Any]:
+        """GET /leaders"""
+        start = self.today - timedelta(days=6)
+        total, dims = self.dataset.totals(start, self.today)
+        username = self.dataset.config.username
+        entries = []
+        # The synthetic user plus colleagues with scaled-down activity
+        for rank, (name, scale) in enumerate(
+            [(username, 1.0), ("alice", 0.8), ("bob", 0.5)], start=1
+        ):
+            seconds = total * scale
+            entries.append(
+                {
+                    "rank": rank,
+                    "running_total": {
+                        "daily_average": seconds / 7,
+                        "human_readable_daily_average": _text(seconds / 7),
+                        "human_readable_total": _text(seconds),
+                        "languages": [
+                            {"name": language, "total_seconds": value * scale}
+                            for language, value in dims["languages"].items()
+                        ],
+                        "total_seconds": seconds,
+                    },
+                    "user": self._user(name),
+                }
+            )
+        return {
+            "current_user": {"page": 1, "rank": 1, "user": entries[0]["user"]},
+            "data": entries,
+            "language": "",
+            "page": 1,
+            "range": {
+                "end_date": self.today.isoformat(),
+                "end_text": "Today",
+                "name": "last_7_days",
+                "start_date": start.isoformat(),
+                "start_text": start.isoformat(),
+                "text": "Last 7 Days",
+            },
+            "total_pages": 1,
+        }
+
+    # Request handling
+
+    def _match(self, path: str) -> tuple[str, Callable[..., dict], dict[str, str]]:
+        if path.startswith(API_PREFIX):
+            route = path[len(API_PREFIX) :].rstrip("/")
+            for endpoint, pattern, handler in self._routes:
+                match = pattern.fullmatch(route)
+                if match:
+                    return endpoint, handler, match.groupdict()
+        raise ApiRequestError(404, "not found")
+
+    def _take_token(self) -> Optional[float]:
+        """Consume a rate-limit token; return the retry delay when exhausted."""
+        rate = self.config.rate_limit_per_second
+        if not rate:
+            return None
+        now = time.monotonic()
+        self._tokens = min(
+            float(self.config.rate_limit_burst),
+            self._tokens + (now - self._refilled_at) * rate,
+        )
+        self._refilled_at = now
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return None
+        return (1.0 - self._tokens) / rate
+
+    def _authorized(self, headers: dict[str, str]) -> bool:
+        if not self.config.api_key:
+            return True
+        expected = base64.b64encode(self.config.api_key.encode()).decode()
+        return headers.get("authorization") in (
+            f"Basic {expected}",
+            f"Bearer {self.config.api_key}",
+        )
+
+    async def _delay(self, endpoint: str) -> None:
+        delay = self.config.endpoint_latency.get(endpoint, self.config.latency_seconds)
+        if self.config.latency_jitter_seconds:
+            delay += self._faults.uniform(0, self.config.latency_jitter_seconds)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _render(self, key: tuple, handler, query, params, encoding) -> tuple:
+        cached = self._bodies.get(key)
+        if cached is not None:
+            self._bodies.move_to_end(key)
+            return cached
+        raw = json.dumps(handler(query, **params)).encode()
+        cached = (_encode(raw, encoding), f'"{hashlib.sha1(raw).hexdigest()}"')
+        self._bodies[key] = cached
+        while len(self._bodies) > self.config.body_cache_size:
+            self._bodies.popitem(last=False)
+        return cached
+
+    async def __call__(self, scope, receive, send) -> None:
+        """Handle an ASGI request."""
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+
+        headers = {
+            name.decode().lower(): value.decode() for name, value in scope["headers"]
+        }
+        query_string = scope.get("query_string", b"").decode()
+        query = {key: values[0] for key, values in parse_qs(query_string).items()}
+        encoding = negotiate_encoding(headers.get("accept-encoding", ""))
+
+        if scope["path"] == HEALTH_PATH:
+            # Like Wakapi's health check: no authentication, no rate limit
+            await _respond(self, send, 200, b"app=1\ndb=1\n")
+            return
+
+        try:
+            endpoint, handler, params = self._match(scope["path"])
+            self.request_counts[endpoint] += 1
+            if not self._authorized(headers):
+                raise ApiRequestError(401, "unauthorized")
+            retry_after = self._take_token()
+            if retry_after is not None:
+                await _respond(
+                    self,
+                    send,
+                    429,
+                    b'{"error": "too many requests"}',
+                    extra=[(b"retry-after", str(max(1, round(retry_after))).encode())],
+                )
+                return
+            await self._delay(endpoint)
+            if (
+                self.config.error_rate
+                and (
+                    self.config.error_endpoints is None
+                    or endpoint in self.config.error_endpoints
+                )
+                and self._faults.random() < self.config.error_rate
+            ):
+                raise ApiRequestError(self.config.error_status, "injected failure")
+
+            key = (scope["path"], query_string, encoding)
+            body, etag = self._render(key, handler, query, params, encoding)
+        except ApiRequestError as e:
+            body = json.dumps({"error": e.message}).encode()
+            await _respond(self, send, e.status, body)
+            return
+
+        if headers.get("if-none-match") == etag:
+            await _respond(self, send, 304, b"", extra=[(b"etag", etag.encode())])
+            return
+        await _respond(
+            self, send, 200, body, encoding, extra=[(b"etag", etag.encode())]
+        )
+
+
+async def _respond(
+    app: FakeWakapi,
+    send,
+    status: int,
+    body: bytes,
+    encoding: str = "identity",
+    extra: Optional[list[tuple[bytes, bytes]]] = None,
+) -> None:
+    app.status_counts[status] += 1
+    headers = [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(body)).encode()),
+        *(extra or []),
+    ]
+    if encoding != "identity":
+        headers.append((b"content-encoding", encoding.encode()))
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
+
+
+def main() -> None:
+    """Serve the fake Wakapi over HTTP."""
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Serve a fake Wakapi API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=3000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--heartbeats-per-day", type=int, default=5000)
+    parser.add_argument("--timezone", default="UTC")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--rate-limit", type=float, default=None)
+    parser.add_argument("--rate-limit-burst", type=int, default=10)
+    parser.add_argument("--api-key", default=None)
+    args = parser.parse_args()
+
+    dataset = SyntheticDataset(
+        SyntheticConfig(
+            seed=args.seed,
+            days=args.days,
+            heartbeats_per_day=args.heartbeats_per_day,
+            timezone=args.timezone,
+        )
+    )
+    app = FakeWakapi(
+        dataset,
+        FakeWakapiConfig(
+            latency_seconds=args.latency_ms / 1000,
+            latency_jitter_seconds=args.jitter_ms / 1000,
+            error_rate=args.error_rate,
+            error_status=args.error_status,
+            rate_limit_per_second=args.rate_limit,
+            rate_limit_burst=args.rate_limit_burst,
+            api_key=args.api_key,
+        ),
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
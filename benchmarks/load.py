@@ -0,0 +1,370 @@
+"""
+Load generator for the SSE transport.
+
+Opens many concurrent MCP sessions with `MCPTestClient` against a running
+`main.py --transport sse` and replays a weighted mix of tool calls at a fixed
+target rate (open loop: calls are issued on schedule whether or not earlier
+ones finished, and latency is measured from the scheduled time so a stalled
+server is not hidden). Reports throughput, latency percentiles, error rates
+and the server's event loop lag from its `/metrics` endpoint.
+
+    python -m benchmarks.load --url http://127.0.0.1:8000/sse --sessions 200 --rate 100
+
+`--spawn` starts a fake Wakapi and an SSE server on free ports first, so a run
+needs nothing else.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from contextlib import AsyncExitStack, contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT / "src") not in sys.path:
+    sys.path.insert(0, str(ROOT / "src"))
+
+from mcp_test_client import MCPTestClient  # noqa: E402
+from wakapi_sdk.core.metrics import percentile  # noqa: E402
+
+from .suite import TOOL_CASES  # noqa: E402
+
+# Weights of the default mix, roughly what an assistant asks during a day
+DEFAULT_MIX = {
+    "get_stats": 25,
+    "get_recent_logs": 15,
+    "get_projects": 15,
+    "get_user": 10,
+    "get_all_time_since_today": 10,
+    "get_project_detail": 10,
+    "test_connection": 10,
+    "get_leaders": 5,
+}
+
+
+@dataclass
+class LoadConfig:
+    """Load test configuration data class."""
+
+    url: str = "http://127.0.0.1:8000/sse"
+    sessions: int = 100
+    # Target tool calls per second across all sessions
+    rate: float = 50.0
+    duration: float = 30.0
+    # Sessions opened at once while ramping up
+    connect_concurrency: int = 20
+    mix: dict[str, float] = field(default_factory=lambda: dict(DEFAULT_MIX))
+    seed: int = 0
+
+
+@dataclass
+class CallRecord:
+    """Outcome of one scheduled tool call."""
+
+    tool: str
+    latency: float
+    error: Optional[str] = None
+
+
+def parse_mix(spec: str) -> dict[str, float]:
+    """Parse `tool=weight,tool=weight` into a mix."""
+    mix = {}
+    for item in spec.split(","):
+        name, _, weight = item.partition("=")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+def metrics_url(sse_url: str) -> str:
+    """Derive the server's /metrics URL from its SSE URL."""
+    return str(httpx.URL(sse_url).copy_with(path="/metrics", query=None))
+
+
+async def fetch_server_metrics(url: str, reset: bool = False) -> Optional[dict]:
+    """Read, and if reset clear, the server's metrics; None if unavailable."""
+    try:
+        async with httpx.AsyncClient(timeout=10) as http:
+            response = await (http.post(url) if reset else http.get(url))
+            response.raise_for_status()
+            return response.json()
+    except (httpx.HTTPError, ValueError):
+        return None
+
+
+async def open_sessions(
+    config: LoadConfig, stack: AsyncExitStack
+) -> tuple[list[MCPTestClient], list[float], Counter]:
+    """Open the sessions, returning them with connect times and failures."""
+    semaphore = asyncio.Semaphore(config.connect_concurrency)
+    sessions: list[MCPTestClient] = []
+    connect_times: list[float] = []
+    failures: Counter[str] = Counter()
+
+    async def connect() -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                session = await stack.enter_async_context(MCPTestClient(config.url))
+            except Exception as e:
+                failures[type(e).__name__] += 1
+                return
+            connect_times.append(time.perf_counter() - started)
+            sessions.append(session)
+
+    await asyncio.gather(*(connect() for _ in range(config.sessions)))
+    return sessions, connect_times, failures
+
+
+async def run_load(config: LoadConfig) -> dict[str, Any]:
+    """Run one load test and return its report."""
+    rng = random.Random(config.seed)
+    tools = list(config.mix)
+    weights = [config.mix[name] for name in tools]
+    records: list[CallRecord] = []
+
+    async with AsyncExitStack() as stack:
+        sessions, connect_times, connect_failures = await open_sessions(config, stack)
+        if not sessions:
+            raise RuntimeError(f"No session could be opened to {config.url}")
+
+        server_url = metrics_url(config.url)
+        await fetch_server_metrics(server_url, reset=True)
+
+        async def call(session: MCPTestClient, tool: str, scheduled: float):
+            error = None
+            try:
+                await session.call_tool(tool, TOOL_CASES.get(tool, {}))
+            except Exception as e:
+                error = type(e).__name__
+            records.append(CallRecord(tool, time.perf_counter() - scheduled, error))
+
+        tasks = []
+        interval = 1.0 / config.rate
+        started = time.perf_counter()
+        for index in range(int(config.duration * config.rate)):
+            scheduled = started + index * interval
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tool = rng.choices(tools, weights)[0]
+            session = sessions[index % len(sessions)]
+            tasks.append(asyncio.create_task(call(session, tool, scheduled)))
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started
+
+        server = await fetch_server_metrics(server_url)
+
+    return build_report(
+        config, records, elapsed, connect_times, connect_failures, server
+    )
+
+
+def _latency(samples: list[float]) -> dict[str, float]:
+    return {
+        "p50": percentile(samples, 50),
+        "p90": percentile(samples, 90),
+        "p95": percentile(samples, 95),
+        "p99": percentile(samples, 99),
+        "max": max(samples) if samples else 0.0,
+    }
+
+
+def build_report(
+    config: LoadConfig,
+    records: list[CallRecord],
+    elapsed: float,
+    connect_times: list[float],
+    connect_failures: Counter,
+    server: Optional[dict],
+) -> dict[str, Any]:
+    """Aggregate call records into the load test report."""
+    by_tool: dict[str, list[CallRecord]] = defaultdict(list)
+    for record in records:
+        by_tool[record.tool].append(record)
+
+    def summary(items: list[CallRecord]) -> dict[str, Any]:
+        errors = Counter(item.error for item in items if item.error)
+        ok = [item.latency for item in items if not item.error]
+        return {
+            "calls": len(items),
+            "errors": sum(errors.values()),
+            "error_rate": sum(errors.values()) / len(items) if items else 0.0,
+            "errors_by_type": dict(errors),
+            "latency_seconds": _latency(ok),
+        }
+
+    report: dict[str, Any] = {
+        "config": asdict(config),
+        "sessions": {
+            "opened": len(connect_times),
+            "failed": sum(connect_failures.values()),
+            "failures_by_type": dict(connect_failures),
+            "connect_seconds": _latency(connect_times),
+        },
+        "elapsed_seconds": elapsed,
+        "throughput_per_second": len(records) / elapsed if elapsed else 0.0,
+        **summary(records),
+        "tools": {name: summary(items) for name, items in sorted(by_tool.items())},
+    }
+    if server is not None:
+        lag = server.get("samples", {}).get("event_loop_lag_seconds", {})
+        report["server"] = {
+            "event_loop_lag_seconds": {
+                key: lag.get(key, 0.0) for key in ("p50", "p95", "p99", "max")
+            },
+            "sse_sessions_active": server.get("sse_sessions_active"),
+            "wakapi_client": server.get("wakapi_client"),
+        }
+    return report
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for_port(port: int, process: subprocess.Popen, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{process.args} exited with {process.returncode}")
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            if sock.connect_ex(("127.0.0.1", port)) == 0:
+                return
+        time.sleep(0.2)
+    raise TimeoutError(f"Nothing listening on port {port} after {timeout}s")
+
+
+@contextmanager
+def spawn_servers(fake_args: list[str]) -> Iterator[str]:
+    """Start a fake Wakapi and an SSE MCP server; yield the SSE URL."""
+    fake_port, mcp_port = _free_port(), _free_port()
+    processes = []
+    with tempfile.NamedTemporaryFile("w", suffix=".toml", delete=False) as config:
+        config.write(
+            f'[wakapi]\nurl = "http://127.0.0.1:{fake_port}"\napi_key = "load"\n\n'
+            f'[server]\nhost = "127.0.0.1"\nport = {mcp_port}\n'
+        )
+    try:
+        fake = subprocess.Popen(
+            [sys.executable, "-m", "benchmarks.fake_wakapi"]
+            + ["--port", str(fake_port), *fake_args],
+            cwd=ROOT,
+        )
+        processes.append(fake)
+        _wait_for_port(fake_port, fake)
+        server = subprocess.Popen(
+            [sys.executable, "main.py", "--transport", "sse"]
+            + ["--config", config.name],
+            cwd=ROOT,
+            env={
+                **os.environ,
+                "PYTHONPATH": os.pathsep.join(
+                    filter(None, [str(ROOT / "src"), os.environ.get("PYTHONPATH")])
+                ),
+            },
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        processes.append(server)
+        _wait_for_port(mcp_port, server)
+        yield f"http://127.0.0.1:{mcp_port}/sse"
+    finally:
+        for process in processes:
+            process.terminate()
+            process.wait()
+        os.unlink(config.name)
+
+
+def print_report(report: dict[str, Any]) -> None:
+    """Print a human-readable summary of a report."""
+    sessions = report["sessions"]
+    print(
+        f"sessions: {sessions['opened']} opened, {sessions['failed']} failed; "
+        f"{report['calls']} calls in {report['elapsed_seconds']:.1f}s "
+        f"({report['throughput_per_second']:.1f}/s), "
+        f"error rate {report['error_rate']:.2%}"
+    )
+    print(
+        f"{'tool':<28} {'calls':>6} {'errors':>7} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+    )
+    for name, tool in report["tools"].items():
+        latency = tool["latency_seconds"]
+        print(
+            f"{name:<28} {tool['calls']:>6} {tool['errors']:>7} "
+            f"{latency['p50'] * 1000:>8.1f} {latency['p95'] * 1000:>8.1f} "
+            f"{latency['p99'] * 1000:>8.1f}"
+        )
+    if "server" in report:
+        lag = report["server"]["event_loop_lag_seconds"]
+        print(
+            f"server event loop lag: p50 {lag['p50'] * 1000:.1f}ms, "
+            f"p99 {lag['p99'] * 1000:.1f}ms, max {lag['max'] * 1000:.1f}ms"
+        )
+    else:
+        print("server event loop lag: unavailable (no /metrics endpoint)")
+
+
+def main() -> None:
+    """Command line entry point."""
+    defaults = LoadConfig()
+    parser = argparse.ArgumentParser(description="Load test the SSE MCP server")
+    parser.add_argument("--url", default=defaults.url, help="SSE endpoint URL")
+    parser.add_argument("--sessions", type=int, default=defaults.sessions)
+    parser.add_argument("--rate", type=float, default=defaults.rate)
+    parser.add_argument("--duration", type=float, default=defaults.duration)
+    parser.add_argument(
+        "--connect-concurrency", type=int, default=defaults.connect_concurrency
+    )
+    parser.add_argument("--mix", type=parse_mix, default=None, help="tool=weight,...")
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument(
+        "--spawn",
+        action="store_true",
+        help="Start a fake Wakapi and an SSE server instead of using --url",
+    )
+    parser.add_argument(
+        "--fake-args",
+        default="--days 30 --heartbeats-per-day 2000",
+        help="Arguments for the spawned fake Wakapi",
+    )
+    parser.add_argument("--output", "-o", help="Write the report JSON to this file")
+    args = parser.parse_args()
+
+    config = LoadConfig(
+        url=args.url,
+        sessions=args.sessions,
+        rate=args.rate,
+        duration=args.duration,
+        connect_concurrency=args.connect_concurrency,
+        mix=args.mix or dict(DEFAULT_MIX),
+        seed=args.seed,
+    )
+    if args.spawn:
+        with spawn_servers(args.fake_args.split()) as url:
+            config.url = url
+            report = asyncio.run(run_load(config))
+    else:
+        report = asyncio.run(run_load(config))
+
+    print_report(report)
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,475 @@
+"""
+Benchmark suite for the MCP tools and WakapiClient.
+
+Everything runs in-process against the fake Wakapi:
+
+- tools: end-to-end latency and throughput of every registered `@app.tool`,
+  called through an in-memory MCP client, with the number of upstream Wakapi
+  requests each call makes and its peak traced allocation;
+- client: cost of each WakapiClient method split into network, decompress,
+  JSON decode and model validation;
+- first call: latency of the first request of a new client over a real
+  local socket, cold and after `warm_connections`;
+- memory: peak allocation and peak RSS of `get_recent_logs` over 7, 30 and 90
+  days, each measured in a fresh process.
+
+Results are written as JSON so runs can be compared:
+
+    python -m benchmarks.suite --output results.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import platform
+import resource
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field, replace
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Optional
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+for path in (ROOT, ROOT / "src"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from wakapi_sdk.client import WakapiClient, WakapiConfig  # noqa: E402
+from wakapi_sdk.core.compression import supported_encodings  # noqa: E402
+from wakapi_sdk.core.connections import ConnectionWarmingConfig  # noqa: E402
+from wakapi_sdk.core.metrics import percentile  # noqa: E402
+
+from .fake_wakapi import FakeWakapi, FakeWakapiConfig  # noqa: E402
+from .synthetic import SyntheticConfig, SyntheticDataset  # noqa: E402
+
+SCHEMA_VERSION = 1
+BASE_URL = "http://fake-wakapi"
+
+# Arguments each tool is benchmarked with
+TOOL_CASES: dict[str, dict[str, Any]] = {
+    "get_stats": {"user": "current", "range": "last_7_days"},
+    "get_projects": {"user": "current"},
+    "get_leaders": {},
+    "get_user": {"user": "current"},
+    "get_all_time_since_today": {"user": "current"},
+    "get_project_detail": {"id": "mcp-wakapi", "user": "current"},
+    "get_recent_logs": {"user": "current", "days": 7},
+    "get_durations": {"user": "current", "days": 30, "group_by": "entity"},
+    "get_sessions": {"user": "current", "days": 30},
+    "get_activity_heatmap": {"user": "current"},
+    "get_file_hotspots": {"user": "current", "days": 30, "directory_depth": 1},
+    "get_approximate_activity": {"user": "current"},
+    "get_range_stats": {"user": "current"},
+    "test_connection": {},
+}
+
+
+def client_cases(today: str, week_ago: str) -> dict[str, dict[str, Any]]:
+    """Arguments each WakapiClient method is benchmarked with."""
+    return {
+        "get_heartbeats": {"date": today},
+        "get_stats": {"range": "last_7_days"},
+        "get_summaries": {"start": week_ago, "end": today},
+        "get_projects": {},
+        "get_project_detail": {"id": "mcp-wakapi"},
+        "get_user": {},
+        "get_all_time_since_today": {},
+        "get_leaders": {},
+    }
+
+
+@dataclass
+class SuiteConfig:
+    """Benchmark suite configuration data class."""
+
+    iterations: int = 30
+    warmup: int = 3
+    concurrency: int = 8
+    seed: int = 0
+    days: int = 90
+    # Last day of the dataset as an ISO date; None means today
+    end_date: Optional[str] = None
+    heartbeats_per_day: int = 2000
+    latency_ms: float = 0.0
+    memory_days: list[int] = field(default_factory=lambda: [7, 30, 90])
+    # Large enough that get_recent_logs returns every heartbeat of the window
+    recent_logs_limit: int = 1_000_000
+    tools: Optional[list[str]] = None
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    """Summarize timing samples."""
+    return {
+        "count": len(samples),
+        "mean": sum(samples) / len(samples) if samples else 0.0,
+        "p50": percentile(samples, 50),
+        "p95": percentile(samples, 95),
+        "p99": percentile(samples, 99),
+        "max": max(samples) if samples else 0.0,
+    }
+
+
+def peak_rss_bytes() -> int:
+    """Return the peak resident set size of this process."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def build_environment(config: SuiteConfig) -> tuple[FakeWakapi, WakapiClient]:
+    """Create the fake Wakapi and a client talking to it in-process."""
+    dataset = SyntheticDataset(
+        SyntheticConfig(
+            seed=config.seed,
+            days=max([config.days, *config.memory_days]),
+            end_date=date.fromisoformat(config.end_date) if config.end_date else None,
+            heartbeats_per_day=config.heartbeats_per_day,
+        )
+    )
+    fake = FakeWakapi(
+        dataset,
+        FakeWakapiConfig(
+            latency_seconds=config.latency_ms / 1000, body_cache_size=1024
+        ),
+    )
+    client = WakapiClient(
+        WakapiConfig(base_url=BASE_URL, api_key="bench"),
+        transport=httpx.ASGITransport(app=fake),
+    )
+    return fake, client
+
+
+def register_tools(client: WakapiClient):
+    """Register the MCP tools with client injected and return the app."""
+    from main import initialize_tools
+    from mcp_server import app
+    from mcp_tools.dependency_injection import register_wakapi_client
+
+    initialize_tools()
+    register_wakapi_client(client)
+    return app
+
+
+async def _call_tool(mcp, name: str, args: dict[str, Any]) -> bool:
+    """Call a tool and return whether it succeeded."""
+    result = await mcp.call_tool(name, args, raise_on_error=False)
+    return not result.is_error
+
+
+async def bench_tool(
+    mcp, fake: FakeWakapi, name: str, args: dict[str, Any], config: SuiteConfig
+) -> dict[str, Any]:
+    """Measure latency, throughput, upstream requests and allocation of a tool."""
+    for _ in range(config.warmup):
+        await _call_tool(mcp, name, args)
+
+    fake.reset_counts()
+    latencies = []
+    errors = 0
+    for _ in range(config.iterations):
+        started = time.perf_counter()
+        ok = await _call_tool(mcp, name, args)
+        latencies.append(time.perf_counter() - started)
+        errors += not ok
+    upstream = dict(fake.request_counts)
+
+    semaphore = asyncio.Semaphore(config.concurrency)
+
+    async def concurrent_call():
+        async with semaphore:
+            return await _call_tool(mcp, name, args)
+
+    started = time.perf_counter()
+    outcomes = await asyncio.gather(
+        *(concurrent_call() for _ in range(config.iterations))
+    )
+    elapsed = time.perf_counter() - started
+    errors += outcomes.count(False)
+
+    tracemalloc.start()
+    await _call_tool(mcp, name, args)
+    _, alloc_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "args": args,
+        "latency_seconds": summarize(latencies),
+        "throughput_per_second": config.iterations / elapsed if elapsed else 0.0,
+        "concurrency": config.concurrency,
+        "errors": errors,
+        "upstream_requests": sum(upstream.values()) / config.iterations,
+        "upstream_by_endpoint": {
+            endpoint: count / config.iterations for endpoint, count in upstream.items()
+        },
+        "alloc_peak_bytes": alloc_peak,
+    }
+
+
+async def bench_tools(fake: FakeWakapi, client: WakapiClient, config: SuiteConfig):
+    """Benchmark every registered tool that has a benchmark case."""
+    from fastmcp import Client
+
+    app = register_tools(client)
+    results: dict[str, Any] = {}
+    async with Client(app) as mcp:
+        names = [tool.name for tool in await mcp.list_tools()]
+        for name in names:
+            if config.tools and name not in config.tools:
+                continue
+            if name not in TOOL_CASES:
+                results[name] = {"skipped": "no benchmark case"}
+                continue
+            results[name] = await bench_tool(mcp, fake, name, TOOL_CASES[name], config)
+    return results
+
+
+def _decompress_samples(client: WakapiClient) -> list[float]:
+    samples: list[float] = []
+    for encoding in ["identity", *supported_encodings()]:
+        samples.extend(
+            client.metrics.samples("content_decode_seconds", encoding=encoding)
+        )
+    return samples
+
+
+async def bench_client(fake: FakeWakapi, client: WakapiClient, config: SuiteConfig):
+    """Break the cost of each WakapiClient method into its phases."""
+    today = fake.today
+    cases = client_cases(today.isoformat(), (today - timedelta(days=6)).isoformat())
+    results: dict[str, Any] = {}
+    for method, kwargs in cases.items():
+        call = getattr(client, method)
+        for _ in range(config.warmup):
+            await call(**kwargs)
+        client.metrics.reset()
+        fake.reset_counts()
+
+        totals = []
+        for _ in range(config.iterations):
+            started = time.perf_counter()
+            await call(**kwargs)
+            totals.append(time.perf_counter() - started)
+
+        metrics = client.metrics
+        requests = metrics.samples("request_seconds", endpoint=method)
+        decompress = _decompress_samples(client)
+        if len(decompress) != len(requests):
+            decompress = [0.0] * len(requests)
+        snapshot = metrics.snapshot()["counters"]
+        decoded_bytes = sum(
+            value
+            for key, value in snapshot.items()
+            if key.startswith("content_bytes_decoded")
+        )
+        results[method] = {
+            "args": kwargs,
+            "total_seconds": summarize(totals),
+            "network_seconds": summarize(
+                [request - spent for request, spent in zip(requests, decompress)]
+            ),
+            "decompress_seconds": summarize(decompress),
+            "json_decode_seconds": summarize(
+                metrics.samples("json_decode_seconds", endpoint=method)
+            ),
+            "validate_seconds": summarize(
+                metrics.samples("validate_seconds", endpoint=method)
+            ),
+            "response_bytes": decoded_bytes / config.iterations,
+            "upstream_requests": sum(fake.request_counts.values()) / config.iterations,
+        }
+    return results
+
+
+async def bench_first_call(fake: FakeWakapi, config: SuiteConfig) -> dict[str, Any]:
+    """
+    Measure the first request of new clients, cold and with warm connections.
+
+    Unlike the other benchmarks this one needs a real socket (and a host name
+    to resolve), so the fake Wakapi is served by uvicorn on a local port.
+    """
+    import uvicorn
+
+    server = uvicorn.Server(
+        uvicorn.Config(
+            fake, host="127.0.0.1", port=0, log_level="warning", lifespan="off"
+        )
+    )
+    serving = asyncio.create_task(server.serve())
+    try:
+        while not server.started:
+            await asyncio.sleep(0.01)
+        port = server.servers[0].sockets[0].getsockname()[1]
+        results = {}
+        for name, warming in (
+            ("cold_seconds", ConnectionWarmingConfig()),
+            ("warm_seconds", ConnectionWarmingConfig(enabled=True, min_connections=1)),
+        ):
+            latencies = []
+            for _ in range(config.iterations):
+                async with WakapiClient(
+                    WakapiConfig(
+                        base_url=f"http://localhost:{port}",
+                        api_key="bench",
+                        connections=warming,
+                    )
+                ) as client:
+                    await client.warm_connections()
+                    started = time.perf_counter()
+                    await client.get_user(user="current")
+                    latencies.append(time.perf_counter() - started)
+            results[name] = summarize(latencies)
+        return results
+    finally:
+        server.should_exit = True
+        await serving
+
+
+async def _recent_logs_memory(config: SuiteConfig, days: int) -> dict[str, Any]:
+    from fastmcp import Client
+
+    fake, client = build_environment(config)
+    app = register_tools(client)
+    args = {"user": "current", "days": days, "limit": config.recent_logs_limit}
+
+    # Render the fake responses up front so the server side allocates nothing
+    # while the tool is measured; the query mirrors what the tool sends.
+    end = datetime.now().date()
+    per_day = config.recent_logs_limit // days + 1
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=fake), base_url=BASE_URL, timeout=None
+    ) as http:
+        for offset in range(days):
+            await http.get(
+                "/api/compat/wakatime/v1/users/current/heartbeats",
+                params={"date": end - timedelta(days=offset), "limit": per_day},
+            )
+    fake.reset_counts()
+
+    async with Client(app) as mcp:
+        baseline_rss = peak_rss_bytes()
+        started = time.perf_counter()
+        result = await mcp.call_tool("get_recent_logs", args)
+        elapsed = time.perf_counter() - started
+        rss = peak_rss_bytes()
+        heartbeats = len(result.structured_content.get("result", []))
+        upstream = sum(fake.request_counts.values())
+
+        tracemalloc.start()
+        await mcp.call_tool("get_recent_logs", args)
+        _, alloc_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {
+        "days": days,
+        "heartbeats": heartbeats,
+        "latency_seconds": elapsed,
+        "upstream_requests": upstream,
+        "alloc_peak_bytes": alloc_peak,
+        "baseline_rss_bytes": baseline_rss,
+        "peak_rss_bytes": rss,
+    }
+
+
+def _memory_case(config: SuiteConfig, days: int) -> dict[str, Any]:
+    """Run one memory case; executed in a fresh process."""
+    logging.basicConfig(level=logging.WARNING, force=True)
+    return asyncio.run(_recent_logs_memory(config, days))
+
+
+def bench_memory(config: SuiteConfig) -> dict[str, Any]:
+    """Measure get_recent_logs memory for each window in its own process."""
+    results = {}
+    context = multiprocessing.get_context("spawn")
+    for days in config.memory_days:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            results[f"get_recent_logs_{days}d"] = pool.submit(
+                _memory_case, config, days
+            ).result()
+    return results
+
+
+async def run_suite(config: SuiteConfig, memory: bool = True) -> dict[str, Any]:
+    """Run the whole suite and return the results document."""
+    if config.end_date is None:
+        # Record the day the dataset ended on, so reruns generate the same one
+        config = replace(config, end_date=date.today().isoformat())
+    fake, client = build_environment(config)
+    results: dict[str, Any] = {
+        "schema": SCHEMA_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": asdict(config),
+    }
+    results["tools"] = await bench_tools(fake, client, config)
+    results["client"] = await bench_client(fake, client, config)
+    results["first_call"] = await bench_first_call(fake, config)
+    results["peak_rss_bytes"] = peak_rss_bytes()
+    results["memory"] = bench_memory(config) if memory else {}
+    return results
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the suite options to parser."""
+    defaults = SuiteConfig()
+    parser.add_argument("--iterations", type=int, default=defaults.iterations)
+    parser.add_argument("--warmup", type=int, default=defaults.warmup)
+    parser.add_argument("--concurrency", type=int, default=defaults.concurrency)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--days", type=int, default=defaults.days)
+    parser.add_argument(
+        "--end-date", default=defaults.end_date, help="Last day of the dataset"
+    )
+    parser.add_argument(
+        "--heartbeats-per-day", type=int, default=defaults.heartbeats_per_day
+    )
+    parser.add_argument("--latency-ms", type=float, default=defaults.latency_ms)
+    parser.add_argument(
+        "--memory-days", type=int, nargs="*", default=defaults.memory_days
+    )
+    parser.add_argument("--tools", nargs="*", default=None, help="Tools to run")
+    parser.add_argument("--skip-memory", action="store_true")
+
+
+def config_from_args(args: argparse.Namespace) -> SuiteConfig:
+    """Build a SuiteConfig from parsed arguments."""
+    return SuiteConfig(
+        iterations=args.iterations,
+        warmup=args.warmup,
+        concurrency=args.concurrency,
+        seed=args.seed,
+        days=args.days,
+        end_date=args.end_date,
+        heartbeats_per_day=args.heartbeats_per_day,
+        latency_ms=args.latency_ms,
+        memory_days=args.memory_days,
+        tools=args.tools,
+    )
+
+
+def main() -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Run the Wakapi MCP benchmarks")
+    add_arguments(parser)
+    parser.add_argument("--output", "-o", help="Write results JSON to this file")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING, force=True)
+
+    results = asyncio.run(run_suite(config_from_args(args), not args.skip_memory))
+    document = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).write_text(document + "\n")
+        print(f"Results written to {args.output}", file=sys.stderr)
+    else:
+        print(document)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+"""
+Seeded synthetic coding activity.
+
+`SyntheticDataset` generates heartbeats one day at a time from a seed, so the
+same day always yields the same heartbeats and a dataset of millions of
+heartbeats never has to be held in memory. Durations are derived from the
+heartbeats with the Wakapi timeout rule and aggregated per day; the
+aggregates back the stats, summaries and all-time endpoints of the fake
+server.
+"""
+
+import random
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from typing import Any, Iterator, Optional
+from zoneinfo import ZoneInfo
+
+from wakapi_sdk.core.durations import DEFAULT_TIMEOUT_SECONDS
+
+DEFAULT_PROJECTS = ["mcp-wakapi", "wakapi", "dotfiles", "website", "infra"]
+DEFAULT_LANGUAGES = ["Python", "TypeScript", "Go", "Rust", "Markdown", "YAML"]
+DEFAULT_BRANCHES = ["main", "develop", "feature/search", "fix/timeouts"]
+DEFAULT_EDITORS = ["vscode", "neovim"]
+
+# Aggregated dimensions, keyed as in Wakapi summaries
+DIMENSIONS = (
+    "projects",
+    "languages",
+    "branches",
+    "entities",
+    "editors",
+    "machines",
+    "operating_systems",
+    "categories",
+)
+
+
+@dataclass
+class SyntheticConfig:
+    """Synthetic dataset configuration data class."""
+
+    seed: int = 0
+    days: int = 90
+    # Last day of the dataset; None means today
+    end_date: Optional[date] = None
+    heartbeats_per_day: int = 5000
+    # Fraction of weekend days with any activity
+    weekend_activity: float = 0.3
+    timezone: str = "UTC"
+    username: str = "bench"
+    projects: list[str] = field(default_factory=lambda: list(DEFAULT_PROJECTS))
+    languages: list[str] = field(default_factory=lambda: list(DEFAULT_LANGUAGES))
+    branches: list[str] = field(default_factory=lambda: list(DEFAULT_BRANCHES))
+    editors: list[str] = field(default_factory=lambda: list(DEFAULT_EDITORS))
+    files_per_project: int = 40
+
+
+class DayAggregate:
+    """Coding seconds of one day per dimension value."""
+
+    __slots__ = ("total_seconds", "heartbeats", "by_dimension", "last_heartbeat")
+
+    def __init__(self) -> None:
+        self.total_seconds = 0.0
+        self.heartbeats = 0
+        self.by_dimension: dict[str, dict[str, float]] = {
+            name: defaultdict(float) for name in DIMENSIONS
+        }
+        # Latest heartbeat time per project
+        self.last_heartbeat: dict[str, float] = {}
+
+
+class SyntheticDataset:
+    """Deterministic heartbeat generator over a range of days."""
+
+    def __init__(self, config: Optional[SyntheticConfig] = None) -> None:
+        """Initialize the dataset; nothing is generated up front."""
+        self.config = config or SyntheticConfig()
+        self.tz = ZoneInfo(self.config.timezone)
+        self.end_date = self.config.end_date or date.today()
+        self.start_date = self.end_date - timedelta(days=self.config.days - 1)
+        self._aggregates: dict[date, DayAggregate] = {}
+
+    @property
+    def total_heartbeats(self) -> int:
+        """Number of heartbeats in the whole dataset."""
+        return sum(self.aggregate(day).heartbeats for day in self.days())
+
+    def days(
+        self, start: Optional[date] = None, end: Optional[date] = None
+    ) -> Iterator[date]:
+        """Iterate the dataset days between start and end (inclusive)."""
+        current = max(start or self.start_date, self.start_date)
+        last = min(end or self.end_date, self.end_date)
+        while current <= last:
+            yield current
+            current += timedelta(days=1)
+
+    def _rng(self, day: date) -> random.Random:
+        return random.Random(f"{self.config.seed}:{day.isoformat()}")
+
+    def _day_volume(self, day: date, rng: random.Random) -> int:
+        if not self.start_date <= day <= self.end_date:
+            return 0
+        if day.weekday() >= 5 and rng.random() >= self.config.weekend_activity:
+            return 0
+        # Vary the daily volume by +-50% around the configured mean
+        return int(self.config.heartbeats_per_day * rng.uniform(0.5, 1.5))
+
+    def heartbeats(
+        self, day: date, project: Optional[str] = None
+    ) -> list[dict[str, Any]]:
+        """Return the heartbeats of a day, optionally filtered by project."""
+        result = list(self.iter_heartbeats(day))
+        if project:
+            result = [item for item in result if item["project"] == project]
+        return result
+
+    def iter_heartbeats(self, day: date) -> Iterator[dict[str, Any]]:
+        """Generate the heartbeats of a day in time order."""
+        config = self.config
+        rng = self._rng(day)
+        volume = self._day_volume(day, rng)
+        if not volume:
+            return
+
+        # Split the day into a few sessions during working hours
+        sessions = rng.randint(2, 5)
+        per_session = max(1, volume // sessions)
+        cursor = datetime.combine(day, time(8, 0), self.tz).timestamp()
+        cursor += rng.uniform(0, 2 * 3600)
+        machine = f"{config.username}-workstation"
+        index = 0
+        for _ in range(sessions):
+            project = rng.choice(config.projects)
+            branch = rng.choice(config.branches)
+            language = rng.choice(config.languages)
+            editor = rng.choice(config.editors)
+            entity = self._entity(project, rng)
+            for _ in range(per_session):
+                if index >= volume:
+                    break
+                cursor += rng.expovariate(1 / 8)
+                if rng.random() < 0.02:
+                    # Short breaks exceed the heartbeat timeout
+                    cursor += rng.uniform(
+                        DEFAULT_TIMEOUT_SECONDS, 2 * DEFAULT_TIMEOUT_SECONDS
+                    )
+                if rng.random() < 0.05:
+                    entity = self._entity(project, rng)
+                    language = rng.choice(config.languages)
+                is_write = rng.random() < 0.15
+                yield {
+                    "id": f"{day.isoformat()}-{index}",
+                    "project": project,
+                    "language": language,
+                    "entity": entity,
+                    "time": round(cursor, 3),
+                    "is_write": is_write,
+                    "branch": branch,
+                    "category": "coding",
+                    "cursorpos": rng.randrange(5000),
+                    "line_additions": rng.randrange(12) if is_write else 0,
+                    "line_deletions": rng.randrange(6) if is_write else 0,
+                    "lineno": rng.randrange(1, 400),
+                    "lines": 400,
+                    "type": "file",
+                    "user_agent_id": f"wakatime/v1.90.0 (linux) {editor}/1.0",
+                    "user_id": config.username,
+                    "machine_name_id": machine,
+                    "created_at": datetime.fromtimestamp(cursor, self.tz).isoformat(),
+                }
+                index += 1
+            # Gap between sessions
+            cursor += rng.uniform(1800, 5400)
+
+    def _entity(self, project: str, rng: random.Random) -> str:
+        module = rng.randrange(self.config.files_per_project)
+        package = module % 4
+        return f"/home/dev/{project}/src/pkg{package}/module_{module}.py"
+
+    def aggregate(self, day: date) -> DayAggregate:
+        """Return the per-dimension coding time of a day, computed once."""
+        aggregate = self._aggregates.get(day)
+        if aggregate is not None:
+            return aggregate
+
+        aggregate = DayAggregate()
+        previous: Optional[dict[str, Any]] = None
+        for heartbeat in self.iter_heartbeats(day):
+            aggregate.heartbeats += 1
+            aggregate.last_heartbeat[heartbeat["project"]] = heartbeat["time"]
+            if previous is not None:
+                # Capped at the timeout the client computes durations with
+                gap = heartbeat["time"] - previous["time"]
+                self._attribute(aggregate, previous, min(gap, DEFAULT_TIMEOUT_SECONDS))
+            previous = heartbeat
+        self._aggregates[day] = aggregate
+        return aggregate
+
+    def _attribute(
+        self, aggregate: DayAggregate, heartbeat: dict[str, Any], seconds: float
+    ) -> None:
+        aggregate.total_seconds += seconds
+        dims = aggregate.by_dimension
+        dims["projects"][heartbeat["project"]] += seconds
+        dims["languages"][heartbeat["language"]] += seconds
+        dims["branches"][heartbeat["branch"]] += seconds
+        dims["entities"][heartbeat["entity"]] += seconds
+        editor = heartbeat["user_agent_id"].rsplit(" ", 1)[-1].split("/")[0]
+        dims["editors"][editor] += seconds
+        dims["machines"][heartbeat["machine_name_id"]] += seconds
+        dims["operating_systems"]["Linux"] += seconds
+        dims["categories"][heartbeat["category"]] += seconds
+
+    def totals(
+        self,
+        start: date,
+        end: date,
+        project: Optional[str] = None,
+        language: Optional[str] = None,
+    ) -> tuple[float, dict[str, dict[str, float]]]:
+        """
+        Sum coding time over a date range.
+
+        Filters are approximated by scaling every dimension with the share of
+        the filtered project or language on each day.
+
+        Returns:
+            Total seconds and seconds per dimension value.
+        """
+        total = 0.0
+        merged: dict[str, dict[str, float]] = {
+            name: defaultdict(float) for name in DIMENSIONS
+        }
+        for day in self.days(start, end):
+            aggregate = self.aggregate(day)
+            if not aggregate.total_seconds:
+                continue
+            share = 1.0
+            if project:
+                share *= (
+                    aggregate.by_dimension["projects"].get(project, 0.0)
+                    / aggregate.total_seconds
+                )
+            if language:
+                share *= (
+                    aggregate.by_dimension["languages"].get(language, 0.0)
+                    / aggregate.total_seconds
+                )
+            if not share:
+                continue
+            total += aggregate.total_seconds * share
+            for name, values in aggregate.by_dimension.items():
+                for key, seconds in values.items():
+                    if project and name == "projects" and key != project:
+                        continue
+                    if language and name == "languages" and key != language:
+                        continue
+                    merged[name][key] += seconds * share
+        if project:
+            merged["projects"] = {project: total} if total else {}
+        if language:
+            merged["languages"] = {language: total} if total else {}
+        return total, merged
+
+    def last_heartbeats(self) -> dict[str, float]:
+        """Return the latest heartbeat time of every project."""
+        latest: dict[str, float] = {}
+        day = self.end_date
+        # Walk backwards so only recent days are generated
+        while day >= self.start_date and len(latest) < len(self.config.projects):
+            for project, at in self.aggregate(day).last_heartbeat.items():
+                latest.setdefault(project, at)
+            day -= timedelta(days=1)
+        return latest
@@ -7,6 +7,7 @@ from pathlib import Path
 
 import uvicorn
 from fastmcp.server.http import create_sse_app
+from starlette.middleware import Middleware
 
 from wakapi_sdk.core.config import ConfigManager
 from wakapi_sdk.core.exceptions import ConfigurationError
@@ -104,7 +105,14 @@ Examples:
                 file=sys.stderr,
             )
 
-            sse_app = create_sse_app(app, message_path="/message", sse_path="/sse")
+            from server_metrics import ServerMetricsMiddleware
+
+            sse_app = create_sse_app(
+                app,
+                message_path="/message",
+                sse_path="/sse",
+                middleware=[Middleware(ServerMetricsMiddleware, sse_path="/sse")],
+            )
             uvicorn.run(
                 sse_app,
                 host=server_config.host,
@@ -148,6 +156,24 @@ def initialize_tools():
         from mcp_tools.recent_logs import get_recent_logs
 
         _ = get_recent_logs  # Trigger registration
+        from mcp_tools.durations import get_durations
+
+        _ = get_durations  # Trigger registration
+        from mcp_tools.sessions import get_sessions
+
+        _ = get_sessions  # Trigger registration
+        from mcp_tools.heatmap import get_activity_heatmap
+
+        _ = get_activity_heatmap  # Trigger registration
+        from mcp_tools.hotspots import get_file_hotspots
+
+        _ = get_file_hotspots  # Trigger registration
+        from mcp_tools.approximate import get_approximate_activity
+
+        _ = get_approximate_activity  # Trigger registration
+        from mcp_tools.range_stats import get_range_stats
+
+        _ = get_range_stats  # Trigger registration
         from mcp_tools.connection import test_connection
 
         _ = test_connection  # Trigger registration
@@ -1,11 +1,32 @@
+from contextlib import asynccontextmanager
 from dataclasses import dataclass
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Optional
 
 from fastmcp import FastMCP
 from fastmcp.server.http import create_sse_app
+from starlette.middleware import Middleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse
 
+from server_metrics import ServerMetricsMiddleware, metrics_snapshot, server_metrics
 
-app = FastMCP("Wakapi MCP Server")
+
+@asynccontextmanager
+async def lifespan(server: FastMCP) -> AsyncIterator[dict]:
+    """Warm the Wakapi connections while the server runs, then close them."""
+    from mcp_tools.dependency_injection import (
+        close_wakapi_client,
+        start_connection_warming,
+    )
+
+    start_connection_warming()
+    try:
+        yield {}
+    finally:
+        await close_wakapi_client()
+
+
+app = FastMCP("Wakapi MCP Server", lifespan=lifespan)
 
 
 # Global configuration manager
@@ -30,7 +51,10 @@ class WakapiMCPServer:
         sse_path = "/sse"
 
         self.sse_app = create_sse_app(
-            self.app, message_path=message_path, sse_path=sse_path
+            self.app,
+            message_path=message_path,
+            sse_path=sse_path,
+            middleware=[Middleware(ServerMetricsMiddleware, sse_path=sse_path)],
         )
 
     def _initialize_tool_system(self) -> None:
@@ -49,6 +73,30 @@ class WakapiMCPServer:
         return tool(**kwargs)
 
 
+# Metrics reveal usage and can be reset, so only local clients may read them
+LOOPBACK_HOSTS = ("127.0.0.1", "::1", "localhost")
+
+
+@app.custom_route("/metrics", methods=["GET", "POST"])
+async def metrics(request: Request) -> JSONResponse:
+    """
+    Serve server and Wakapi client metrics as JSON to loopback clients.
+
+    POST returns the same snapshot and then clears the server's counters and
+    samples, so a load test can scope the event loop lag to its own run. The
+    client metrics are kept, since they calibrate hedging and query planning.
+    """
+    from mcp_tools.dependency_injection import get_injector
+
+    if request.client is None or request.client.host not in LOOPBACK_HOSTS:
+        return JSONResponse({"error": "Forbidden"}, status_code=403)
+    client = get_injector().get_existing_wakapi_client()
+    snapshot = metrics_snapshot(client.metrics if client is not None else None)
+    if request.method == "POST":
+        server_metrics.reset()
+    return JSONResponse(snapshot)
+
+
 @dataclass
 class Config:
     """Configuration class for backward compatibility."""
@@ -4,6 +4,7 @@ from .dependency_injection import (
     DependencyInjector,
     get_injector,
     register_config_manager,
+    register_local_store,
     register_wakapi_client,
     inject_dependencies,
 )
@@ -16,5 +17,6 @@ __all__ = [
     "get_injector",
     "inject_dependencies",
     "register_config_manager",
+    "register_local_store",
     "register_wakapi_client",
 ]
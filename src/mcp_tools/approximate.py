@@ -0,0 +1,108 @@
+"""Wakapi approximate activity tool."""
+
+from datetime import datetime
+from typing import Any, Optional
+
+from mcp_server import app
+from mcp_tools.day_range import resolve_days, user_timezone
+from mcp_tools.deadline import DeadlineStream, tool_deadline
+from mcp_tools.dependency_injection import get_local_store, get_wakapi_client
+from mcp_tools.progress import ToolProgress
+from wakapi_sdk.core.durations import DEFAULT_TIMEOUT_SECONDS
+from wakapi_sdk.core.sketches import ActivitySketch
+from wakapi_sdk.core.store import scope_key
+
+
+@app.tool
+async def get_approximate_activity(
+    user: str = "current",
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    project_name: Optional[str] = None,
+    limit: int = 10,
+    timeout_minutes: float = DEFAULT_TIMEOUT_SECONDS / 60,
+    deadline_seconds: Optional[float] = None,
+) -> dict[str, Any]:
+    """Estimate distinct files, branches and projects and the dominant files.
+
+    Meant for year-scale questions such as "how many distinct files did I
+    touch" or "which files dominate". Each day is summarized once into small
+    sketches (HyperLogLog for distinct counts, count-min for seconds per file)
+    kept in the local store; a range merges its days' sketches instead of
+    aggregating every heartbeat. Results are approximate: distinct counts are
+    within a few percent and seconds per file may be overestimated.
+
+    Args:
+        user (str, required, default="current"): Username (or current).
+        start (str, optional): First day (YYYY-MM-DD); defaults to 364 days
+            before end.
+        end (str, optional): Last day (YYYY-MM-DD); defaults to today.
+        project_name (str, optional): Only use heartbeats of this project.
+        limit (int, default=10): Number of dominant files returned.
+        timeout_minutes (float, default=10): Longest gap counted as activity.
+        deadline_seconds (float, optional): Time budget of the call; defaults
+            to the configured tool deadline.
+
+    Returns:
+        Dict with start, end, distinct (estimated number of distinct entity,
+        branch and project values), top_entities (entity and estimated
+        seconds, most first), days_fetched and days_cached. If the deadline
+        passed first, estimates cover the days computed so far and truncated
+        describes them.
+    """
+    client = get_wakapi_client()
+    store = get_local_store()
+    tz = await user_timezone(client, user)
+    today = datetime.now(tz).date()
+    days = resolve_days(start, end, tz, default_days=365)
+    scope = scope_key(
+        user=user, project=project_name, timeout=timeout_minutes * 60, tz=tz.key
+    )
+    stored = store.sketches(scope, (day.isoformat() for day in days))
+    missing = [day for day in days if day.isoformat() not in stored]
+
+    computed = []
+    # Days answered from the local store count as done
+    progress = ToolProgress(total=len(days))
+    await progress.advance(steps=len(days) - len(missing))
+    with tool_deadline(deadline_seconds):
+        stream = DeadlineStream(
+            client.iter_heartbeat_days(missing, user=user, project=project_name),
+            progress,
+            len(days),
+        )
+        async for day, day_logs in stream:
+            computed.append(
+                ActivitySketch.from_heartbeats(day_logs, timeout_minutes * 60)
+            )
+            await progress.advance(f"Processed {day}")
+    # The current day (and any future one) is still changing
+    store.save_sketches(
+        scope,
+        {
+            day.isoformat(): sketch.to_blobs()
+            for day, sketch in zip(missing, computed)
+            if day < today
+        },
+    )
+
+    merged = ActivitySketch()
+    for sketch in computed:
+        merged.merge(sketch)
+    for blobs in stored.values():
+        merged.merge(ActivitySketch.from_blobs(blobs))
+
+    result = {
+        "start": days[0].isoformat(),
+        "end": days[-1].isoformat(),
+        "distinct": {name: round(hll.count()) for name, hll in merged.distinct.items()},
+        "top_entities": [
+            {"entity": entity, "seconds": round(seconds, 1)}
+            for entity, seconds in merged.heavy_hitters(limit)
+        ],
+        "days_fetched": len(computed),
+        "days_cached": len(stored),
+    }
+    if stream.truncated:
+        result["truncated"] = stream.truncated
+    return result
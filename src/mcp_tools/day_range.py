@@ -0,0 +1,76 @@
+"""Helpers for tools computing per-day results over a date range."""
+
+from datetime import date, datetime, timedelta
+from typing import Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+import httpx
+
+from wakapi_sdk.core.exceptions import ApiError
+
+
+async def user_timezone(client, user: str) -> ZoneInfo:
+    """Return the timezone configured for user in Wakapi, or UTC."""
+    try:
+        result = await client.get_user(user=user)
+        return ZoneInfo(result.data.timezone)
+    except (ZoneInfoNotFoundError, ValueError):
+        return ZoneInfo("UTC")
+
+
+def resolve_days(
+    start: Optional[str], end: Optional[str], tz: ZoneInfo, default_days: int
+) -> list[date]:
+    """
+    Return every day from start to end (YYYY-MM-DD, inclusive).
+
+    end defaults to today in tz and start to default_days days up to end.
+    """
+    try:
+        end_date = date.fromisoformat(end) if end else datetime.now(tz).date()
+        start_date = (
+            date.fromisoformat(start)
+            if start
+            else end_date - timedelta(days=default_days - 1)
+        )
+    except ValueError as e:
+        raise ValueError(f"Invalid date: {e}") from e
+    if start_date > end_date:
+        raise ValueError("start must not be after end")
+    return [
+        start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)
+    ]
+
+
+def summary_day(summary) -> date:
+    """Return the day a daily summary covers, in the user's timezone."""
+    # range.date is when the response was made; range.start is the day
+    return date.fromisoformat(summary.range.start[:10])
+
+
+async def active_days(
+    client, user: str, days: list[date], project: Optional[str] = None
+) -> list[date]:
+    """
+    Return the days with coded time, using one summaries request.
+
+    Days without coded time have no heartbeats to fetch. Falls back to all
+    days when Wakapi fails to answer; a passed deadline is raised.
+    """
+    if not days:
+        return days
+    try:
+        result = await client.get_summaries(
+            user=user,
+            start=min(days).isoformat(),
+            end=max(days).isoformat(),
+            project=project,
+        )
+    except (ApiError, httpx.HTTPError):
+        return days
+    coded = {
+        summary_day(summary)
+        for summary in result.data
+        if summary.grand_total.total_seconds > 0
+    }
+    return [day for day in days if day in coded]
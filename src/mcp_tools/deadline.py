@@ -0,0 +1,64 @@
+"""Deadlines of tool calls."""
+
+from typing import Any, AsyncIterator, ContextManager, Optional, TypeVar
+
+from mcp_tools.dependency_injection import get_tool_deadline
+from mcp_tools.progress import ToolProgress
+from wakapi_sdk.core.deadline import deadline
+from wakapi_sdk.core.exceptions import DeadlineExceededError
+
+T = TypeVar("T")
+
+
+def tool_deadline(seconds: Optional[float] = None) -> ContextManager[None]:
+    """
+    Run a tool call under a deadline.
+
+    seconds overrides the configured `[wakapi.deadline] tool_seconds`; with
+    neither, the call has no deadline. Every Wakapi request made inside is
+    capped at the time remaining.
+    """
+    if seconds is None:
+        seconds = get_tool_deadline()
+    return deadline(seconds)
+
+
+def truncation_marker(days_completed: int, days_requested: int) -> dict[str, Any]:
+    """Describe a result cut short by the deadline."""
+    return {
+        "truncated": True,
+        "reason": "deadline exceeded",
+        "days_completed": days_completed,
+        "days_requested": days_requested,
+    }
+
+
+class DeadlineStream:
+    """
+    Day stream of a tool call that ends at the deadline instead of failing.
+
+    Iterating yields the items of stream. When the deadline passes, iteration
+    stops and `truncated` holds the marker, counting the days progress has
+    completed. Other errors of the stream are raised as ValueError.
+    """
+
+    def __init__(
+        self, stream: AsyncIterator[T], progress: ToolProgress, days_requested: int
+    ) -> None:
+        """Wrap stream, a day iterator such as `iter_heartbeat_days`."""
+        self.stream = stream
+        self.progress = progress
+        self.days_requested = days_requested
+        self.truncated: Optional[dict[str, Any]] = None
+
+    async def __aiter__(self) -> AsyncIterator[T]:
+        """Yield the items of the stream until the deadline passes."""
+        try:
+            async for item in self.stream:
+                yield item
+        except DeadlineExceededError:
+            self.truncated = truncation_marker(
+                int(self.progress.done), self.days_requested
+            )
+        except Exception as e:
+            raise ValueError(f"Failed to fetch heartbeats: {e}") from e
@@ -3,6 +3,7 @@
 from typing import Any, Optional
 from wakapi_sdk.core.config import ConfigManager
 from wakapi_sdk.client import WakapiClient, WakapiConfig
+from wakapi_sdk.core.store import LocalStore
 
 
 class DependencyInjector:
@@ -13,6 +14,7 @@ class DependencyInjector:
         self._dependencies: dict[str, Any] = {}
         self._config_manager: Optional[ConfigManager] = None
         self._wakapi_client: Optional[WakapiClient] = None
+        self._local_store: Optional[LocalStore] = None
 
     def register_config_manager(self, config_manager: ConfigManager) -> None:
         """Register config manager."""
@@ -24,6 +26,11 @@ class DependencyInjector:
         self._wakapi_client = wakapi_client
         self._dependencies["wakapi_client"] = wakapi_client
 
+    def register_local_store(self, local_store: LocalStore) -> None:
+        """Register local store."""
+        self._local_store = local_store
+        self._dependencies["local_store"] = local_store
+
     def create_wakapi_client(self) -> WakapiClient:
         """Create Wakapi client."""
         if self._wakapi_client is not None:
@@ -39,6 +46,16 @@ class DependencyInjector:
                 base_url=wakapi_config.url,
                 api_key=wakapi_config.api_key,
                 api_path=wakapi_config.api_path,
+                rate_limit=wakapi_config.rate_limit,
+                adaptive_concurrency=wakapi_config.adaptive_concurrency,
+                circuit_breaker=wakapi_config.circuit_breaker,
+                revalidation_cache=wakapi_config.revalidation_cache,
+                compression=wakapi_config.compression,
+                cassette=wakapi_config.cassette,
+                heartbeat_stream=wakapi_config.heartbeat_stream,
+                timeouts=wakapi_config.timeouts,
+                hedging=wakapi_config.hedging,
+                connections=wakapi_config.connections,
             )
         )
 
@@ -54,6 +71,42 @@ class DependencyInjector:
             self._wakapi_client = self.create_wakapi_client()
         return self._wakapi_client
 
+    def get_local_store(self) -> LocalStore:
+        """Get local store, opening the configured one on first use."""
+        if self._local_store is None:
+            path = None
+            if self._config_manager is not None:
+                path = self._config_manager.get_wakapi_config().local_store.path
+            self._local_store = LocalStore(path)
+        return self._local_store
+
+    def get_tool_deadline(self) -> Optional[float]:
+        """Get the configured deadline of tool calls in seconds, if any."""
+        if self._config_manager is None:
+            return None
+        return self._config_manager.get_wakapi_config().deadline.tool_seconds
+
+    def start_connection_warming(self) -> None:
+        """Start warming Wakapi connections if enabled in the configuration."""
+        if self._config_manager is None:
+            return
+        config = self._config_manager.get_wakapi_config().connections
+        if config.enabled:
+            self.get_wakapi_client().start_warming()
+
+    async def close_wakapi_client(self) -> None:
+        """Close and drop the Wakapi client if created here, flushing its cassette."""
+        # A registered client belongs to whoever registered it
+        if self._wakapi_client is None or "wakapi_client" in self._dependencies:
+            return
+        client = self._wakapi_client
+        self._wakapi_client = None
+        await client.aclose()
+
+    def get_existing_wakapi_client(self) -> Optional[WakapiClient]:
+        """Get Wakapi client if one was registered or created, without creating."""
+        return self._wakapi_client
+
     def inject(self, tool_class) -> Any:
         """
         Create instance by injecting dependencies into tool class.
@@ -91,6 +144,7 @@ class DependencyInjector:
         self._dependencies.clear()
         self._config_manager = None
         self._wakapi_client = None
+        self._local_store = None
 
 
 # Global dependency injection instance
@@ -107,6 +161,26 @@ def get_wakapi_client() -> WakapiClient:
     return _injector.get_wakapi_client()
 
 
+def get_local_store() -> LocalStore:
+    """Get global local store."""
+    return _injector.get_local_store()
+
+
+def get_tool_deadline() -> Optional[float]:
+    """Get the configured deadline of tool calls in seconds, if any."""
+    return _injector.get_tool_deadline()
+
+
+def start_connection_warming() -> None:
+    """Start warming Wakapi connections if enabled in the configuration."""
+    _injector.start_connection_warming()
+
+
+async def close_wakapi_client() -> None:
+    """Close the global Wakapi client if one was created."""
+    await _injector.close_wakapi_client()
+
+
 def register_config_manager(config_manager: ConfigManager) -> None:
     """Register config manager globally."""
     _injector.register_config_manager(config_manager)
@@ -117,6 +191,11 @@ def register_wakapi_client(wakapi_client: WakapiClient) -> None:
     _injector.register_wakapi_client(wakapi_client)
 
 
+def register_local_store(local_store: LocalStore) -> None:
+    """Register local store globally."""
+    _injector.register_local_store(local_store)
+
+
 def inject_dependencies(tool_class) -> Any:
     """Create tool instance by injecting dependencies."""
     return _injector.inject(tool_class)
@@ -0,0 +1,107 @@
+"""Wakapi heartbeat durations tool."""
+
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from mcp_server import app
+from mcp_tools.deadline import DeadlineStream, tool_deadline
+from mcp_tools.dependency_injection import get_wakapi_client
+from mcp_tools.progress import ToolProgress
+from wakapi_sdk.core.durations import (
+    DEFAULT_TIMEOUT_SECONDS,
+    GROUP_FIELDS,
+    group_durations,
+    merge_group_durations,
+)
+from wakapi_sdk.core.streaming import date_range
+
+
+def format_duration(seconds: float) -> str:
+    """Format seconds like Wakapi's human readable totals, e.g. `1h 5m`."""
+    minutes = int(seconds // 60)
+    return f"{minutes // 60}h {minutes % 60}m"
+
+
+@app.tool
+async def get_durations(
+    user: str = "current",
+    days: int = 1,
+    group_by: str = "project",
+    project_name: Optional[str] = None,
+    timeout_minutes: float = DEFAULT_TIMEOUT_SECONDS / 60,
+    limit: int = 20,
+    deadline_seconds: Optional[float] = None,
+) -> dict[str, Any]:
+    """Get time spent per project, file, branch or language from heartbeats.
+
+    Computed locally from the heartbeats of recent days with Wakapi's keystroke
+    timeout rule: the gap to the next heartbeat counts, capped at the timeout,
+    and nothing counts across days. Answers questions such as "how long did I
+    spend on file X today" that stats and summaries do not. Days are
+    streamed and totalled one at a time.
+
+    Args:
+        user (str, required, default="current"): Username (or current).
+        days (int, default=1): Number of days, counting back from today.
+        group_by (str, default="project"): project, entity, branch or language.
+        project_name (str, optional): Only use heartbeats of this project.
+        timeout_minutes (float, default=10): Longest gap counted as activity.
+        limit (int, default=20): Maximum number of groups returned.
+        deadline_seconds (float, optional): Time budget of the call; defaults
+            to the configured tool deadline.
+
+    Returns:
+        Dict with group_by, start, end, timeout_seconds, total_seconds and data:
+        the groups, longest first, each with name, total_seconds, text
+        (e.g. "1h 5m") and heartbeats (count). If the deadline passed first,
+        totals cover the days fetched so far and truncated describes them.
+    """
+    client = get_wakapi_client()
+    today = datetime.now().date()
+    first = today - timedelta(days=days - 1)
+    if group_by not in GROUP_FIELDS:
+        raise ValueError(
+            f"Failed to compute durations: cannot group by {group_by!r}; "
+            f"expected one of {', '.join(GROUP_FIELDS)}"
+        )
+
+    groups = []
+    progress = ToolProgress(total=max(days, 0))
+    with tool_deadline(deadline_seconds):
+        stream = DeadlineStream(
+            client.iter_heartbeat_days(
+                date_range(first, today), user=user, project=project_name
+            ),
+            progress,
+            max(days, 0),
+        )
+        async for day, day_logs in stream:
+            # Nothing counts across days, so each day is totalled on its own
+            day_groups = group_durations(
+                day_logs,
+                group_by=group_by,
+                timeout=timeout_minutes * 60,
+                segments=[0] * len(day_logs),
+            )
+            groups = merge_group_durations(groups + day_groups)
+            await progress.advance(f"Processed {day}")
+
+    result = {
+        "group_by": group_by,
+        "start": min(first, today).isoformat(),
+        "end": today.isoformat(),
+        "timeout_seconds": timeout_minutes * 60,
+        "total_seconds": sum(group.total_seconds for group in groups),
+        "data": [
+            {
+                "name": group.name,
+                "total_seconds": group.total_seconds,
+                "text": format_duration(group.total_seconds),
+                "heartbeats": group.heartbeats,
+            }
+            for group in groups[:limit]
+        ],
+    }
+    if stream.truncated:
+        result["truncated"] = stream.truncated
+    return result
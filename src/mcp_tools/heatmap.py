@@ -0,0 +1,108 @@
+"""Wakapi activity heatmap tool."""
+
+from datetime import datetime
+from typing import Any, Optional
+
+from mcp_server import app
+from mcp_tools.day_range import resolve_days, user_timezone
+from mcp_tools.deadline import DeadlineStream, tool_deadline
+from mcp_tools.dependency_injection import get_local_store, get_wakapi_client
+from mcp_tools.progress import ToolProgress
+from wakapi_sdk.core.durations import DEFAULT_TIMEOUT_SECONDS, hourly_durations
+from wakapi_sdk.core.store import scope_key
+
+WEEKDAYS = [
+    "Monday",
+    "Tuesday",
+    "Wednesday",
+    "Thursday",
+    "Friday",
+    "Saturday",
+    "Sunday",
+]
+
+
+@app.tool
+async def get_activity_heatmap(
+    user: str = "current",
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    project_name: Optional[str] = None,
+    timeout_minutes: float = DEFAULT_TIMEOUT_SECONDS / 60,
+    deadline_seconds: Optional[float] = None,
+) -> dict[str, Any]:
+    """Get coded seconds per weekday and hour of day over a date range.
+
+    Answers "when am I most productive?" without pulling raw heartbeats into
+    the conversation. Hours are taken in the user's Wakapi timezone. Hourly
+    totals of complete days are kept in the local store, so repeated queries
+    over overlapping ranges only fetch and compute days not seen before.
+
+    Args:
+        user (str, required, default="current"): Username (or current).
+        start (str, optional): First day (YYYY-MM-DD); defaults to 29 days
+            before end.
+        end (str, optional): Last day (YYYY-MM-DD); defaults to today.
+        project_name (str, optional): Only count heartbeats of this project.
+        timeout_minutes (float, default=10): Longest gap counted as activity.
+        deadline_seconds (float, optional): Time budget of the call; defaults
+            to the configured tool deadline.
+
+    Returns:
+        Dict with timezone, start, end, weekdays (row labels, Monday first),
+        matrix (7 rows of 24 hourly seconds totals), total_seconds,
+        days_fetched and days_cached. If the deadline passed first, the
+        matrix covers the days computed so far and truncated describes them.
+    """
+    client = get_wakapi_client()
+    store = get_local_store()
+    tz = await user_timezone(client, user)
+    today = datetime.now(tz).date()
+    days = resolve_days(start, end, tz, default_days=30)
+    scope = scope_key(
+        user=user, project=project_name, timeout=timeout_minutes * 60, tz=tz.key
+    )
+    rollups = store.hourly_rollups(scope, (day.isoformat() for day in days))
+    missing = [day for day in days if day.isoformat() not in rollups]
+
+    computed = []
+    # Days answered from the local store count as done
+    progress = ToolProgress(total=len(days))
+    await progress.advance(steps=len(days) - len(missing))
+    with tool_deadline(deadline_seconds):
+        stream = DeadlineStream(
+            client.iter_heartbeat_days(missing, user=user, project=project_name),
+            progress,
+            len(days),
+        )
+        async for day, day_logs in stream:
+            computed.append(
+                hourly_durations(day_logs, timeout_minutes * 60, tz).tolist()
+            )
+            await progress.advance(f"Processed {day}")
+    fresh = {day.isoformat(): hours for day, hours in zip(missing, computed)}
+    # The current day (and any future one) is still changing
+    store.save_hourly_rollups(
+        scope, {day: hours for day, hours in fresh.items() if day < today.isoformat()}
+    )
+    rollups.update(fresh)
+
+    matrix = [[0.0] * 24 for _ in WEEKDAYS]
+    for day in days:
+        row = matrix[day.weekday()]
+        for hour, seconds in enumerate(rollups.get(day.isoformat(), ())):
+            row[hour] += seconds
+
+    result = {
+        "timezone": tz.key,
+        "start": days[0].isoformat(),
+        "end": days[-1].isoformat(),
+        "weekdays": WEEKDAYS,
+        "matrix": [[round(seconds, 1) for seconds in row] for row in matrix],
+        "total_seconds": sum(sum(row) for row in matrix),
+        "days_fetched": len(computed),
+        "days_cached": len(days) - len(missing),
+    }
+    if stream.truncated:
+        result["truncated"] = stream.truncated
+    return result
@@ -0,0 +1,91 @@
+"""Wakapi file hot-spot ranking tool."""
+
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from mcp_server import app
+from mcp_tools.deadline import DeadlineStream, tool_deadline
+from mcp_tools.dependency_injection import get_wakapi_client
+from mcp_tools.progress import ToolProgress
+from wakapi_sdk.core.durations import DEFAULT_TIMEOUT_SECONDS
+from wakapi_sdk.core.hotspots import SORT_KEYS, HotspotCounter, rollup_directories
+from wakapi_sdk.core.streaming import date_range
+
+
+@app.tool
+async def get_file_hotspots(
+    user: str = "current",
+    days: int = 7,
+    project_name: Optional[str] = None,
+    limit: int = 20,
+    sort_by: str = "seconds",
+    directory_depth: Optional[int] = None,
+    timeout_minutes: float = DEFAULT_TIMEOUT_SECONDS / 60,
+    deadline_seconds: Optional[float] = None,
+) -> list[dict[str, Any]]:
+    """Rank the most worked-on files (or directories) over recent days.
+
+    Heartbeats are streamed day by day through per-file counters. Useful to
+    prioritize code review: the files with the most time, writes or changed
+    lines come first.
+
+    Args:
+        user (str, required, default="current"): Username (or current).
+        days (int, default=7): Number of days, counting back from today.
+        project_name (str, optional): Only use heartbeats of this project.
+        limit (int, default=20): Maximum number of entries returned.
+        sort_by (str, default="seconds"): seconds, writes, lines_changed or
+            heartbeats.
+        directory_depth (int, optional): Roll files up into directories this
+            many levels below the directory all files share.
+        timeout_minutes (float, default=10): Longest gap counted as activity.
+        deadline_seconds (float, optional): Time budget of the call; defaults
+            to the configured tool deadline.
+
+    Returns:
+        List of entries, most active first, each with path, seconds,
+        heartbeats, writes, line_additions and line_deletions. Directory
+        paths end with "/". If the deadline passed first, the ranking of the
+        days fetched so far is followed by a {"truncated": true, ...} entry.
+    """
+    if sort_by not in SORT_KEYS:
+        raise ValueError(f"sort_by must be one of {', '.join(SORT_KEYS)}")
+    client = get_wakapi_client()
+    today = datetime.now().date()
+    counter = HotspotCounter(timeout=timeout_minutes * 60)
+
+    first = today - timedelta(days=days - 1)
+    progress = ToolProgress(total=max(days, 0))
+    with tool_deadline(deadline_seconds):
+        stream = DeadlineStream(
+            client.iter_heartbeat_days(
+                date_range(first, today), user=user, project=project_name
+            ),
+            progress,
+            max(days, 0),
+        )
+        async for day, day_logs in stream:
+            for heartbeat in day_logs:
+                if heartbeat.type in (None, "file"):
+                    counter.feed(heartbeat)
+            counter.end_segment()
+            await progress.advance(f"Processed {day}")
+
+    if directory_depth is None:
+        ranked = counter.top(limit, sort_by)
+    else:
+        ranked = rollup_directories(counter.files, directory_depth, limit, sort_by)
+    ranked = [
+        {
+            "path": activity.path,
+            "seconds": activity.seconds,
+            "heartbeats": activity.heartbeats,
+            "writes": activity.writes,
+            "line_additions": activity.line_additions,
+            "line_deletions": activity.line_deletions,
+        }
+        for activity in ranked
+    ]
+    if stream.truncated:
+        ranked.append(stream.truncated)
+    return ranked
@@ -0,0 +1,62 @@
+"""Progress notifications and partial results for long-running tools."""
+
+import json
+from typing import Any, Optional
+
+from fastmcp.server.dependencies import get_context
+from wakapi_sdk.core.logging import get_logger
+
+logger = get_logger("tool_progress")
+
+# Logger name of log messages carrying partial results
+PARTIAL_RESULT_LOGGER = "partial_result"
+
+
+class ToolProgress:
+    """
+    Reports the progress of a tool call to the MCP client.
+
+    Progress is only sent when the client asked for it (with a progress
+    token) and partial results only when the tool call enabled them. Outside
+    an MCP request, as when tools are called directly, both do nothing.
+    """
+
+    def __init__(self, total: Optional[float] = None, partial: bool = False):
+        """
+        Initialize for total steps (e.g. days).
+
+        Args:
+            total: Number of steps, when known.
+            partial: Send partial results as log messages.
+        """
+        self.total = total
+        self.done = 0.0
+        self.partial_results = partial
+        try:
+            self._context = get_context()
+        except RuntimeError:
+            self._context = None
+
+    async def advance(self, message: Optional[str] = None, steps: float = 1) -> None:
+        """Mark steps as done and notify the client."""
+        self.done += steps
+        if self._context is None:
+            return
+        try:
+            await self._context.report_progress(self.done, self.total, message)
+        except Exception as e:
+            # Progress is best effort; the result matters more
+            logger.debug("Failed to report progress", error=str(e))
+
+    async def partial(self, chunk: Any) -> None:
+        """Send chunk of the result as an info log message, if enabled."""
+        if not self.partial_results or self._context is None:
+            return
+        try:
+            await self._context.log(
+                json.dumps(chunk, default=str),
+                level="info",
+                logger_name=PARTIAL_RESULT_LOGGER,
+            )
+        except Exception as e:
+            logger.debug("Failed to send partial result", error=str(e))
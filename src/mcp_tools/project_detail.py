@@ -22,6 +22,8 @@ async def get_project_detail(id: str, user: str = "current") -> dict[str, Any]:
 
     Returns:
         v1.ProjectViewModel:
+        - stale (bool): True if Wakapi was unreachable and the last
+          successful response was returned instead.
         - data (Project):
           - id (str): Project ID.
           - name (str): Project name.
@@ -0,0 +1,224 @@
+"""Wakapi custom range statistics tool."""
+
+from datetime import date, datetime
+from typing import Any, Optional
+
+from mcp_server import app
+from mcp_tools.day_range import resolve_days, summary_day, user_timezone
+from mcp_tools.deadline import DeadlineStream, tool_deadline
+from mcp_tools.dependency_injection import get_local_store, get_wakapi_client
+from mcp_tools.progress import ToolProgress
+from wakapi_sdk.core.durations import group_durations
+from wakapi_sdk.core.planner import (
+    HEARTBEATS,
+    LOCAL_ROLLUPS,
+    STATS,
+    SUMMARIES,
+    CostModel,
+    Query,
+    QueryPlanner,
+)
+from wakapi_sdk.core.rollups import merge_totals, stats_data, summary_totals
+from wakapi_sdk.core.store import scope_key
+
+# Heartbeat fields totalled per stats dimension
+HEARTBEAT_DIMENSIONS = {
+    "projects": "project",
+    "languages": "language",
+    "branches": "branch",
+}
+
+
+async def sync_summaries(client, store, scope: str, user: str, days, today: date):
+    """
+    Fetch the summaries of days and store the complete ones.
+
+    Returns the totals of the days that cannot be stored yet (today).
+    """
+    result = await client.get_summaries(
+        user=user, start=min(days).isoformat(), end=max(days).isoformat()
+    )
+    fetched = {}
+    for summary in result.data:
+        fetched[summary_day(summary)] = summary_totals(summary)
+    # Days without a summary had no activity; store them empty
+    store.save_stats_rollups(
+        scope,
+        {day.isoformat(): fetched.get(day, {}) for day in days if day < today},
+    )
+    return {day: totals for day, totals in fetched.items() if day >= today}
+
+
+async def local_rollup_totals(client, store, scope: str, user: str, days, today):
+    """
+    Total days from the local rollups, syncing the days not stored yet.
+
+    Returns the totals and the number of rollup periods summed.
+    """
+    periods, missing = store.plan_stats_periods(scope, days[0], days[-1])
+    pending = {}
+    if missing:
+        pending = await sync_summaries(client, store, scope, user, missing, today)
+        periods, _ = store.plan_stats_periods(scope, days[0], days[-1])
+    totals = store.sum_stats_periods(scope, periods)
+    for day_totals in pending.values():
+        merge_totals(totals, day_totals)
+    return totals, len(periods)
+
+
+async def summaries_totals(client, user: str, days, filters: dict):
+    """Total days from one summaries request."""
+    result = await client.get_summaries(
+        user=user, start=days[0].isoformat(), end=days[-1].isoformat(), **filters
+    )
+    totals: dict = {}
+    for summary in result.data:
+        merge_totals(totals, summary_totals(summary))
+    return totals
+
+
+async def heartbeat_totals(client, user: str, days, filters: dict):
+    """
+    Total days from their raw heartbeats.
+
+    Returns the totals and, if the deadline passed first, a truncation
+    marker (the totals then cover the days fetched so far).
+    """
+    totals: dict = {}
+    progress = ToolProgress(total=len(days))
+    stream = DeadlineStream(
+        client.iter_heartbeat_days(days, user=user, project=filters.get("project")),
+        progress,
+        len(days),
+    )
+    async for day, day_logs in stream:
+        heartbeats = [
+            heartbeat
+            for heartbeat in day_logs
+            if all(getattr(heartbeat, k) == v for k, v in filters.items())
+        ]
+        # Nothing counts across days, so each day is totalled on its own
+        segments = [0] * len(heartbeats)
+        merge_totals(
+            totals,
+            {
+                dimension: {
+                    group.name: group.total_seconds
+                    for group in group_durations(heartbeats, field, segments=segments)
+                    if group.name is not None
+                }
+                for dimension, field in HEARTBEAT_DIMENSIONS.items()
+            },
+        )
+        await progress.advance(f"Processed {day}")
+    return totals, stream.truncated
+
+
+@app.tool
+async def get_range_stats(
+    user: str = "current",
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    project: Optional[str] = None,
+    language: Optional[str] = None,
+    editor: Optional[str] = None,
+    operating_system: Optional[str] = None,
+    machine: Optional[str] = None,
+    label: Optional[str] = None,
+    branch: Optional[str] = None,
+    entity: Optional[str] = None,
+    deadline_seconds: Optional[float] = None,
+) -> dict[str, Any]:
+    """Get statistics for an arbitrary date range, like get_stats.
+
+    get_stats only accepts fixed ranges such as last_7_days. This tool answers
+    any range from the cheapest source able to: daily rollups of Wakapi
+    summaries kept in the local store (unfiltered queries; days not stored yet
+    are synced with a single summaries request), one stats request (ranges
+    matching today, yesterday, last_7_days or last_30_days), one summaries
+    request, or one heartbeats request per day (branch and entity filters).
+    Request costs are estimated from the latencies measured so far.
+
+    Args:
+        user (str, required, default="current"): Username (or current).
+        start (str, optional): First day (YYYY-MM-DD); defaults to 29 days
+            before end.
+        end (str, optional): Last day (YYYY-MM-DD); defaults to today.
+        project (str, optional): Only count this project.
+        language (str, optional): Only count this language.
+        editor (str, optional): Only count this editor.
+        operating_system (str, optional): Only count this operating system.
+        machine (str, optional): Only count this machine.
+        label (str, optional): Only count projects with this label.
+        branch (str, optional): Only count this branch (from heartbeats).
+        entity (str, optional): Only count this file (from heartbeats).
+        deadline_seconds (float, optional): Time budget of the call; defaults
+            to the configured tool deadline.
+
+    Returns:
+        Dict with data (fields of StatsData: total_seconds, daily_average,
+        projects, languages, editors, operating_systems, machines, branches,
+        categories, ...) and meta (plan: chosen source, estimated seconds,
+        upstream requests and the estimate of every candidate source; for
+        local rollups also rollup_periods summed and days_synced; for
+        heartbeats cut short by the deadline also truncated).
+    """
+    client = get_wakapi_client()
+    store = get_local_store()
+    tz = await user_timezone(client, user)
+    today = datetime.now(tz).date()
+    days = resolve_days(start, end, tz, default_days=30)
+    scope = scope_key(user=user, tz=tz.key)
+    filters = {
+        name: value
+        for name, value in {
+            "project": project,
+            "language": language,
+            "editor": editor,
+            "operating_system": operating_system,
+            "machine": machine,
+            "label": label,
+            "branch": branch,
+            "entity": entity,
+        }.items()
+        if value is not None
+    }
+
+    planner = QueryPlanner(CostModel(client.metrics))
+    _, missing = store.plan_stats_periods(scope, days[0], days[-1])
+    plan = planner.plan(Query(days[0], days[-1], today, filters), len(missing))
+    meta: dict[str, Any] = {"plan": plan.as_metadata()}
+
+    with tool_deadline(deadline_seconds):
+        try:
+            if plan.source == LOCAL_ROLLUPS:
+                totals, meta["rollup_periods"] = await local_rollup_totals(
+                    client, store, scope, user, days, today
+                )
+                meta["days_synced"] = len(missing)
+            elif plan.source == STATS:
+                result = await client.get_stats(
+                    range=plan.stats_range, user=user, **filters
+                )
+                totals = summary_totals(result.data)
+            elif plan.source == HEARTBEATS:
+                totals, truncated = await heartbeat_totals(client, user, days, filters)
+                if truncated:
+                    meta["truncated"] = truncated
+            else:
+                totals = await summaries_totals(client, user, days, filters)
+        except Exception as e:
+            # Local rollups are synced from summaries
+            source = SUMMARIES if plan.source == LOCAL_ROLLUPS else plan.source
+            raise ValueError(f"Failed to fetch {source}: {e}") from e
+
+    return {
+        "data": stats_data(
+            totals,
+            days[0].isoformat(),
+            days[-1].isoformat(),
+            len(days),
+            user,
+        ),
+        "meta": meta,
+    }
@@ -4,7 +4,40 @@ from datetime import datetime, timedelta
 from typing import Any, Optional
 
 from mcp_server import app
+from mcp_tools.day_range import active_days
+from mcp_tools.deadline import tool_deadline, truncation_marker
 from mcp_tools.dependency_injection import get_wakapi_client
+from mcp_tools.progress import ToolProgress
+from wakapi_sdk.core.exceptions import DeadlineExceededError
+from wakapi_sdk.core.streaming import gather_or_cancel
+
+
+def heartbeat_dict(log) -> dict[str, Any]:
+    """Convert a heartbeat entry to the dict returned by get_recent_logs."""
+    return {
+        "id": log.id,
+        "project": log.project,
+        "language": log.language,
+        "entity": log.entity,
+        "time": log.time.timestamp()
+        if isinstance(log.time, datetime)
+        else log.time,
+        "is_write": log.is_write,
+        "branch": log.branch,
+        "category": getattr(log, "category", None),
+        "cursorpos": getattr(log, "cursorpos", None),
+        "line_additions": getattr(log, "line_additions", None),
+        "line_deletions": getattr(log, "line_deletions", None),
+        "lineno": getattr(log, "lineno", None),
+        "lines": getattr(log, "lines", None),
+        "type": log.type,
+        "user_agent_id": getattr(log, "user_agent_id", None),
+        "user_id": log.user_id,
+        "machine_name_id": getattr(log, "machine_name_id", None),
+        "created_at": log.time.isoformat()
+        if isinstance(log.time, datetime)
+        else None,
+    }
 
 
 @app.tool
@@ -13,10 +46,14 @@ async def get_recent_logs(
     project_name: Optional[str] = None,
     days: int = 7,
     limit: int = 1000,
+    stream_partial: bool = False,
+    deadline_seconds: Optional[float] = None,
 ) -> list[dict[str, Any]]:
     """Get heartbeats of user for recent days (extension of heartbeats GET).
 
     Mimics https://wakatime.com/api/v1/users/{user}/heartbeats for multiple days.
+    Days without coded time according to the user's summaries are skipped.
+    Progress is reported per fetched day.
 
     Requires ApiKeyAuth: Set header `Authorization` to your API Key encoded as Base64
     and prefixed with `Basic`.
@@ -26,6 +63,11 @@ async def get_recent_logs(
         project_name (str, optional): Filter by project.
         days (int, default=7): Number of days to retrieve.
         limit (int, default=1000): Maximum number of heartbeats.
+        stream_partial (bool, default=False): Also send each day's heartbeats
+            as soon as they arrive, as info log messages of the
+            "partial_result" logger ({"day": ..., "heartbeats": [...]}).
+        deadline_seconds (float, optional): Time budget of the call; defaults
+            to the configured tool deadline.
 
     Returns:
         List of HeartbeatEntry: Each with id (str), project (str), language (str),
@@ -33,7 +75,9 @@ async def get_recent_logs(
         cursorpos (int), line_additions (int), line_deletions (int), lineno (int),
         lines (int), type (str), user_agent_id (str), user_id (str),
         machine_name_id (str), created_at (str).
-        Sorted by time descending.
+        Sorted by time descending. If the deadline passed before every day
+        was fetched, a last entry {"truncated": true, "reason",
+        "days_completed", "days_requested"} marks the list as incomplete.
     """
     client = get_wakapi_client()
 
@@ -41,18 +85,56 @@ async def get_recent_logs(
     all_logs = []
 
     current_date = end_date.date()
-    for i in range(days):
-        day_date = current_date - timedelta(days=i)
+
+    fetched_days = []
+    truncated = []
+
+    async def fetch_day(day_date):
         try:
             day_logs = await client.get_heartbeats(
                 user=user,
                 date=day_date,
                 project=project_name,
-                limit=limit // days + 1 if days > 0 else limit,
+                limit=limit // len(fetched_days) + 1,
+            )
+        except DeadlineExceededError:
+            truncated.append(day_date)
+            return []
+        day_logs = day_logs.data if hasattr(day_logs, "data") else day_logs
+        await progress.advance(f"Fetched {day_date}")
+        if stream_partial:
+            await progress.partial(
+                {
+                    "day": day_date.isoformat(),
+                    "heartbeats": [heartbeat_dict(log) for log in day_logs],
+                }
+            )
+        return day_logs
+
+    with tool_deadline(deadline_seconds):
+        # One summaries request finds the days worth a heartbeats request
+        try:
+            fetched_days = await active_days(
+                client,
+                user,
+                [current_date - timedelta(days=i) for i in range(days)],
+                project_name,
+            )
+        except DeadlineExceededError:
+            return [truncation_marker(0, days)]
+        progress = ToolProgress(total=len(fetched_days), partial=stream_partial)
+
+        # Days are fetched concurrently; the client's adaptive concurrency
+        # limit decides how many requests are actually in flight. A failing
+        # day cancels the others.
+        try:
+            day_results = await gather_or_cancel(
+                *(fetch_day(day_date) for day_date in fetched_days)
             )
-            all_logs.extend(day_logs.data if hasattr(day_logs, "data") else day_logs)
         except Exception as e:
             raise ValueError(f"Failed to fetch recent logs: {e}") from e
+    for day_logs in day_results:
+        all_logs.extend(day_logs)
 
     # Sort by time descending
     all_logs.sort(key=lambda log: log.time, reverse=True)
@@ -61,30 +143,9 @@ async def get_recent_logs(
     all_logs = all_logs[:limit]
 
     # Convert to dict
-    return [
-        {
-            "id": log.id,
-            "project": log.project,
-            "language": log.language,
-            "entity": log.entity,
-            "time": log.time.timestamp()
-            if isinstance(log.time, datetime)
-            else log.time,
-            "is_write": log.is_write,
-            "branch": log.branch,
-            "category": getattr(log, "category", None),
-            "cursorpos": getattr(log, "cursorpos", None),
-            "line_additions": getattr(log, "line_additions", None),
-            "line_deletions": getattr(log, "line_deletions", None),
-            "lineno": getattr(log, "lineno", None),
-            "lines": getattr(log, "lines", None),
-            "type": log.type,
-            "user_agent_id": getattr(log, "user_agent_id", None),
-            "user_id": log.user_id,
-            "machine_name_id": getattr(log, "machine_name_id", None),
-            "created_at": log.time.isoformat()
-            if isinstance(log.time, datetime)
-            else None,
-        }
-        for log in all_logs
-    ]
+    result = [heartbeat_dict(log) for log in all_logs]
+    if truncated:
+        result.append(
+            truncation_marker(len(fetched_days) - len(truncated), len(fetched_days))
+        )
+    return result
@@ -0,0 +1,91 @@
+"""Wakapi coding sessions tool."""
+
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from mcp_server import app
+from mcp_tools.deadline import DeadlineStream, tool_deadline
+from mcp_tools.dependency_injection import get_wakapi_client
+from mcp_tools.progress import ToolProgress
+from wakapi_sdk.core.sessions import DEFAULT_SESSION_GAP_SECONDS, SessionDetector
+from wakapi_sdk.core.streaming import date_range
+
+
+@app.tool
+async def get_sessions(
+    user: str = "current",
+    days: int = 7,
+    project_name: Optional[str] = None,
+    gap_minutes: float = DEFAULT_SESSION_GAP_SECONDS / 60,
+    max_files: int = 10,
+    stream_partial: bool = False,
+    deadline_seconds: Optional[float] = None,
+) -> list[dict[str, Any]]:
+    """Get coding sessions of user for recent days, detected from heartbeats.
+
+    A session ends when no heartbeat arrives for more than gap_minutes.
+    Heartbeats are streamed oldest first and each session is summarized as
+    soon as it closes. Progress is reported per day.
+
+    Args:
+        user (str, required, default="current"): Username (or current).
+        days (int, default=7): Number of days, counting back from today.
+        project_name (str, optional): Only use heartbeats of this project.
+        gap_minutes (float, default=15): Inactivity that ends a session.
+        max_files (int, default=10): Maximum files listed per session.
+        stream_partial (bool, default=False): Also send sessions as soon as
+            they close, as info log messages of the "partial_result" logger
+            ({"day": ..., "sessions": [...]}, once per day).
+        deadline_seconds (float, optional): Time budget of the call; defaults
+            to the configured tool deadline.
+
+    Returns:
+        List of sessions, oldest first, each with start and end (ISO 8601),
+        duration_seconds, heartbeats (count), project (dominant project),
+        projects, languages, files (names, most time first) and files_touched.
+        If the deadline passed first, the sessions of the days fetched so far
+        are followed by a {"truncated": true, ...} marker entry.
+    """
+    client = get_wakapi_client()
+    today = datetime.now().date()
+    detector = SessionDetector(gap=gap_minutes * 60)
+    sessions = []
+
+    def summarize(session) -> dict[str, Any]:
+        return {
+            "start": datetime.fromtimestamp(session.start).isoformat(),
+            "end": datetime.fromtimestamp(session.end).isoformat(),
+            "duration_seconds": session.duration,
+            "heartbeats": session.heartbeats,
+            "project": session.dominant_project,
+            "projects": [name for name, _ in session.projects.most_common()],
+            "languages": [name for name, _ in session.languages.most_common()],
+            "files": [name for name, _ in session.files.most_common(max_files)],
+            "files_touched": len(session.files),
+        }
+
+    first = today - timedelta(days=days - 1)
+    progress = ToolProgress(total=max(days, 0), partial=stream_partial)
+    with tool_deadline(deadline_seconds):
+        stream = DeadlineStream(
+            client.iter_heartbeat_days(
+                date_range(first, today), user=user, project=project_name
+            ),
+            progress,
+            max(days, 0),
+        )
+        async for day, day_logs in stream:
+            closed = len(sessions)
+            for heartbeat in day_logs:
+                session = detector.feed(heartbeat)
+                if session is not None:
+                    sessions.append(summarize(session))
+            await progress.advance(f"Processed {day}")
+            await progress.partial({"day": day, "sessions": sessions[closed:]})
+
+    session = detector.close()
+    if session is not None:
+        sessions.append(summarize(session))
+    if stream.truncated:
+        sessions.append(stream.truncated)
+    return sessions
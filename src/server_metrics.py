@@ -0,0 +1,114 @@
+"""
+Server-side metrics for the SSE transport.
+
+`EventLoopLagMonitor` samples how late the event loop wakes up from a short
+sleep; sustained lag means tool calls or JSON handling block the loop.
+`ServerMetricsMiddleware` starts the monitor with the ASGI app and counts
+HTTP requests and open SSE sessions. Both report into `server_metrics`,
+served as JSON on `/metrics`.
+"""
+
+import asyncio
+import time
+from typing import Optional
+
+from wakapi_sdk.core.metrics import ClientMetrics
+
+# How often the event loop lag is sampled
+LAG_SAMPLE_INTERVAL = 0.05
+
+# Enough samples for several minutes of load at the sample interval
+LAG_SAMPLE_WINDOW = 8192
+
+server_metrics = ClientMetrics(sample_window=LAG_SAMPLE_WINDOW)
+
+
+class EventLoopLagMonitor:
+    """Background task measuring event loop scheduling delay."""
+
+    def __init__(
+        self, metrics: ClientMetrics, interval: float = LAG_SAMPLE_INTERVAL
+    ) -> None:
+        """Initialize the monitor; sampling begins with start()."""
+        self.metrics = metrics
+        self.interval = interval
+        self.started_at = time.monotonic()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the sampling task is alive."""
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start sampling on the running loop, if not already started."""
+        loop = asyncio.get_running_loop()
+        if self.running and self._task.get_loop() is loop:
+            return
+        self.started_at = time.monotonic()
+        self._task = loop.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop sampling."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.metrics.observe(
+                "event_loop_lag_seconds", max(0.0, loop.time() - expected)
+            )
+
+
+lag_monitor = EventLoopLagMonitor(server_metrics)
+
+
+class ServerMetricsMiddleware:
+    """ASGI middleware starting the lag monitor and counting sessions."""
+
+    # Open SSE sessions; kept outside server_metrics so a reset cannot skew it
+    active_sessions = 0
+
+    def __init__(self, app, sse_path: str = "/sse") -> None:
+        """Wrap app; requests to sse_path are counted as SSE sessions."""
+        self.app = app
+        self.sse_path = sse_path
+
+    async def __call__(self, scope, receive, send) -> None:
+        """Handle an ASGI connection."""
+        lag_monitor.start()
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        if path != self.sse_path:
+            server_metrics.increment("http_requests", path=path)
+            await self.app(scope, receive, send)
+            return
+
+        server_metrics.increment("sse_sessions_total")
+        ServerMetricsMiddleware.active_sessions += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            ServerMetricsMiddleware.active_sessions -= 1
+
+
+def metrics_snapshot(client_metrics: Optional[ClientMetrics] = None) -> dict:
+    """Return server metrics, and the Wakapi client's if given, as JSON data."""
+    snapshot = server_metrics.snapshot()
+    snapshot["uptime_seconds"] = time.monotonic() - lag_monitor.started_at
+    snapshot["sse_sessions_active"] = ServerMetricsMiddleware.active_sessions
+    if client_metrics is not None:
+        snapshot["wakapi_client"] = client_metrics.snapshot()
+    return snapshot
@@ -2,14 +2,17 @@ import sys
 from pathlib import Path
 import pytest
 from unittest.mock import AsyncMock, MagicMock
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
+from functools import partial
 
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from wakapi_sdk.core.config import ConfigManager
-from wakapi_sdk.core.models import WakapiSummary
+from wakapi_sdk.core.config import ConfigManager, WakapiConfig
+from wakapi_sdk.core.metrics import ClientMetrics
+from wakapi_sdk.core.streaming import HeartbeatStreamConfig
 from wakapi_sdk.client import (
+    WakapiClient,
     StatsViewModel,
     StatsData,
     SummariesEntry,
@@ -28,6 +31,12 @@ from wakapi_sdk.client import (
     ProjectViewModel,
     HeartbeatEntry,
     HeartbeatsResult,
+    SummariesCumulativeTotal,
+    SummariesDailyAverage,
+    SummariesData,
+    SummariesGrandTotal,
+    SummariesRange,
+    SummariesViewModel,
 )
 
 from mcp_tools.dependency_injection import (
@@ -67,10 +76,9 @@ def setup_config_manager(mock_config_manager, mock_wakapi_client):
 def mock_config_manager():
     """Mock config manager"""
     mock_manager = MagicMock(spec=ConfigManager)
-    mock_wakapi_config = MagicMock()
-    mock_wakapi_config.url = "http://localhost:3000"
-    mock_wakapi_config.api_key = "test_api_key"
-    mock_manager.get_wakapi_config.return_value = mock_wakapi_config
+    mock_manager.get_wakapi_config.return_value = WakapiConfig(
+        url="http://localhost:3000", api_key="test_api_key"
+    )
     return mock_manager
 
 
@@ -83,7 +91,9 @@ def mock_wakapi_client():
     mock_config = MagicMock()
     mock_config.api_key = "test_api_key"
     mock_config.base_url = "http://localhost:3000"
+    mock_config.heartbeat_stream = HeartbeatStreamConfig()
     mock_client.config = mock_config
+    mock_client.metrics = ClientMetrics()
 
     # Mock heartbeats data
     mock_heartbeats_data = HeartbeatsResult(
@@ -294,19 +304,25 @@ def mock_wakapi_client():
         )
     )
 
-    # Mock summaries
-    mock_summaries = [
-        WakapiSummary(date=date(2024, 1, 1), total_time=3600, total_count=100)
-    ]
+    # Mock summaries: an hour coded on every requested day
+    async def get_summaries(user="current", start=None, end=None, **filters):
+        first, last = date.fromisoformat(start), date.fromisoformat(end)
+        days = (last - first).days + 1
+        return summaries_view({first + timedelta(days=i): 3600.0 for i in range(days)})
 
     mock_client.get_heartbeats = AsyncMock(return_value=mock_heartbeats_data)
     mock_client.get_stats = AsyncMock(return_value=mock_stats)
+    # Streaming goes through the mocked get_heartbeats
+    mock_client.iter_heartbeat_days = partial(
+        WakapiClient.iter_heartbeat_days, mock_client
+    )
+    mock_client.iter_heartbeats = partial(WakapiClient.iter_heartbeats, mock_client)
     mock_client.get_projects = AsyncMock(return_value=mock_projects)
     mock_client.get_user = AsyncMock(return_value=mock_user)
     mock_client.get_leaders = AsyncMock(return_value=mock_leaders)
     mock_client.get_all_time_since_today = AsyncMock(return_value=mock_all_time)
     mock_client.get_project_detail = AsyncMock(return_value=mock_project_detail)
-    mock_client.get_summaries = AsyncMock(return_value=mock_summaries)
+    mock_client.get_summaries = AsyncMock(side_effect=get_summaries)
     mock_client.post_heartbeat = AsyncMock(
         return_value=HeartbeatEntry(
             id="posted",
@@ -334,3 +350,78 @@ def mock_wakapi_client():
     mock_client.test_connection = AsyncMock(return_value=True)
 
     return mock_client
+
+
+def _digital(seconds: float) -> str:
+    return f"{int(seconds // 3600)}:{int(seconds % 3600 // 60):02d}"
+
+
+def _text(seconds: float) -> str:
+    return f"{int(seconds // 3600)} hrs {int(seconds % 3600 // 60)} mins"
+
+
+def _summaries_entry(name: str, seconds: float) -> SummariesEntry:
+    return SummariesEntry(
+        name=name,
+        percent=100.0,
+        total_seconds=seconds,
+        text=_text(seconds),
+        digital=_digital(seconds),
+        hours=int(seconds // 3600),
+        minutes=int(seconds % 3600 // 60),
+    )
+
+
+def summaries_view(seconds_by_day: dict[date, float]) -> SummariesViewModel:
+    """Build Wakapi summaries of test_project in Python for each day"""
+    # Like Wakapi, range.date is when the response was made, not the day
+    now = datetime.now().astimezone().isoformat()
+    data = [
+        SummariesData(
+            grand_total=SummariesGrandTotal(
+                digital=_digital(seconds),
+                hours=int(seconds // 3600),
+                minutes=int(seconds % 3600 // 60),
+                text=_text(seconds),
+                total_seconds=seconds,
+            ),
+            projects=[_summaries_entry("test_project", seconds)] if seconds else [],
+            languages=[_summaries_entry("Python", seconds)] if seconds else [],
+            range=SummariesRange(
+                date=now,
+                start=f"{day.isoformat()}T00:00:00+02:00",
+                end=f"{day.isoformat()}T23:59:59+02:00",
+                text=day.isoformat(),
+                timezone="Europe/Berlin",
+            ),
+        )
+        for day, seconds in sorted(seconds_by_day.items())
+    ]
+    total = sum(seconds_by_day.values())
+    average = total / max(1, len(data))
+    return SummariesViewModel(
+        cumulative_total=SummariesCumulativeTotal(
+            decimal=f"{total / 3600:.2f}",
+            digital=_digital(total),
+            seconds=total,
+            text=_text(total),
+        ),
+        daily_average=SummariesDailyAverage(
+            days_including_holidays=len(data),
+            days_minus_holidays=len(data),
+            holidays=0,
+            seconds=int(average),
+            seconds_including_other_language=int(average),
+            text=_text(average),
+            text_including_other_language=_text(average),
+        ),
+        data=data,
+        start=min(seconds_by_day, default=date.today()).isoformat(),
+        end=max(seconds_by_day, default=date.today()).isoformat(),
+    )
+
+
+@pytest.fixture
+def make_summaries():
+    """Factory of real summaries responses, by coded seconds per day"""
+    return summaries_view
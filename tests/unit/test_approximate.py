@@ -0,0 +1,68 @@
+import pytest
+from unittest.mock import patch, AsyncMock
+from datetime import datetime, timedelta, timezone
+
+from mcp_server import app
+from mcp_tools.dependency_injection import register_local_store
+
+from wakapi_sdk.client import HeartbeatsResult, HeartbeatEntry
+from wakapi_sdk.core.store import LocalStore
+
+
+def heartbeat(time, entity):
+    """Create a heartbeat entry."""
+    return HeartbeatEntry(
+        id=str(time),
+        project="test_project",
+        language="Python",
+        entity=entity,
+        time=time,
+        is_write=False,
+        branch="main",
+        type="file",
+        user_id="current",
+    )
+
+
+class TestApproximateActivity:
+    """Tests for approximate activity"""
+
+    @pytest.mark.asyncio
+    async def test_distinct_and_top_entities(self, mock_wakapi_client):
+        """Daily sketches are merged and cached for complete days"""
+        register_local_store(LocalStore())
+        today = datetime.now(timezone.utc).date()
+
+        async def get_heartbeats(user, date, project):
+            start = datetime(date.year, date.month, date.day, 10, tzinfo=timezone.utc)
+            return HeartbeatsResult(
+                data=[
+                    heartbeat(start.timestamp(), "main.py"),
+                    heartbeat(start.timestamp() + 300, f"{date}.md"),
+                ],
+                start=date.isoformat(),
+                end=date.isoformat(),
+                timezone="UTC",
+            )
+
+        with patch(
+            "mcp_tools.approximate.get_wakapi_client",
+            return_value=mock_wakapi_client,
+        ):
+            mock_wakapi_client.get_heartbeats = AsyncMock(side_effect=get_heartbeats)
+            tool = await app.get_tool("get_approximate_activity")
+            start = (today - timedelta(days=9)).isoformat()
+
+            for _ in range(2):
+                result = await tool.run({"start": start, "limit": 1})
+                content = result.structured_content
+                assert content["distinct"] == {
+                    "entity": 11,
+                    "branch": 1,
+                    "project": 1,
+                }
+                assert content["top_entities"][0]["entity"] == "main.py"
+                assert content["top_entities"][0]["seconds"] >= 3000
+
+            assert content["days_cached"] == 9
+            assert mock_wakapi_client.get_heartbeats.call_count == 11
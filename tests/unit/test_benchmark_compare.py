@@ -0,0 +1,76 @@
+import copy
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from benchmarks.compare import Tolerances, compare
+
+BASELINE = {
+    "tools": {
+        "get_recent_logs": {
+            "latency_seconds": {"p50": 0.010, "p95": 0.020},
+            "alloc_peak_bytes": 1_000_000,
+            "upstream_requests": 1.0,
+            "upstream_by_endpoint": {"get_summaries": 1.0},
+        },
+        "get_sessions": {"skipped": "no benchmark case"},
+    },
+    "client": {},
+    "memory": {
+        "get_recent_logs_7d": {
+            "alloc_peak_bytes": 5_000_000,
+            "peak_rss_bytes": 100_000_000,
+            "upstream_requests": 7,
+        }
+    },
+}
+
+
+def regressions(current, tolerances=None):
+    """Names of the metrics that regressed."""
+    return [
+        item.metric for item in compare(BASELINE, current, tolerances) if item.regressed
+    ]
+
+
+class TestBenchmarkCompare:
+    """Tests for the performance regression gate"""
+
+    def test_identical_results_pass(self):
+        """Comparing a baseline with itself finds nothing"""
+        assert regressions(BASELINE) == []
+
+    def test_latency_within_tolerance(self):
+        """Latency growth below the tolerance passes"""
+        current = copy.deepcopy(BASELINE)
+        current["tools"]["get_recent_logs"]["latency_seconds"]["p95"] = 0.024
+
+        assert regressions(current) == []
+
+    def test_latency_regression(self):
+        """Latency growth beyond the tolerance fails"""
+        current = copy.deepcopy(BASELINE)
+        current["tools"]["get_recent_logs"]["latency_seconds"]["p95"] = 0.030
+
+        assert regressions(current) == ["tools.get_recent_logs.latency_p95"]
+
+    def test_upstream_fan_out_regression(self):
+        """Replacing one summaries call by thirty heartbeats calls is caught"""
+        current = copy.deepcopy(BASELINE)
+        tool = current["tools"]["get_recent_logs"]
+        tool["upstream_requests"] = 30.0
+        tool["upstream_by_endpoint"] = {"get_heartbeats": 30.0}
+
+        assert regressions(current) == [
+            "tools.get_recent_logs.upstream.get_heartbeats",
+            "tools.get_recent_logs.upstream_requests",
+        ]
+
+    def test_rss_tolerance_configurable(self):
+        """A looser RSS tolerance accepts the same growth"""
+        current = copy.deepcopy(BASELINE)
+        current["memory"]["get_recent_logs_7d"]["peak_rss_bytes"] = 115_000_000
+
+        assert regressions(current) == ["memory.get_recent_logs_7d.peak_rss_bytes"]
+        assert regressions(current, Tolerances(rss=0.2)) == []
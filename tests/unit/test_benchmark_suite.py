@@ -0,0 +1,42 @@
+import sys
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from benchmarks.suite import SuiteConfig, run_suite, summarize
+from benchmarks.synthetic import SyntheticConfig, SyntheticDataset
+
+
+class TestBenchmarkSuite:
+    """Tests for the benchmark suite"""
+
+    def test_summarize(self):
+        """Percentiles are computed over the samples"""
+        summary = summarize([0.1 * i for i in range(1, 11)])
+
+        assert summary["count"] == 10
+        assert summary["p50"] == pytest.approx(0.5)
+        assert summary["max"] == pytest.approx(1.0)
+
+    @pytest.mark.asyncio
+    async def test_run_suite(self):
+        """A tiny run covers every tool and client method"""
+        config = SuiteConfig(
+            iterations=2, warmup=0, days=7, heartbeats_per_day=50, memory_days=[]
+        )
+
+        results = await run_suite(config, memory=False)
+
+        # One summaries request, then one heartbeats request per active day
+        dataset = SyntheticDataset(SyntheticConfig(days=7, heartbeats_per_day=50))
+        active = sum(1 for day in dataset.days() if dataset.aggregate(day).heartbeats)
+        assert results["tools"]["get_recent_logs"]["upstream_requests"] == 1 + active
+        assert results["tools"]["get_stats"]["errors"] == 0
+        assert results["client"]["get_heartbeats"]["validate_seconds"]["count"] == 2
+        assert results["first_call"]["cold_seconds"]["count"] == 2
+        assert results["first_call"]["warm_seconds"]["count"] == 2
+        assert results["memory"] == {}
+        assert results["config"]["end_date"] == date.today().isoformat()
@@ -17,14 +17,18 @@ from mcp_tools.dependency_injection import (
     register_wakapi_client,
     inject_dependencies,
 )
-from wakapi_sdk.core.config import ConfigManager
+from wakapi_sdk.core.config import ConfigManager, WakapiConfig
 from wakapi_sdk.client import WakapiClient
 
 
 @pytest.fixture
 def mock_config_manager():
     """Mock config manager"""
-    return MagicMock(spec=ConfigManager)
+    mock_manager = MagicMock(spec=ConfigManager)
+    mock_manager.get_wakapi_config.return_value = WakapiConfig(
+        url="http://localhost:3000", api_key="test_api_key"
+    )
+    return mock_manager
 
 
 @pytest.fixture
@@ -100,3 +104,40 @@ def test_global_inject():
     tool = inject_dependencies(TestTool)
     assert tool.config_manager == mock_config_manager
     assert tool.wakapi_client == mock_wakapi_client
+
+
+@pytest.mark.asyncio
+async def test_close_wakapi_client_flushes_cassette(tmp_path, monkeypatch):
+    """Closing a created client writes responses buffered for the cassette"""
+    import httpx
+    from wakapi_sdk.core.cassette import Cassette, CassetteConfig
+
+    path = tmp_path / "cassette.jsonl.gz"
+    transport = httpx.MockTransport(
+        lambda request: httpx.Response(200, json={"data": []})
+    )
+    monkeypatch.setattr(
+        "mcp_tools.dependency_injection.WakapiClient",
+        lambda config: WakapiClient(config, transport=transport),
+    )
+    config_manager = MagicMock(spec=ConfigManager)
+    config_manager.get_wakapi_config.return_value = WakapiConfig(
+        url="http://localhost:3000",
+        api_key="test_api_key",
+        cassette=CassetteConfig(mode="record", path=str(path)),
+    )
+    injector = DependencyInjector()
+    injector.register_config_manager(config_manager)
+    client = injector.get_wakapi_client()
+    await client.get_projects()
+    assert not path.exists()
+
+    await injector.close_wakapi_client()
+    assert len(Cassette.load(str(path))) == 1
+    assert injector.get_wakapi_client() is not client
+    await injector.close_wakapi_client()
+
+    # Registered clients are left to their owner
+    injector.register_wakapi_client(client)
+    await injector.close_wakapi_client()
+    assert injector.get_wakapi_client() is client
@@ -0,0 +1,70 @@
+import pytest
+from unittest.mock import patch, AsyncMock
+from datetime import datetime
+
+from mcp_server import app
+
+from wakapi_sdk.client import HeartbeatsResult, HeartbeatEntry
+
+
+def heartbeat(time, entity):
+    """Create a heartbeat entry."""
+    return HeartbeatEntry(
+        id=str(time),
+        project="test_project",
+        language="Python",
+        entity=entity,
+        time=time,
+        is_write=False,
+        branch="main",
+        type="file",
+        user_id="current",
+    )
+
+
+class TestDurations:
+    """Tests for durations"""
+
+    @pytest.mark.asyncio
+    async def test_group_by_entity(self, mock_wakapi_client):
+        """Time per file follows the keystroke timeout rule"""
+        start = datetime.now().replace(hour=12, minute=0).timestamp()
+        heartbeats = HeartbeatsResult(
+            data=[
+                heartbeat(start, "a.py"),
+                heartbeat(start + 300, "b.py"),
+                heartbeat(start + 3000, "a.py"),
+            ],
+            start="2023-01-01",
+            end="2023-01-01",
+            timezone="UTC",
+        )
+        with patch(
+            "mcp_tools.durations.get_wakapi_client",
+            return_value=mock_wakapi_client,
+        ):
+            mock_wakapi_client.get_heartbeats = AsyncMock(return_value=heartbeats)
+            tool = await app.get_tool("get_durations")
+            result = await tool.run({"group_by": "entity", "timeout_minutes": 10})
+
+            content = result.structured_content
+            assert content["total_seconds"] == 900.0
+            assert [(g["name"], g["total_seconds"]) for g in content["data"]] == [
+                ("b.py", 600.0),
+                ("a.py", 300.0),
+            ]
+            assert content["data"][0]["text"] == "0h 10m"
+            mock_wakapi_client.get_heartbeats.assert_called_once_with(
+                user="current", date=datetime.now().date(), project=None
+            )
+
+    @pytest.mark.asyncio
+    async def test_invalid_group_by(self, mock_wakapi_client):
+        """Unknown grouping fields are reported"""
+        with patch(
+            "mcp_tools.durations.get_wakapi_client",
+            return_value=mock_wakapi_client,
+        ):
+            tool = await app.get_tool("get_durations")
+            with pytest.raises(ValueError, match=r"Failed to compute durations"):
+                await tool.run({"group_by": "editor"})
@@ -0,0 +1,113 @@
+import sys
+from datetime import date
+from pathlib import Path
+
+import pytest
+import httpx
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from benchmarks.fake_wakapi import FakeWakapi, FakeWakapiConfig
+from benchmarks.synthetic import SyntheticConfig, SyntheticDataset
+from wakapi_sdk.client import WakapiClient, WakapiConfig
+from wakapi_sdk.core.exceptions import ApiError
+
+END_DATE = date(2024, 6, 14)
+
+
+def make_app(config: FakeWakapiConfig = None) -> FakeWakapi:
+    """Create a fake Wakapi over a small fixed dataset."""
+    dataset = SyntheticDataset(
+        SyntheticConfig(seed=1, days=14, end_date=END_DATE, heartbeats_per_day=200)
+    )
+    return FakeWakapi(dataset, config)
+
+
+def make_client(app: FakeWakapi) -> WakapiClient:
+    """Create a WakapiClient talking to app in-process."""
+    return WakapiClient(
+        WakapiConfig(base_url="http://fake-wakapi", api_key="test_api_key"),
+        transport=httpx.ASGITransport(app=app),
+    )
+
+
+class TestSyntheticDataset:
+    """Tests for the synthetic heartbeat generator"""
+
+    def test_deterministic(self):
+        """The same seed yields the same heartbeats"""
+        first = make_app().dataset.heartbeats(END_DATE)
+        second = make_app().dataset.heartbeats(END_DATE)
+        assert first == second
+
+    def test_heartbeats_in_time_order(self):
+        """Heartbeats of a day are sorted by time"""
+        times = [item["time"] for item in make_app().dataset.heartbeats(END_DATE)]
+        assert times == sorted(times)
+
+
+class TestFakeWakapi:
+    """Tests for the fake Wakapi ASGI app"""
+
+    @pytest.mark.asyncio
+    async def test_every_client_endpoint(self):
+        """Every WakapiClient method parses the fake responses"""
+        app = make_app()
+        client = make_client(app)
+
+        heartbeats = await client.get_heartbeats(date=END_DATE.isoformat())
+        stats = await client.get_stats(range="last_7_days")
+        summaries = await client.get_summaries(start="2024-06-10", end="2024-06-14")
+        projects = await client.get_projects()
+        detail = await client.get_project_detail(id=projects.data[0].id)
+        user = await client.get_user()
+        all_time = await client.get_all_time_since_today()
+        leaders = await client.get_leaders()
+
+        assert heartbeats.data
+        assert len(summaries.data) == 5
+        assert stats.data.total_seconds >= summaries.cumulative_total.seconds > 0
+        assert detail.data.name == projects.data[0].name
+        assert user.data.username == "bench"
+        assert all_time.data.total_seconds >= stats.data.total_seconds
+        assert leaders.data[0].user.username == "bench"
+        assert sum(app.request_counts.values()) == 8
+
+    @pytest.mark.asyncio
+    async def test_error_injection(self):
+        """Injected failures surface as HTTP errors"""
+        app = make_app(FakeWakapiConfig(error_rate=1.0, error_status=500))
+        client = make_client(app)
+
+        with pytest.raises(ApiError):
+            await client.get_user()
+        assert app.status_counts[500] == 1
+
+    @pytest.mark.asyncio
+    async def test_rate_limit(self):
+        """Requests beyond the burst are answered with 429"""
+        app = make_app(
+            FakeWakapiConfig(rate_limit_per_second=0.001, rate_limit_burst=2)
+        )
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://fake-wakapi"
+        ) as http:
+            statuses = [
+                (await http.get("/api/compat/wakatime/v1/users/current")).status_code
+                for _ in range(3)
+            ]
+
+        assert statuses == [200, 200, 429]
+
+    @pytest.mark.asyncio
+    async def test_etag_revalidation(self):
+        """A matching If-None-Match is answered with 304"""
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=make_app()),
+            base_url="http://fake-wakapi",
+        ) as http:
+            url = "/api/compat/wakatime/v1/users/current/projects"
+            etag = (await http.get(url)).headers["ETag"]
+            response = await http.get(url, headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
@@ -0,0 +1,81 @@
+import pytest
+from unittest.mock import patch, AsyncMock
+from datetime import datetime, timedelta, timezone
+
+from mcp_server import app
+from mcp_tools.dependency_injection import register_local_store
+
+from wakapi_sdk.client import HeartbeatsResult, HeartbeatEntry
+from wakapi_sdk.core.store import LocalStore
+
+
+def heartbeat(time):
+    """Create a heartbeat entry."""
+    return HeartbeatEntry(
+        id=str(time),
+        project="test_project",
+        language="Python",
+        entity="main.py",
+        time=time,
+        is_write=False,
+        branch="main",
+        type="file",
+        user_id="current",
+    )
+
+
+class TestActivityHeatmap:
+    """Tests for activity heatmap"""
+
+    @pytest.mark.asyncio
+    async def test_matrix_and_cached_days(self, mock_wakapi_client):
+        """Complete days are cached; only new days are fetched again"""
+        register_local_store(LocalStore())
+        today = datetime.now(timezone.utc).date()
+
+        async def get_heartbeats(user, date, project):
+            # 10:00 UTC on the requested day, 5 minutes of activity
+            start = datetime(date.year, date.month, date.day, 10, tzinfo=timezone.utc)
+            return HeartbeatsResult(
+                data=[
+                    heartbeat(start.timestamp()),
+                    heartbeat(start.timestamp() + 300),
+                ],
+                start=date.isoformat(),
+                end=date.isoformat(),
+                timezone="UTC",
+            )
+
+        with patch(
+            "mcp_tools.heatmap.get_wakapi_client",
+            return_value=mock_wakapi_client,
+        ):
+            mock_wakapi_client.get_heartbeats = AsyncMock(side_effect=get_heartbeats)
+            tool = await app.get_tool("get_activity_heatmap")
+            start = (today - timedelta(days=6)).isoformat()
+            result = await tool.run({"start": start})
+
+            content = result.structured_content
+            assert content["timezone"] == "UTC"
+            assert content["total_seconds"] == 7 * 300
+            assert content["matrix"][today.weekday()][10] == 300
+            assert content["days_fetched"] == 7
+            assert mock_wakapi_client.get_heartbeats.call_count == 7
+
+            result = await tool.run({"start": start})
+            content = result.structured_content
+            assert content["total_seconds"] == 7 * 300
+            # Only today is fetched again
+            assert content["days_cached"] == 6
+            assert mock_wakapi_client.get_heartbeats.call_count == 8
+
+    @pytest.mark.asyncio
+    async def test_invalid_range(self, mock_wakapi_client):
+        """Start after end is rejected"""
+        with patch(
+            "mcp_tools.heatmap.get_wakapi_client",
+            return_value=mock_wakapi_client,
+        ):
+            tool = await app.get_tool("get_activity_heatmap")
+            with pytest.raises(ValueError, match=r"start must not be after end"):
+                await tool.run({"start": "2024-02-01", "end": "2024-01-01"})
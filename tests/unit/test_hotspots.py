@@ -0,0 +1,78 @@
+import pytest
+from unittest.mock import patch, AsyncMock
+from datetime import datetime
+
+from mcp_server import app
+
+from wakapi_sdk.client import HeartbeatsResult, HeartbeatEntry
+
+
+def heartbeat(time, entity, is_write=False, line_additions=None):
+    """Create a heartbeat entry."""
+    return HeartbeatEntry(
+        id=str(time),
+        project="test_project",
+        language="Python",
+        entity=entity,
+        time=time,
+        is_write=is_write,
+        branch="main",
+        line_additions=line_additions,
+        type="file",
+        user_id="current",
+    )
+
+
+class TestFileHotspots:
+    """Tests for file hotspots"""
+
+    @pytest.mark.asyncio
+    async def test_files_and_directories(self, mock_wakapi_client):
+        """Files are ranked by time and can be rolled up into directories"""
+        start = datetime.now().replace(hour=12, minute=0).timestamp()
+        heartbeats = HeartbeatsResult(
+            data=[
+                heartbeat(start, "/repo/src/a.py"),
+                heartbeat(start + 60, "/repo/src/b.py", True, 3),
+                heartbeat(start + 360, "/repo/docs/index.md"),
+                heartbeat(start + 400, "/repo/docs/index.md"),
+            ],
+            start="2023-01-01",
+            end="2023-01-01",
+            timezone="UTC",
+        )
+        with patch(
+            "mcp_tools.hotspots.get_wakapi_client",
+            return_value=mock_wakapi_client,
+        ):
+            mock_wakapi_client.get_heartbeats = AsyncMock(return_value=heartbeats)
+            tool = await app.get_tool("get_file_hotspots")
+
+            result = await tool.run({"days": 1})
+            files = result.structured_content["result"]
+            assert [f["path"] for f in files] == [
+                "/repo/src/b.py",
+                "/repo/src/a.py",
+                "/repo/docs/index.md",
+            ]
+            assert files[0]["writes"] == 1
+            assert files[0]["line_additions"] == 3
+
+            result = await tool.run({"days": 1, "directory_depth": 1})
+            directories = result.structured_content["result"]
+            assert [(d["path"], d["seconds"]) for d in directories] == [
+                ("/repo/src/", 360.0),
+                ("/repo/docs/", 40.0),
+            ]
+
+    @pytest.mark.asyncio
+    async def test_invalid_sort_by(self, mock_wakapi_client):
+        """Unknown sort keys are rejected before fetching"""
+        with patch(
+            "mcp_tools.hotspots.get_wakapi_client",
+            return_value=mock_wakapi_client,
+        ):
+            tool = await app.get_tool("get_file_hotspots")
+            with pytest.raises(ValueError, match=r"sort_by must be one of"):
+                await tool.run({"sort_by": "editor"})
+            mock_wakapi_client.get_heartbeats.assert_not_called()
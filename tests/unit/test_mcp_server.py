@@ -8,17 +8,16 @@ from unittest.mock import patch, MagicMock
 sys.path.insert(0, str(Path(__file__).parent / ".." / "src"))
 
 from mcp_server import get_config, create_server
-from wakapi_sdk.core.config import ConfigManager
+from wakapi_sdk.core.config import ConfigManager, WakapiConfig
 from mcp_tools.dependency_injection import register_config_manager, get_injector
 
 
 class TestConfig:
     def test_get_config_with_env(self):
         mock_manager = MagicMock(spec=ConfigManager)
-        mock_config = MagicMock()
-        mock_config.url = "http://localhost:3000"
-        mock_config.api_key = "test_api_key"
-        mock_manager.get_wakapi_config.return_value = mock_config
+        mock_manager.get_wakapi_config.return_value = WakapiConfig(
+            url="http://localhost:3000", api_key="test_api_key"
+        )
 
         # Error case: WakapiMCPServer get_config raise exception
         # when server is uninitialized.
@@ -55,7 +54,7 @@ async def test_tools_list():
     from mcp_server import app
 
     tools = await app.get_tools()
-    assert len(tools) == 8
+    assert len(tools) == 14
     names = [tool.name for tool in tools.values()]
     expected_names = [
         "get_stats",
@@ -66,5 +65,11 @@ async def test_tools_list():
         "get_user",
         "get_all_time_since_today",
         "get_project_detail",
+        "get_durations",
+        "get_sessions",
+        "get_activity_heatmap",
+        "get_file_hotspots",
+        "get_approximate_activity",
+        "get_range_stats",
     ]
     assert set(expected_names) == set(names)
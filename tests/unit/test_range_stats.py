@@ -0,0 +1,151 @@
+import pytest
+from unittest.mock import patch, AsyncMock
+from datetime import date, datetime, timedelta, timezone
+
+from mcp_server import app
+from mcp_tools.dependency_injection import register_local_store
+
+from wakapi_sdk.client import HeartbeatEntry, HeartbeatsResult
+from wakapi_sdk.core.store import LocalStore
+
+
+class TestRangeStats:
+    """Tests for range stats"""
+
+    @pytest.mark.asyncio
+    async def test_sync_then_answer_from_rollups(
+        self, mock_wakapi_client, make_summaries
+    ):
+        """Missing days are synced once; later queries reuse the rollups"""
+        register_local_store(LocalStore())
+        today = datetime.now(timezone.utc).date()
+
+        async def get_summaries(user, start, end):
+            first, last = date.fromisoformat(start), date.fromisoformat(end)
+            days = [first + timedelta(days=i) for i in range((last - first).days + 1)]
+            return make_summaries({day: 3600.0 for day in days})
+
+        with patch(
+            "mcp_tools.range_stats.get_wakapi_client",
+            return_value=mock_wakapi_client,
+        ):
+            mock_wakapi_client.get_summaries = AsyncMock(side_effect=get_summaries)
+            tool = await app.get_tool("get_range_stats")
+            start = (today - timedelta(days=13)).isoformat()
+
+            result = await tool.run({"start": start})
+            content = result.structured_content
+            assert content["data"]["total_seconds"] == 14 * 3600.0
+            assert content["data"]["languages"][0]["name"] == "Python"
+            assert content["meta"]["days_synced"] == 14
+
+            result = await tool.run({"start": start})
+            content = result.structured_content
+            assert content["data"]["total_seconds"] == 14 * 3600.0
+            # Only today is synced again
+            assert content["meta"]["days_synced"] == 1
+            mock_wakapi_client.get_summaries.assert_called_with(
+                user="current", start=today.isoformat(), end=today.isoformat()
+            )
+
+    @pytest.mark.asyncio
+    async def test_filtered_fixed_range_uses_stats(self, mock_wakapi_client):
+        """A filtered last_7_days range is one stats request"""
+        register_local_store(LocalStore())
+        today = datetime.now(timezone.utc).date()
+        with patch(
+            "mcp_tools.range_stats.get_wakapi_client",
+            return_value=mock_wakapi_client,
+        ):
+            tool = await app.get_tool("get_range_stats")
+            result = await tool.run(
+                {
+                    "start": (today - timedelta(days=6)).isoformat(),
+                    "project": "test_project",
+                }
+            )
+            content = result.structured_content
+            assert content["meta"]["plan"]["source"] == "stats"
+            assert content["meta"]["plan"]["upstream_requests"] == 1
+            assert content["data"]["total_seconds"] == 3600.0
+            mock_wakapi_client.get_stats.assert_called_once_with(
+                range="last_7_days", user="current", project="test_project"
+            )
+
+    @pytest.mark.asyncio
+    async def test_filtered_custom_range_uses_summaries(
+        self, mock_wakapi_client, make_summaries
+    ):
+        """A filtered range no stats range covers is one summaries request"""
+        register_local_store(LocalStore())
+        today = datetime.now(timezone.utc).date()
+        days = [today - timedelta(days=i) for i in range(10)]
+        mock_wakapi_client.get_summaries = AsyncMock(
+            return_value=make_summaries({day: 60.0 for day in days})
+        )
+        with patch(
+            "mcp_tools.range_stats.get_wakapi_client",
+            return_value=mock_wakapi_client,
+        ):
+            tool = await app.get_tool("get_range_stats")
+            result = await tool.run(
+                {"start": days[-1].isoformat(), "project": "test_project"}
+            )
+            content = result.structured_content
+            assert content["meta"]["plan"]["source"] == "summaries"
+            assert content["data"]["total_seconds"] == 600.0
+
+    @pytest.mark.asyncio
+    async def test_branch_filter_uses_heartbeats(self, mock_wakapi_client):
+        """Branches are only filterable from raw heartbeats"""
+        register_local_store(LocalStore())
+        start = datetime(2024, 1, 1, 9, tzinfo=timezone.utc).timestamp()
+
+        def heartbeat(time, branch):
+            return HeartbeatEntry(
+                id=str(time),
+                project="test_project",
+                language="Python",
+                entity="/repo/a.py",
+                time=time,
+                is_write=False,
+                branch=branch,
+            )
+
+        mock_wakapi_client.get_heartbeats.return_value = HeartbeatsResult(
+            data=[
+                heartbeat(start, "main"),
+                heartbeat(start + 60, "main"),
+                heartbeat(start + 120, "feature"),
+                heartbeat(start + 180, "main"),
+            ],
+            start="2024-01-01",
+            end="2024-01-01",
+            timezone="UTC",
+        )
+        with patch(
+            "mcp_tools.range_stats.get_wakapi_client",
+            return_value=mock_wakapi_client,
+        ):
+            tool = await app.get_tool("get_range_stats")
+            result = await tool.run(
+                {"start": "2024-01-01", "end": "2024-01-01", "branch": "main"}
+            )
+            content = result.structured_content
+            assert content["meta"]["plan"]["source"] == "heartbeats"
+            # The feature heartbeat is filtered out before durations
+            assert content["data"]["branches"][0]["name"] == "main"
+            assert content["data"]["total_seconds"] == 180.0
+
+    @pytest.mark.asyncio
+    async def test_fetch_error(self, mock_wakapi_client):
+        """Summaries failures are reported"""
+        register_local_store(LocalStore())
+        with patch(
+            "mcp_tools.range_stats.get_wakapi_client",
+            return_value=mock_wakapi_client,
+        ):
+            mock_wakapi_client.get_summaries = AsyncMock(side_effect=TimeoutError())
+            tool = await app.get_tool("get_range_stats")
+            with pytest.raises(ValueError, match=r"Failed to fetch summaries"):
+                await tool.run({})
@@ -1,11 +1,15 @@
 import pytest
 import asyncio
+import json
 from unittest.mock import patch, AsyncMock
-from datetime import datetime
+from datetime import datetime, timedelta
+
+from fastmcp import Client
 
 from mcp_server import app
 
 from wakapi_sdk.client import HeartbeatsResult, HeartbeatEntry
+from wakapi_sdk.core.exceptions import ApiError, DeadlineExceededError
 
 
 class TestRecentLogs:
@@ -188,3 +192,185 @@ class TestRecentLogs:
             tool = await app.get_tool("get_recent_logs")
             with pytest.raises(ValueError, match=r"Failed to fetch recent logs"):
                 await tool.run({"days": 1, "limit": 100})
+
+    @pytest.mark.asyncio
+    async def test_multiple_days_fetched_concurrently(self, mock_wakapi_client):
+        """One heartbeats request is issued per day"""
+        with (
+            patch(
+                "mcp_tools.dependency_injection.get_wakapi_client",
+                return_value=mock_wakapi_client,
+            ),
+            patch(
+                "mcp_tools.recent_logs.get_wakapi_client",
+                return_value=mock_wakapi_client,
+            ),
+        ):
+            tool = await app.get_tool("get_recent_logs")
+            result = await tool.run({"days": 3, "limit": 100})
+            assert mock_wakapi_client.get_heartbeats.await_count == 3
+            requested = {
+                call.kwargs["date"]
+                for call in mock_wakapi_client.get_heartbeats.await_args_list
+            }
+            assert len(requested) == 3
+            assert len(result.structured_content["result"]) == 3
+
+    @pytest.mark.asyncio
+    async def test_days_without_coding_are_skipped(
+        self, mock_wakapi_client, make_summaries
+    ):
+        """Only days with coded time in the summaries are fetched"""
+        today = datetime.now().date()
+        mock_wakapi_client.get_summaries = AsyncMock(
+            return_value=make_summaries(
+                {
+                    today - timedelta(days=4): 0.0,
+                    today - timedelta(days=3): 0.0,
+                    today - timedelta(days=2): 1800.0,
+                    today - timedelta(days=1): 0.0,
+                    today: 60.0,
+                }
+            )
+        )
+        with patch(
+            "mcp_tools.recent_logs.get_wakapi_client",
+            return_value=mock_wakapi_client,
+        ):
+            tool = await app.get_tool("get_recent_logs")
+            await tool.run({"days": 5, "limit": 100, "project_name": "api"})
+            mock_wakapi_client.get_summaries.assert_awaited_once_with(
+                user="current",
+                start=(today - timedelta(days=4)).isoformat(),
+                end=today.isoformat(),
+                project="api",
+            )
+            requested = {
+                call.kwargs["date"]
+                for call in mock_wakapi_client.get_heartbeats.await_args_list
+            }
+            assert requested == {today, today - timedelta(days=2)}
+
+    @pytest.mark.asyncio
+    async def test_progress_and_partial_results(self, mock_wakapi_client):
+        """Each fetched day reports progress and, if asked, its heartbeats"""
+        progress = []
+        partial = []
+
+        async def on_progress(done, total, message):
+            progress.append((done, total))
+
+        async def on_log(message):
+            if message.logger == "partial_result":
+                partial.append(json.loads(message.data["msg"]))
+
+        with patch(
+            "mcp_tools.recent_logs.get_wakapi_client",
+            return_value=mock_wakapi_client,
+        ):
+            async with Client(app, log_handler=on_log) as client:
+                result = await client.call_tool(
+                    "get_recent_logs",
+                    {"days": 3, "limit": 100, "stream_partial": True},
+                    progress_handler=on_progress,
+                )
+        assert len(result.structured_content["result"]) == 3
+        assert sorted(progress) == [(1, 3), (2, 3), (3, 3)]
+        assert len(partial) == 3
+        assert all(len(chunk["heartbeats"]) == 1 for chunk in partial)
+
+    @pytest.mark.asyncio
+    async def test_failing_day_cancels_other_days(self, mock_wakapi_client):
+        """Requests of the other days stop once one day fails"""
+        cancelled = []
+
+        async def get_heartbeats(user, date, project, limit):
+            if date == datetime.now().date():
+                raise TimeoutError()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(date)
+                raise
+
+        mock_wakapi_client.get_heartbeats = AsyncMock(side_effect=get_heartbeats)
+        with patch(
+            "mcp_tools.recent_logs.get_wakapi_client",
+            return_value=mock_wakapi_client,
+        ):
+            tool = await app.get_tool("get_recent_logs")
+            with pytest.raises(ValueError, match=r"Failed to fetch recent logs"):
+                async with asyncio.timeout(1):
+                    await tool.run({"days": 3})
+        assert len(cancelled) == 2
+
+    @pytest.mark.asyncio
+    async def test_deadline_truncates_result(self, mock_wakapi_client):
+        """Days not fetched before the deadline are reported, not an error"""
+        today = datetime.now().date()
+
+        async def get_heartbeats(user, date, project, limit):
+            if date != today:
+                raise DeadlineExceededError("Deadline exceeded")
+            return HeartbeatsResult(
+                data=[
+                    HeartbeatEntry(
+                        id="1",
+                        project="test_project",
+                        language="Python",
+                        entity="test.py",
+                        time=datetime.now().timestamp(),
+                        is_write=True,
+                    )
+                ],
+                start=today.isoformat(),
+                end=today.isoformat(),
+                timezone="UTC",
+            )
+
+        mock_wakapi_client.get_heartbeats = AsyncMock(side_effect=get_heartbeats)
+        with patch(
+            "mcp_tools.recent_logs.get_wakapi_client",
+            return_value=mock_wakapi_client,
+        ):
+            tool = await app.get_tool("get_recent_logs")
+            result = await tool.run({"days": 3, "deadline_seconds": 0.5})
+
+        logs = result.structured_content["result"]
+        assert logs[0]["id"] == "1"
+        assert logs[-1] == {
+            "truncated": True,
+            "reason": "deadline exceeded",
+            "days_completed": 1,
+            "days_requested": 3,
+        }
+
+    @pytest.mark.asyncio
+    async def test_summaries_failures(self, mock_wakapi_client):
+        """Wakapi errors fetch every day; a passed deadline truncates"""
+        mock_wakapi_client.get_summaries = AsyncMock(
+            side_effect=ApiError("Wakapi API error in get_summaries: 500")
+        )
+        with patch(
+            "mcp_tools.recent_logs.get_wakapi_client",
+            return_value=mock_wakapi_client,
+        ):
+            tool = await app.get_tool("get_recent_logs")
+            await tool.run({"days": 3})
+            assert mock_wakapi_client.get_heartbeats.await_count == 3
+
+            mock_wakapi_client.get_heartbeats.reset_mock()
+            mock_wakapi_client.get_summaries = AsyncMock(
+                side_effect=DeadlineExceededError("Deadline exceeded")
+            )
+            result = await tool.run({"days": 3})
+            mock_wakapi_client.get_heartbeats.assert_not_awaited()
+
+        assert result.structured_content["result"] == [
+            {
+                "truncated": True,
+                "reason": "deadline exceeded",
+                "days_completed": 0,
+                "days_requested": 3,
+            }
+        ]
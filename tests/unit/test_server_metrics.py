@@ -0,0 +1,101 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+import httpx
+from fastmcp.server.http import create_sse_app
+from starlette.middleware import Middleware
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from benchmarks.load import CallRecord, LoadConfig, build_report, parse_mix
+from mcp_server import app
+from server_metrics import ServerMetricsMiddleware, lag_monitor, server_metrics
+
+
+class TestServerMetrics:
+    """Tests for the /metrics endpoint and event loop lag monitor"""
+
+    @pytest.mark.asyncio
+    async def test_metrics_endpoint_reports_loop_lag(self):
+        """/metrics serves event loop lag samples once the monitor runs"""
+        sse_app = create_sse_app(
+            app,
+            message_path="/messages/",
+            sse_path="/sse",
+            middleware=[Middleware(ServerMetricsMiddleware, sse_path="/sse")],
+        )
+        try:
+            async with httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=sse_app), base_url="http://mcp"
+            ) as http:
+                await http.post("/metrics")
+                await asyncio.sleep(lag_monitor.interval * 3)
+                response = await http.get("/metrics")
+        finally:
+            await lag_monitor.stop()
+            server_metrics.reset()
+
+        body = response.json()
+        assert response.status_code == 200
+        assert body["samples"]["event_loop_lag_seconds"]["count"] >= 1
+        assert body["counters"]["http_requests{path=/metrics}"] >= 1
+        assert body["sse_sessions_active"] == 0
+
+    @pytest.mark.asyncio
+    async def test_metrics_endpoint_is_local_only(self, mock_wakapi_client):
+        """Remote clients are refused; only a POST clears the server metrics"""
+        server_metrics.increment("http_requests", path="/sse")
+        mock_wakapi_client.metrics.increment("requests", endpoint="get_stats")
+        try:
+            async with httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=app.http_app()),
+                base_url="http://mcp",
+            ) as http:
+                await http.get("/metrics")
+                assert server_metrics.counter("http_requests", path="/sse") == 1
+                response = await http.post("/metrics")
+                assert server_metrics.counter("http_requests", path="/sse") == 0
+                client_metrics = response.json()["wakapi_client"]
+                assert client_metrics["counters"]["requests{endpoint=get_stats}"] == 1
+                # Client metrics calibrate hedging and planning; they are kept
+                assert mock_wakapi_client.metrics.counter(
+                    "requests", endpoint="get_stats"
+                )
+            async with httpx.AsyncClient(
+                transport=httpx.ASGITransport(
+                    app=app.http_app(), client=("203.0.113.7", 4000)
+                ),
+                base_url="http://mcp",
+            ) as http:
+                response = await http.get("/metrics")
+        finally:
+            server_metrics.reset()
+
+        assert response.status_code == 403
+
+
+class TestLoadReport:
+    """Tests for the SSE load generator report"""
+
+    def test_parse_mix(self):
+        """Mix specs map tools to weights"""
+        assert parse_mix("get_stats=3,get_user") == {"get_stats": 3.0, "get_user": 1.0}
+
+    def test_build_report(self):
+        """Errors and latency are aggregated overall and per tool"""
+        records = [
+            CallRecord("get_stats", 0.1),
+            CallRecord("get_stats", 0.3),
+            CallRecord("get_user", 0.2, error="ToolError"),
+        ]
+
+        report = build_report(LoadConfig(), records, 1.5, [0.01], {}, None)
+
+        assert report["calls"] == 3
+        assert report["throughput_per_second"] == 2.0
+        assert report["error_rate"] == pytest.approx(1 / 3)
+        assert report["tools"]["get_stats"]["latency_seconds"]["max"] == 0.3
+        assert report["tools"]["get_user"]["errors_by_type"] == {"ToolError": 1}
+        assert "server" not in report
@@ -0,0 +1,104 @@
+import pytest
+import asyncio
+from unittest.mock import patch, AsyncMock
+from datetime import datetime
+
+from mcp_server import app
+
+from wakapi_sdk.client import HeartbeatsResult, HeartbeatEntry
+from wakapi_sdk.core.exceptions import DeadlineExceededError
+
+
+def heartbeat(time, entity, language="Python"):
+    """Create a heartbeat entry."""
+    return HeartbeatEntry(
+        id=str(time),
+        project="test_project",
+        language=language,
+        entity=entity,
+        time=time,
+        is_write=False,
+        branch="main",
+        type="file",
+        user_id="current",
+    )
+
+
+class TestSessions:
+    """Tests for sessions"""
+
+    @pytest.mark.asyncio
+    async def test_sessions_split_on_gap(self, mock_wakapi_client):
+        """Heartbeats more than gap_minutes apart start a new session"""
+        start = datetime.now().replace(hour=12, minute=0).timestamp()
+        heartbeats = HeartbeatsResult(
+            data=[
+                heartbeat(start + 7200, "b.py"),
+                heartbeat(start, "a.py"),
+                heartbeat(start + 300, "b.md", language="Markdown"),
+            ],
+            start="2023-01-01",
+            end="2023-01-01",
+            timezone="UTC",
+        )
+        with patch(
+            "mcp_tools.sessions.get_wakapi_client",
+            return_value=mock_wakapi_client,
+        ):
+            mock_wakapi_client.get_heartbeats = AsyncMock(return_value=heartbeats)
+            tool = await app.get_tool("get_sessions")
+            result = await tool.run({"days": 1, "gap_minutes": 15})
+
+            sessions = result.structured_content["result"]
+            assert len(sessions) == 2
+            assert sessions[0]["duration_seconds"] == 300
+            assert sessions[0]["project"] == "test_project"
+            assert sessions[0]["files"] == ["a.py", "b.md"]
+            assert sessions[0]["languages"] == ["Python", "Markdown"]
+            assert sessions[1]["heartbeats"] == 1
+            mock_wakapi_client.get_heartbeats.assert_called_once_with(
+                user="current", date=datetime.now().date(), project=None
+            )
+
+    @pytest.mark.asyncio
+    async def test_fetch_error(self, mock_wakapi_client):
+        """Fetch failures are reported"""
+        with patch(
+            "mcp_tools.sessions.get_wakapi_client",
+            return_value=mock_wakapi_client,
+        ):
+            mock_wakapi_client.get_heartbeats = AsyncMock(side_effect=TimeoutError())
+            tool = await app.get_tool("get_sessions")
+            with pytest.raises(ValueError, match=r"Failed to fetch heartbeats"):
+                await tool.run({"days": 1})
+
+    @pytest.mark.asyncio
+    async def test_deadline_returns_sessions_so_far(self, mock_wakapi_client):
+        """Sessions of the days streamed before the deadline are returned"""
+        today = datetime.now().date()
+        start = datetime.now().replace(hour=12, minute=0).timestamp()
+
+        async def get_heartbeats(user, date, project):
+            if date == today:
+                await asyncio.sleep(0.01)
+                raise DeadlineExceededError("Deadline exceeded")
+            return HeartbeatsResult(
+                data=[heartbeat(start - 86400, "a.py")],
+                start=date.isoformat(),
+                end=date.isoformat(),
+                timezone="UTC",
+            )
+
+        mock_wakapi_client.get_heartbeats = AsyncMock(side_effect=get_heartbeats)
+        with patch(
+            "mcp_tools.sessions.get_wakapi_client",
+            return_value=mock_wakapi_client,
+        ):
+            tool = await app.get_tool("get_sessions")
+            result = await tool.run({"days": 2, "deadline_seconds": 5})
+
+        sessions = result.structured_content["result"]
+        assert sessions[0]["files"] == ["a.py"]
+        assert sessions[-1]["truncated"] is True
+        assert sessions[-1]["days_completed"] == 1
+        assert sessions[-1]["days_requested"] == 2
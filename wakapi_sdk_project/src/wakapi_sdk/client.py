@@ -1,11 +1,48 @@
-from dataclasses import dataclass
-from typing import Optional
+import asyncio
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, AsyncIterator, Iterable, Optional
 from enum import Enum
 import base64
+import time
 from pydantic import BaseModel
 import httpx
 import logging
-from .core.exceptions import ApiError
+from .core.cache import (
+    RevalidationCache,
+    RevalidationCacheConfig,
+    body_hash,
+    request_key,
+)
+from .core.circuit_breaker import CircuitBreaker, CircuitBreakerConfig
+from .core.cassette import (
+    RECORD,
+    REPLAY,
+    CassetteConfig,
+    recording_transport,
+    replay_transport,
+)
+from .core.compression import CompressionConfig, DecodingTransport
+from .core.concurrency import AdaptiveConcurrencyConfig, AdaptiveConcurrencyLimiter
+from .core.connections import (
+    ConnectionWarmer,
+    ConnectionWarmingConfig,
+    network_transport,
+)
+from .core.deadline import TimeoutConfig, remaining_seconds
+from .core.exceptions import ApiError, DeadlineExceededError, NetworkError
+from .core.hedging import Hedger, HedgingConfig
+from .core.metrics import ClientMetrics
+from .core.rate_limit import RateLimitConfig, RateLimiter, current_budget
+from .core.streaming import (
+    HeartbeatStreamConfig,
+    JsonArrayParser,
+    date_range,
+    iter_json_array,
+    prefetched,
+)
 
 
 class TimeRange(Enum):
@@ -52,7 +89,15 @@ class HeartbeatEntry(BaseModel):
     created_at: Optional[str] = None
 
 
-class HeartbeatsResult(BaseModel):
+class WakapiResponse(BaseModel):
+    """Base model for a complete Wakapi API response."""
+
+    # True when the response was served from the last successful one for the
+    # same request because the endpoint's circuit breaker is open
+    stale: bool = False
+
+
+class HeartbeatsResult(WakapiResponse):
     """Model for heartbeats result."""
 
     data: list[HeartbeatEntry]
@@ -100,7 +145,7 @@ class StatsData(BaseModel):
     human_readable_range: Optional[str] = None
 
 
-class StatsViewModel(BaseModel):
+class StatsViewModel(WakapiResponse):
     """Model for stats view."""
 
     data: StatsData
@@ -125,7 +170,7 @@ class AllTimeData(BaseModel):
     range: AllTimeRange
 
 
-class AllTimeViewModel(BaseModel):
+class AllTimeViewModel(WakapiResponse):
     """Model for all time view."""
 
     data: AllTimeData
@@ -195,7 +240,7 @@ class LeadersRange(BaseModel):
     text: str
 
 
-class LeadersViewModel(BaseModel):
+class LeadersViewModel(WakapiResponse):
     """Model for leaders view."""
 
     current_user: Optional[LeadersCurrentUser] = None
@@ -217,19 +262,19 @@ class Project(BaseModel):
     human_readable_last_heartbeat_at: str
 
 
-class ProjectsViewModel(BaseModel):
+class ProjectsViewModel(WakapiResponse):
     """Model for projects view."""
 
     data: list[Project]
 
 
-class ProjectViewModel(BaseModel):
+class ProjectViewModel(WakapiResponse):
     """Model for project view."""
 
     data: Project
 
 
-class UserViewModel(BaseModel):
+class UserViewModel(WakapiResponse):
     """Model for user view."""
 
     data: User
@@ -292,7 +337,7 @@ class SummariesData(BaseModel):
     range: SummariesRange
 
 
-class SummariesViewModel(BaseModel):
+class SummariesViewModel(WakapiResponse):
     """Model for summaries view."""
 
     cumulative_total: SummariesCumulativeTotal
@@ -302,6 +347,11 @@ class SummariesViewModel(BaseModel):
     start: str
 
 
+def _mark_stale(model: BaseModel, stale: bool) -> BaseModel:
+    """Return model, or a copy of it flagged as served stale."""
+    return model.model_copy(update={"stale": True}) if stale else model
+
+
 @dataclass
 class WakapiConfig:
     """Wakapi configuration dataclass."""
@@ -309,6 +359,24 @@ class WakapiConfig:
     base_url: str
     api_key: str
     api_path: str = "/compat/wakatime/v1"
+    rate_limit: RateLimitConfig = field(default_factory=RateLimitConfig)
+    adaptive_concurrency: AdaptiveConcurrencyConfig = field(
+        default_factory=AdaptiveConcurrencyConfig
+    )
+    circuit_breaker: CircuitBreakerConfig = field(default_factory=CircuitBreakerConfig)
+    revalidation_cache: RevalidationCacheConfig = field(
+        default_factory=RevalidationCacheConfig
+    )
+    compression: CompressionConfig = field(default_factory=CompressionConfig)
+    cassette: CassetteConfig = field(default_factory=CassetteConfig)
+    heartbeat_stream: HeartbeatStreamConfig = field(
+        default_factory=HeartbeatStreamConfig
+    )
+    timeouts: TimeoutConfig = field(default_factory=TimeoutConfig)
+    hedging: HedgingConfig = field(default_factory=HedgingConfig)
+    connections: ConnectionWarmingConfig = field(
+        default_factory=ConnectionWarmingConfig
+    )
 
     def __post_init__(self):
         """Post init to ensure base_url ends with slash."""
@@ -319,12 +387,46 @@ class WakapiConfig:
 class WakapiClient:
     """Wakapi API client."""
 
-    def __init__(self, config: WakapiConfig) -> None:
-        """Initialize Wakapi client with config."""
+    def __init__(
+        self,
+        config: WakapiConfig,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ) -> None:
+        """
+        Initialize Wakapi client with config.
+
+        Args:
+            config: Client configuration.
+            transport: HTTP transport to send requests with (defaults to a
+                pooled network transport, or the cassette in replay mode).
+        """
         self.config = config
         self.base_url = f"{config.base_url.rstrip('/')}/api"
         self.api_path = config.api_path
-        self.client = httpx.AsyncClient(timeout=0.1)
+        self.metrics = ClientMetrics()
+        if transport is None and config.cassette.mode == REPLAY:
+            transport = replay_transport(config.cassette)
+        transport = transport or network_transport(config.connections, self.metrics)
+        if config.cassette.mode == RECORD:
+            # Below decoding, so replays exercise decompression as recorded
+            transport = recording_transport(transport, config.cassette)
+        if config.compression.measure_decoding:
+            transport = DecodingTransport(transport, self.metrics)
+        # Replaced per request by the endpoint timeout (and deadline)
+        self.client = httpx.AsyncClient(
+            timeout=config.timeouts.default, transport=transport
+        )
+        self.limiter = RateLimiter(config.rate_limit)
+        self.concurrency = AdaptiveConcurrencyLimiter(
+            config.adaptive_concurrency, self.metrics
+        )
+        self.hedger = Hedger(config.hedging, self.metrics)
+        self.warmer = ConnectionWarmer(config.connections, self._probe, self.metrics)
+        self.breakers: dict[str, CircuitBreaker] = {}
+        # Last successful response per request, served stale while a breaker is open
+        self._stale_responses: OrderedDict[tuple, httpx.Response] = OrderedDict()
+        self._stale_bytes = 0
+        self.revalidation_cache = RevalidationCache(config.revalidation_cache)
 
     async def __aenter__(self):
         """Enter async context."""
@@ -332,14 +434,348 @@ class WakapiClient:
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Exit async context."""
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Stop warming and close the connections, flushing any cassette."""
+        await self.warmer.stop()
         await self.client.aclose()
 
+    async def _probe(self) -> None:
+        # Wakapi's health check needs no database query. Probes go through
+        # _get, so they are limited, counted and stopped by the breaker too.
+        await self._get("warm_connections", f"{self.base_url}/health")
+
+    async def warm_connections(self) -> None:
+        """
+        Open the warm connections now and keep them alive in the background.
+
+        Does nothing unless connection warming is enabled.
+        """
+        if self.warmer.enabled:
+            await self.warmer.warm()
+            self.warmer.start(delay=float(self.config.connections.keepalive_interval))
+
+    def start_warming(self) -> None:
+        """Open and keep alive the warm connections in the background."""
+        self.warmer.start()
+
     def _get_headers(self) -> dict[str, str]:
         encoded_token = base64.b64encode(self.config.api_key.encode()).decode()
-        return {
+        headers = {
             "Authorization": f"Basic {encoded_token}",
             "Content-Type": "application/json",
         }
+        if self.config.compression.accept_encoding:
+            headers["Accept-Encoding"] = self.config.compression.accept_encoding
+        return headers
+
+    async def _get(
+        self,
+        endpoint: str,
+        url: str,
+        params: Optional[dict[str, Any]] = None,
+        headers: Optional[dict[str, str]] = None,
+    ) -> httpx.Response:
+        """
+        Send a GET request through the client-side limiter.
+
+        Args:
+            endpoint: Client method name, used as the metrics label.
+            url: Request URL.
+            params: Query parameters (omitted from the request when None).
+            headers: Extra request headers.
+
+        Returns:
+            The successful (or 304 Not Modified) response.
+
+        Raises:
+            httpx.HTTPStatusError: When Wakapi answers with an error status.
+        """
+        async with self._request(endpoint, url, params, headers) as response:
+            return response
+
+    @asynccontextmanager
+    async def _stream(
+        self,
+        endpoint: str,
+        url: str,
+        params: Optional[dict[str, Any]] = None,
+        headers: Optional[dict[str, str]] = None,
+    ) -> AsyncIterator[httpx.Response]:
+        """
+        Send a GET request whose body is read inside the context.
+
+        Like `_get`, but the response is entered once its headers arrived.
+        The limiter slots, the deadline, the request timing and the circuit
+        breaker verdict cover reading the body too, and the response is
+        closed on exit. The body must be read in the task that entered.
+        Streamed responses are not kept for serving stale.
+        """
+        async with self._request(endpoint, url, params, headers, True) as response:
+            try:
+                yield response
+            finally:
+                await response.aclose()
+
+    @asynccontextmanager
+    async def _request(
+        self,
+        endpoint: str,
+        url: str,
+        params: Optional[dict[str, Any]],
+        headers: Optional[dict[str, str]],
+        stream: bool = False,
+    ) -> AsyncIterator[httpx.Response]:
+        kwargs: dict[str, Any] = {"headers": {**self._get_headers(), **(headers or {})}}
+        if params is not None:
+            kwargs["params"] = params
+
+        breaker = self._get_breaker(endpoint)
+        stale_key = request_key(url, params)
+        if not breaker.allow_request():
+            yield self._serve_stale(endpoint, breaker, stale_key)
+            return
+
+        healthy: Optional[bool] = None
+        budget = current_budget()
+        try:
+            async with (
+                self.limiter.slot(budget) as waited,
+                self.concurrency.slot() as ticket,
+            ):
+                self.metrics.observe(
+                    "limiter_wait_seconds",
+                    waited + ticket.waited,
+                    endpoint=endpoint,
+                    budget=budget,
+                )
+                timeout = self.config.timeouts.for_endpoint(endpoint)
+                remaining = remaining_seconds()
+                if remaining is not None:
+                    if remaining <= 0:
+                        self.metrics.increment("deadline_exceeded", endpoint=endpoint)
+                        raise DeadlineExceededError(
+                            f"Deadline passed before requesting {endpoint}",
+                            details={"endpoint": endpoint},
+                        )
+                    timeout = min(timeout, remaining)
+                kwargs["timeout"] = timeout
+                started = time.perf_counter()
+                try:
+                    # httpx timeouts apply per read, so the deadline is also
+                    # enforced on the request as a whole, streamed body included
+                    async with asyncio.timeout(remaining):
+                        if stream:
+                            request = self.client.build_request("GET", url, **kwargs)
+                            response = await self.client.send(request, stream=True)
+                        else:
+                            response = await self.hedger.send(
+                                endpoint,
+                                lambda: self.client.get(url, **kwargs),
+                                lambda: self._hedge_slot(budget),
+                            )
+                        if response.status_code != 304:
+                            response.raise_for_status()
+                        yield response
+                except httpx.HTTPStatusError as e:
+                    if stream:
+                        await e.response.aclose()
+                    status_code = e.response.status_code
+                    healthy = status_code < 500
+                    if status_code == 429 or status_code >= 500:
+                        self.concurrency.record_overload(ticket)
+                    self.metrics.increment("request_errors", endpoint=endpoint)
+                    raise
+                except TimeoutError as e:
+                    # Only the deadline's asyncio.timeout raises TimeoutError
+                    self.metrics.increment("deadline_exceeded", endpoint=endpoint)
+                    raise DeadlineExceededError(
+                        f"Deadline passed while requesting {endpoint}",
+                        details={"endpoint": endpoint},
+                    ) from e
+                except httpx.TimeoutException as e:
+                    if remaining is not None and timeout == remaining:
+                        # Cut short by the deadline, not a verdict on Wakapi
+                        self.metrics.increment("deadline_exceeded", endpoint=endpoint)
+                        raise DeadlineExceededError(
+                            f"Deadline passed while requesting {endpoint}",
+                            details={"endpoint": endpoint},
+                        ) from e
+                    healthy = False
+                    self.concurrency.record_overload(ticket)
+                    self.metrics.increment("request_errors", endpoint=endpoint)
+                    raise
+                except httpx.TransportError:
+                    healthy = False
+                    self.metrics.increment("request_errors", endpoint=endpoint)
+                    raise
+                except asyncio.CancelledError:
+                    # httpx closes the connection of an interrupted request
+                    self.metrics.increment("requests_cancelled", endpoint=endpoint)
+                    raise
+                finally:
+                    elapsed = time.perf_counter() - started
+                    self.metrics.increment("requests", endpoint=endpoint)
+                    self.metrics.observe("request_seconds", elapsed, endpoint=endpoint)
+                healthy = True
+                self.concurrency.record_success(ticket, elapsed)
+        finally:
+            breaker.record(healthy)
+
+        if breaker.enabled and not stream and response.status_code != 304:
+            self._remember_response(stale_key, response)
+
+    @asynccontextmanager
+    async def _hedge_slot(self, budget: str) -> AsyncIterator[bool]:
+        """Hold a concurrency slot and a limiter slot for a hedge, if free."""
+        async with self.concurrency.try_slot() as ticket:
+            if ticket is None:
+                yield False
+                return
+            async with self.limiter.try_slot(budget) as admitted:
+                yield admitted
+
+    async def _get_model(
+        self,
+        endpoint: str,
+        url: str,
+        model_class: type[BaseModel],
+        params: Optional[dict[str, Any]] = None,
+        raise_on_error_payload: bool = False,
+    ) -> Any:
+        """
+        Fetch a URL and validate the JSON body into model_class.
+
+        With the revalidation cache enabled, repeat requests carry the stored
+        validators; a 304 answer or an unchanged body hash returns the cached
+        model without decoding or validating the body again. JSON decoding and
+        model validation times are recorded separately from request time.
+
+        Args:
+            endpoint: Client method name, used as the metrics label.
+            url: Request URL.
+            model_class: Pydantic model of the response body.
+            params: Query parameters (omitted from the request when None).
+            raise_on_error_payload: Raise ValueError when the body has an
+                `error` key.
+
+        Returns:
+            The validated model, with `stale` set if it was served stale.
+        """
+        cache = self.revalidation_cache
+        key = request_key(url, params)
+        cached = cache.get(key) if cache.enabled else None
+
+        response = await self._get(
+            endpoint,
+            url,
+            params=params,
+            headers=cached.conditional_headers() if cached else None,
+        )
+        stale = response.headers.get("Warning", "").startswith("110")
+
+        if cached is not None and response.status_code == 304:
+            self.metrics.increment("revalidation_not_modified", endpoint=endpoint)
+            return cached.model
+
+        digest = None
+        if cache.enabled:
+            digest = body_hash(response.content)
+            if cached is not None and cached.body_hash == digest:
+                self.metrics.increment("revalidation_body_unchanged", endpoint=endpoint)
+                return _mark_stale(cached.model, stale)
+
+        started = time.perf_counter()
+        json_data = response.json()
+        decoded = time.perf_counter()
+        self.metrics.observe(
+            "json_decode_seconds", decoded - started, endpoint=endpoint
+        )
+        if raise_on_error_payload and "error" in json_data:
+            raise ValueError(json_data["error"])
+        model = model_class.model_validate(json_data)
+        self.metrics.observe(
+            "validate_seconds", time.perf_counter() - decoded, endpoint=endpoint
+        )
+
+        if cache.enabled:
+            self.metrics.increment("revalidation_miss", endpoint=endpoint)
+            cache.store(
+                key,
+                model,
+                digest,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            )
+        return _mark_stale(model, stale)
+
+    def _get_breaker(self, endpoint: str) -> CircuitBreaker:
+        breaker = self.breakers.get(endpoint)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                endpoint, self.config.circuit_breaker, self.metrics
+            )
+            self.breakers[endpoint] = breaker
+        return breaker
+
+    def _remember_response(self, key: tuple, response: httpx.Response) -> None:
+        max_entries = int(self.config.circuit_breaker.stale_cache_size)
+        max_bytes = int(self.config.circuit_breaker.stale_cache_bytes)
+        previous = self._stale_responses.pop(key, None)
+        if previous is not None:
+            self._stale_bytes -= len(previous.content)
+        if len(response.content) > max_bytes:
+            # Too large to keep; the key is not served stale
+            return
+        self._stale_responses[key] = response
+        self._stale_bytes += len(response.content)
+        while len(self._stale_responses) > max_entries or self._stale_bytes > max_bytes:
+            _, evicted = self._stale_responses.popitem(last=False)
+            self._stale_bytes -= len(evicted.content)
+
+    def _serve_stale(
+        self, endpoint: str, breaker: CircuitBreaker, key: tuple
+    ) -> httpx.Response:
+        """
+        Answer from the last successful response while the breaker is open.
+
+        The copy carries a `Warning: 110` header marking it as stale.
+
+        Raises:
+            NetworkError: When no earlier response is available.
+        """
+        cached = self._stale_responses.get(key)
+        if cached is None:
+            self.metrics.increment("circuit_rejections", endpoint=endpoint)
+            raise NetworkError(
+                f"Wakapi circuit breaker is open for {endpoint}; failing fast",
+                details={
+                    "endpoint": endpoint,
+                    "state": breaker.state.value,
+                    "retry_after": breaker.retry_after(),
+                },
+            )
+
+        logging.getLogger(__name__).warning(
+            f"Circuit breaker open for {endpoint}; serving stale response"
+        )
+        self.metrics.increment("stale_responses", endpoint=endpoint)
+        # The cached body is already decoded, so drop the transfer headers
+        headers = httpx.Headers(
+            [
+                (name, value)
+                for name, value in cached.headers.multi_items()
+                if name.lower() not in ("content-encoding", "content-length")
+            ]
+        )
+        headers["Warning"] = '110 - "Response is Stale"'
+        return httpx.Response(
+            cached.status_code,
+            headers=headers,
+            content=cached.content,
+            request=cached.request,
+        )
 
     async def get_heartbeats(
         self,
@@ -396,16 +832,125 @@ class WakapiClient:
             params["limit"] = limit
         url = f"{self.base_url}{self.api_path}/users/{user}/heartbeats"
 
-        response = await self.client.get(
-            url, params=params, headers=self._get_headers()
+        return await self._get_model(
+            "get_heartbeats",
+            url,
+            HeartbeatsResult,
+            params=params,
+            raise_on_error_payload=True,
         )
-        response.raise_for_status()
 
-        json_data = response.json()
-        if "error" in json_data:
-            raise ValueError(json_data["error"])
+    async def stream_heartbeats(
+        self,
+        date: str,
+        user: str = "current",
+        project: Optional[str] = None,
+        limit: Optional[int] = None,
+        validate: bool = True,
+    ) -> AsyncIterator[Any]:
+        """
+        Yield the heartbeats of user for date as their response arrives.
+
+        Like `get_heartbeats`, but the `data` array is parsed incrementally
+        from the response stream, so memory stays bounded by a chunk and one
+        heartbeat however large the day is. Responses are not cached.
+
+        Args:
+            date: Day to fetch.
+            user: Username (or current).
+            project: Project to filter by.
+            limit: Limit number of heartbeats.
+            validate: Yield `HeartbeatEntry` models; when False, yield the
+                raw heartbeat dicts, skipping validation.
+
+        Raises:
+            ValueError: When Wakapi answers with an error payload or the body
+                is not valid JSON.
+        """
+        params = {"date": date}
+        if project:
+            params["project"] = project
+        if limit:
+            params["limit"] = limit
+        url = f"{self.base_url}{self.api_path}/users/{user}/heartbeats"
+
+        parser = JsonArrayParser("data")
+        decode_seconds = validate_seconds = 0.0
+        async with self._stream("get_heartbeats", url, params) as response:
+            elements = iter_json_array(response.aiter_bytes(), parser)
+            try:
+                while True:
+                    started = time.perf_counter()
+                    try:
+                        element = await elements.__anext__()
+                    except StopAsyncIteration:
+                        break
+                    decoded = time.perf_counter()
+                    decode_seconds += decoded - started
+                    if validate:
+                        element = HeartbeatEntry.model_validate(element)
+                        validate_seconds += time.perf_counter() - decoded
+                    yield element
+            finally:
+                await elements.aclose()
+                # Parse time includes waiting for the network between chunks
+                self.metrics.observe(
+                    "json_decode_seconds", decode_seconds, endpoint="get_heartbeats"
+                )
+                self.metrics.observe(
+                    "validate_seconds", validate_seconds, endpoint="get_heartbeats"
+                )
+        if "error" in parser.fields:
+            raise ValueError(parser.fields["error"])
+
+    async def iter_heartbeat_days(
+        self,
+        days: Iterable[date],
+        user: str = "current",
+        project: Optional[str] = None,
+    ) -> AsyncIterator[tuple[date, list[HeartbeatEntry]]]:
+        """
+        Yield (day, heartbeats sorted by time) for each of days, in order.
 
-        return HeartbeatsResult.model_validate(json_data)
+        Upcoming days are requested concurrently, at most
+        `heartbeat_stream.prefetch_days` ahead of the consumer. Only that
+        window is held in memory, so callers can stream ranges of any length.
+        """
+
+        async def fetch(day: date) -> list[HeartbeatEntry]:
+            if self.config.heartbeat_stream.incremental_parse:
+                entries = [
+                    entry
+                    async for entry in self.stream_heartbeats(
+                        date=day, user=user, project=project
+                    )
+                ]
+            else:
+                result = await self.get_heartbeats(date=day, user=user, project=project)
+                entries = result.data
+            return sorted(entries, key=lambda entry: entry.time)
+
+        lookahead = int(self.config.heartbeat_stream.prefetch_days)
+        async for day, entries in prefetched(days, fetch, lookahead):
+            yield day, entries
+
+    async def iter_heartbeats(
+        self,
+        start: date,
+        end: date,
+        user: str = "current",
+        project: Optional[str] = None,
+    ) -> AsyncIterator[HeartbeatEntry]:
+        """
+        Yield the heartbeats from start to end (inclusive days) in time order.
+
+        See `iter_heartbeat_days` for prefetching.
+        """
+        async for _, entries in self.iter_heartbeat_days(
+            date_range(start, end), user=user, project=project
+        ):
+            for entry in entries:
+                yield entry
 
     async def get_stats(
         self,
@@ -499,10 +1044,9 @@ class WakapiClient:
         url = f"{self.base_url}{self.api_path}/users/{user}/stats/{range}"
 
         try:
-            response = await self.client.get(
-                url, params=params, headers=self._get_headers()
+            stats = await self._get_model(
+                "get_stats", url, StatsViewModel, params=params
             )
-            response.raise_for_status()
         except httpx.HTTPStatusError as e:
             raise ApiError(
                 f"Wakapi API error in get_stats: {e.response.status_code} - "
@@ -510,11 +1054,9 @@ class WakapiClient:
                 details={"status_code": e.response.status_code, "method": "get_stats"},
             ) from e
 
-        json_data = response.json()
         logger = logging.getLogger(__name__)
-        logger.debug(f"Stats API response: {json_data}")
         logger.debug("Calling real Wakapi API for get_stats")
-        return StatsViewModel.model_validate(json_data)
+        return stats
 
     async def get_projects(
         self, user: str = "current", q: Optional[str] = None
@@ -555,10 +1097,9 @@ class WakapiClient:
         logger = logging.getLogger(__name__)
         logger.debug("Calling real Wakapi API for get_projects")
         try:
-            response = await self.client.get(
-                url, params=params, headers=self._get_headers()
+            result = await self._get_model(
+                "get_projects", url, ProjectsViewModel, params=params
             )
-            response.raise_for_status()
         except httpx.HTTPStatusError as e:
             raise ApiError(
                 f"Wakapi API error in get_projects: {e.response.status_code} - "
@@ -569,8 +1110,7 @@ class WakapiClient:
                 },
             ) from e
 
-        json_data = response.json()
-        return ProjectsViewModel.model_validate(json_data)
+        return result
 
     async def get_leaders(self) -> LeadersViewModel:
         """
@@ -593,8 +1133,7 @@ class WakapiClient:
         logger = logging.getLogger(__name__)
         logger.debug("Calling real Wakapi API for get_leaders")
         try:
-            response = await self.client.get(url, headers=self._get_headers())
-            response.raise_for_status()
+            result = await self._get_model("get_leaders", url, LeadersViewModel)
         except httpx.HTTPStatusError as e:
             raise ApiError(
                 f"Wakapi API error in get_leaders: {e.response.status_code} - "
@@ -605,8 +1144,7 @@ class WakapiClient:
                 },
             ) from e
 
-        json_data = response.json()
-        return LeadersViewModel.model_validate(json_data)
+        return result
 
     async def get_user(self, user: str = "current") -> UserViewModel:
         """
@@ -636,8 +1174,7 @@ class WakapiClient:
         logger = logging.getLogger(__name__)
         logger.debug("Calling real Wakapi API for get_user")
         try:
-            response = await self.client.get(url, headers=self._get_headers())
-            response.raise_for_status()
+            result = await self._get_model("get_user", url, UserViewModel)
         except httpx.HTTPStatusError as e:
             raise ApiError(
                 f"Wakapi API error in get_user: {e.response.status_code} - "
@@ -645,8 +1182,7 @@ class WakapiClient:
                 details={"status_code": e.response.status_code, "method": "get_user"},
             ) from e
 
-        json_data = response.json()
-        return UserViewModel.model_validate(json_data)
+        return result
 
     async def get_all_time_since_today(self, user: str = "current") -> AllTimeViewModel:
         """
@@ -676,8 +1212,9 @@ class WakapiClient:
         logger = logging.getLogger(__name__)
         logger.debug("Calling real Wakapi API for get_all_time_since_today")
         try:
-            response = await self.client.get(url, headers=self._get_headers())
-            response.raise_for_status()
+            result = await self._get_model(
+                "get_all_time_since_today", url, AllTimeViewModel
+            )
         except httpx.HTTPStatusError as e:
             raise ApiError(
                 f"Wakapi API error in get_all_time_since_today: "
@@ -688,8 +1225,7 @@ class WakapiClient:
                 },
             ) from e
 
-        json_data = response.json()
-        return AllTimeViewModel.model_validate(json_data)
+        return result
 
     async def get_project_detail(
         self, user: str = "current", id: Optional[str] = None
@@ -729,8 +1265,7 @@ class WakapiClient:
         logger = logging.getLogger(__name__)
         logger.debug("Calling real Wakapi API for get_project_detail")
         try:
-            response = await self.client.get(url, headers=self._get_headers())
-            response.raise_for_status()
+            result = await self._get_model("get_project_detail", url, ProjectViewModel)
         except httpx.HTTPStatusError as e:
             raise ApiError(
                 f"Wakapi API error in get_project_detail: {e.response.status_code} - "
@@ -741,9 +1276,7 @@ class WakapiClient:
                 },
             ) from e
 
-        json_data = response.json()
-        return ProjectViewModel.model_validate(json_data)
-
+        return result
 
     async def get_summaries(
         self,
@@ -856,10 +1389,9 @@ class WakapiClient:
         logger = logging.getLogger(__name__)
         logger.debug("Calling real Wakapi API for get_summaries")
         try:
-            response = await self.client.get(
-                url, params=params, headers=self._get_headers()
+            result = await self._get_model(
+                "get_summaries", url, SummariesViewModel, params=params
             )
-            response.raise_for_status()
         except httpx.HTTPStatusError as e:
             raise ApiError(
                 f"Wakapi API error in get_summaries: {e.response.status_code} - "
@@ -870,5 +1402,4 @@ class WakapiClient:
                 },
             ) from e
 
-        json_data = response.json()
-        return SummariesViewModel.model_validate(json_data)
+        return result
@@ -0,0 +1,103 @@
+"""
+HTTP revalidation cache for Wakapi responses.
+
+Entries keep the validators (`ETag`, `Last-Modified`) of a response together
+with a hash of its body and the parsed model. Repeat requests are sent as
+conditional requests; a 304 answer reuses the parsed model. Endpoints that
+emit no validators still benefit: an unchanged body hash skips JSON decoding
+and model validation.
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from pydantic import BaseModel
+
+
+@dataclass
+class RevalidationCacheConfig:
+    """Revalidation cache configuration data class."""
+
+    enabled: bool = False
+    max_entries: int = 512
+
+
+@dataclass
+class CacheEntry:
+    """Cached response validators and parsed model."""
+
+    etag: Optional[str]
+    last_modified: Optional[str]
+    body_hash: str
+    model: BaseModel
+    stored_at: float
+
+    def conditional_headers(self) -> dict[str, str]:
+        """Headers turning a repeat request into a conditional one."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+def request_key(url: str, params: Optional[dict[str, Any]] = None) -> tuple:
+    """Build the cache key of a GET request."""
+    return (url, tuple(sorted((params or {}).items())))
+
+
+def body_hash(content: bytes) -> str:
+    """Hash a response body."""
+    return hashlib.sha256(content).hexdigest()
+
+
+class RevalidationCache:
+    """LRU cache of revalidatable responses."""
+
+    def __init__(self, config: Optional[RevalidationCacheConfig] = None) -> None:
+        """Initialize an empty cache."""
+        self.config = config or RevalidationCacheConfig()
+        self.enabled = bool(self.config.enabled)
+        self.max_entries = max(1, int(self.config.max_entries))
+        self._entries: OrderedDict[tuple, CacheEntry] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Return the number of cached entries."""
+        return len(self._entries)
+
+    def get(self, key: tuple) -> Optional[CacheEntry]:
+        """Return the entry for key, marking it recently used."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def store(
+        self,
+        key: tuple,
+        model: BaseModel,
+        digest: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> CacheEntry:
+        """Store a parsed model with its validators, evicting the oldest entry."""
+        entry = CacheEntry(
+            etag=etag,
+            last_modified=last_modified,
+            body_hash=digest,
+            model=model,
+            stored_at=time.time(),
+        )
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._entries.clear()
@@ -0,0 +1,256 @@
+"""
+Record and replay Wakapi traffic.
+
+In record mode `RecordingTransport` appends every response the client
+receives (method, URL, query parameters, status, headers, body and elapsed
+time) to a cassette: gzip-compressed JSON lines, flushed in batches and when
+the client is closed. Request headers are never stored, so the API key stays
+out of the file; response bodies are, so treat cassettes like the Wakapi data
+they contain.
+
+In replay mode `ReplayTransport` answers requests from a cassette without any
+network access, optionally sleeping for the originally recorded time.
+Requests are matched on method, path and query parameters; repeated requests
+walk through the recorded responses in order and then keep returning the
+last one. Unless `strict` is set, a request whose parameters were never
+recorded (a date that moved on since recording, say) is answered with a
+response recorded for the same path.
+"""
+
+import asyncio
+import base64
+import gzip
+import json
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+import httpx
+
+from .exceptions import ConfigurationError
+
+RECORD = "record"
+REPLAY = "replay"
+
+
+@dataclass
+class CassetteConfig:
+    """Record/replay configuration data class."""
+
+    # "record", "replay" or None to talk to Wakapi normally
+    mode: Optional[str] = None
+    path: Optional[str] = None
+    replay_timing: bool = False
+    # Multiplier on recorded timings when replay_timing is set
+    timing_scale: float = 1.0
+    strict: bool = False
+    # Recorded entries buffered before they are appended to the file
+    flush_every: int = 50
+
+    def __post_init__(self) -> None:
+        """Reject unknown modes."""
+        if self.mode not in (None, RECORD, REPLAY):
+            raise ConfigurationError(
+                f"Unknown cassette mode: {self.mode}", details={"mode": self.mode}
+            )
+
+
+class CassetteMissError(httpx.TransportError):
+    """No recorded response matches a replayed request."""
+
+
+def _params(url: httpx.URL) -> list[list[str]]:
+    return sorted([key, value] for key, value in url.params.multi_items())
+
+
+def _match_key(method: str, path: str, params: list[list[str]]) -> tuple:
+    return (method, path, tuple(tuple(pair) for pair in params))
+
+
+class Cassette:
+    """
+    Recorded responses backed by a gzip JSON lines file.
+
+    Recording only buffers the entries not yet written; the responses are
+    held and indexed for matching only in a cassette loaded for replay.
+    """
+
+    def __init__(self, path: str, flush_every: int = 50) -> None:
+        """Initialize an empty cassette stored at path."""
+        self.path = Path(path)
+        self.flush_every = max(1, int(flush_every))
+        self.entries: list[dict[str, Any]] = []
+        self._pending: list[dict[str, Any]] = []
+        self._write_lock = asyncio.Lock()
+        self._by_key: dict[tuple, list[dict[str, Any]]] = defaultdict(list)
+        self._by_path: dict[tuple, list[dict[str, Any]]] = defaultdict(list)
+        self._positions: dict[tuple, int] = defaultdict(int)
+
+    @classmethod
+    def load(cls, path: str) -> "Cassette":
+        """Read a cassette file for replay."""
+        cassette = cls(path)
+        with gzip.open(cassette.path, "rt", encoding="utf-8") as stream:
+            for line in stream:
+                if line.strip():
+                    cassette._index(json.loads(line))
+        return cassette
+
+    def __len__(self) -> int:
+        """Return the number of recorded responses."""
+        return len(self.entries)
+
+    def _index(self, entry: dict[str, Any]) -> None:
+        self.entries.append(entry)
+        self._by_key[
+            _match_key(entry["method"], entry["path"], entry["params"])
+        ].append(entry)
+        self._by_path[(entry["method"], entry["path"])].append(entry)
+
+    async def record(
+        self,
+        request: httpx.Request,
+        response: httpx.Response,
+        body: bytes,
+        elapsed: float,
+    ) -> None:
+        """Buffer a response, flushing to disk once enough are buffered."""
+        entry: dict[str, Any] = {
+            "method": request.method,
+            "url": str(request.url.copy_with(query=None)),
+            "path": request.url.path,
+            "params": _params(request.url),
+            "status": response.status_code,
+            "headers": response.headers.multi_items(),
+            "elapsed": round(elapsed, 6),
+        }
+        try:
+            entry["body"] = body.decode("utf-8")
+        except UnicodeDecodeError:
+            entry["body_b64"] = base64.b64encode(body).decode("ascii")
+        self._pending.append(entry)
+        if len(self._pending) >= self.flush_every:
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Append buffered entries to the file as a new gzip member."""
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        # Batches are written in order, in a thread to keep the loop free
+        async with self._write_lock:
+            await asyncio.to_thread(self._append, batch)
+
+    def _append(self, batch: list[dict[str, Any]]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with gzip.open(self.path, "at", encoding="utf-8") as stream:
+            for entry in batch:
+                stream.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+    def match(self, request: httpx.Request, strict: bool = False) -> dict[str, Any]:
+        """Return the next recorded response for request."""
+        key = _match_key(request.method, request.url.path, _params(request.url))
+        candidates = self._by_key.get(key)
+        if not candidates and not strict:
+            key = (request.method, request.url.path)
+            candidates = self._by_path.get(key)
+        if not candidates:
+            raise CassetteMissError(
+                f"No recorded response for {request.method} {request.url}",
+                request=request,
+            )
+        position = self._positions[key]
+        self._positions[key] = position + 1
+        return candidates[min(position, len(candidates) - 1)]
+
+
+def entry_body(entry: dict[str, Any]) -> bytes:
+    """Return the recorded body of an entry."""
+    if "body_b64" in entry:
+        return base64.b64decode(entry["body_b64"])
+    return entry.get("body", "").encode("utf-8")
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """Transport wrapper recording every response into a cassette."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, cassette: Cassette) -> None:
+        """Wrap transport, recording into cassette."""
+        self._transport = transport
+        self.cassette = cassette
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Send request and record the response."""
+        started = time.perf_counter()
+        response = await self._transport.handle_async_request(request)
+        try:
+            # Raw bytes, so a still-encoded body is stored with its encoding
+            body = b"".join([chunk async for chunk in response.stream])
+        finally:
+            await response.stream.aclose()
+        await self.cassette.record(
+            request, response, body, time.perf_counter() - started
+        )
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=httpx.ByteStream(body),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        """Flush the cassette and close the wrapped transport."""
+        await self.cassette.flush()
+        await self._transport.aclose()
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """Transport answering requests from a cassette."""
+
+    def __init__(
+        self,
+        cassette: Cassette,
+        replay_timing: bool = False,
+        timing_scale: float = 1.0,
+        strict: bool = False,
+    ) -> None:
+        """Replay cassette, optionally with its recorded timing."""
+        self.cassette = cassette
+        self.replay_timing = bool(replay_timing)
+        self.timing_scale = float(timing_scale)
+        self.strict = bool(strict)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Return the recorded response matching request."""
+        entry = self.cassette.match(request, strict=self.strict)
+        if self.replay_timing and entry.get("elapsed"):
+            await asyncio.sleep(entry["elapsed"] * self.timing_scale)
+        return httpx.Response(
+            status_code=entry["status"],
+            headers=entry["headers"],
+            stream=httpx.ByteStream(entry_body(entry)),
+            request=request,
+        )
+
+
+def replay_transport(config: CassetteConfig) -> ReplayTransport:
+    """Build the transport replaying the configured cassette."""
+    if not config.path:
+        raise ValueError("A cassette path is required to replay")
+    return ReplayTransport(
+        Cassette.load(config.path),
+        replay_timing=config.replay_timing,
+        timing_scale=config.timing_scale,
+        strict=config.strict,
+    )
+
+
+def recording_transport(
+    transport: httpx.AsyncBaseTransport, config: CassetteConfig
+) -> RecordingTransport:
+    """Wrap transport to record into the configured cassette."""
+    if not config.path:
+        raise ValueError("A cassette path is required to record")
+    return RecordingTransport(transport, Cassette(config.path, config.flush_every))
@@ -0,0 +1,133 @@
+"""
+Per-endpoint circuit breaker for requests sent to Wakapi.
+
+A breaker opens after `failure_threshold` consecutive failures (transport
+errors, timeouts and 5xx answers). While open, calls fail fast; after
+`recovery_timeout` seconds it lets `half_open_max_calls` probe requests through
+and closes again once one of them succeeds.
+"""
+
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable, Optional
+
+from .metrics import ClientMetrics
+
+
+class CircuitState(Enum):
+    """Circuit breaker state enum."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+# Numeric encoding used for the `circuit_state` gauge
+_STATE_GAUGE = {CircuitState.CLOSED: 0, CircuitState.HALF_OPEN: 1, CircuitState.OPEN: 2}
+
+
+@dataclass
+class CircuitBreakerConfig:
+    """Circuit breaker configuration data class."""
+
+    enabled: bool = True
+    failure_threshold: int = 5
+    recovery_timeout: float = 30.0
+    half_open_max_calls: int = 1
+    # Responses kept for serving stale, bounded by count and by body bytes
+    stale_cache_size: int = 256
+    stale_cache_bytes: int = 8 * 1024 * 1024
+
+
+class CircuitBreaker:
+    """Circuit breaker guarding a single endpoint."""
+
+    def __init__(
+        self,
+        name: str,
+        config: Optional[CircuitBreakerConfig] = None,
+        metrics: Optional[ClientMetrics] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize a closed breaker."""
+        self.name = name
+        self.config = config or CircuitBreakerConfig()
+        self.enabled = bool(self.config.enabled)
+        self.failure_threshold = max(1, int(self.config.failure_threshold))
+        self.recovery_timeout = float(self.config.recovery_timeout)
+        self.half_open_max_calls = max(1, int(self.config.half_open_max_calls))
+        self.metrics = metrics
+        self._clock = clock
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+
+    @property
+    def state(self) -> CircuitState:
+        """Current state, moving from open to half-open once recovery is due."""
+        if (
+            self._state is CircuitState.OPEN
+            and self._clock() - self._opened_at >= self.recovery_timeout
+        ):
+            self._transition(CircuitState.HALF_OPEN)
+        return self._state
+
+    def retry_after(self) -> float:
+        """Seconds until the breaker lets a probe request through."""
+        if self.state is not CircuitState.OPEN:
+            return 0.0
+        return max(0.0, self._opened_at + self.recovery_timeout - self._clock())
+
+    def allow_request(self) -> bool:
+        """Return whether a request may be sent now."""
+        if not self.enabled:
+            return True
+        state = self.state
+        if state is CircuitState.CLOSED:
+            return True
+        if state is CircuitState.HALF_OPEN and self._probes < self.half_open_max_calls:
+            self._probes += 1
+            return True
+        return False
+
+    def record(self, healthy: Optional[bool]) -> None:
+        """
+        Record the outcome of an allowed request.
+
+        Args:
+            healthy: True when Wakapi answered, False on failure, None when the
+                request ended without a verdict (e.g. it was cancelled).
+        """
+        if not self.enabled:
+            return
+        if self._state is CircuitState.HALF_OPEN:
+            self._probes = max(0, self._probes - 1)
+        if healthy is None:
+            return
+        if healthy:
+            self._failures = 0
+            if self._state is not CircuitState.CLOSED:
+                self._transition(CircuitState.CLOSED)
+            return
+
+        self._failures += 1
+        if (
+            self._state is CircuitState.HALF_OPEN
+            or self._failures >= self.failure_threshold
+        ):
+            self._opened_at = self._clock()
+            self._transition(CircuitState.OPEN)
+
+    def _transition(self, state: CircuitState) -> None:
+        self._state = state
+        if state is not CircuitState.HALF_OPEN:
+            self._probes = 0
+        if self.metrics is not None:
+            self.metrics.set_gauge(
+                "circuit_state", _STATE_GAUGE[state], endpoint=self.name
+            )
+            self.metrics.increment(
+                "circuit_transitions", endpoint=self.name, state=state.value
+            )
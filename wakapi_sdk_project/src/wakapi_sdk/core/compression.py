@@ -0,0 +1,179 @@
+"""
+Response compression negotiation and decode metrics.
+
+`DecodingTransport` wraps the HTTP transport of WakapiClient and takes over
+content decoding from httpx, so the compressed size, decoded size and time
+spent decompressing each response can be recorded per encoding.
+"""
+
+import time
+import zlib
+from dataclasses import dataclass
+from typing import AsyncIterator, Optional
+
+import httpx
+
+from .metrics import ClientMetrics
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on the installed extras
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+
+@dataclass
+class CompressionConfig:
+    """Compression negotiation configuration data class."""
+
+    # Sent as Accept-Encoding; None keeps the httpx default ("gzip, deflate").
+    accept_encoding: Optional[str] = None
+    measure_decoding: bool = True
+
+
+def supported_encodings() -> list[str]:
+    """Return the content encodings this client can decode."""
+    encodings = ["gzip", "deflate"]
+    if brotli is not None:
+        encodings.append("br")
+    return encodings
+
+
+class _Decompressor:
+    """Incremental decompressor for a single content encoding."""
+
+    def __init__(self, encoding: str) -> None:
+        self.encoding = encoding
+        if encoding == "gzip":
+            self._decoder = zlib.decompressobj(zlib.MAX_WBITS | 16)
+        elif encoding == "deflate":
+            self._decoder = zlib.decompressobj()
+            self._first_chunk = True
+        elif encoding == "br":
+            self._decoder = brotli.Decompressor()
+        else:
+            raise ValueError(f"Unsupported content encoding: {encoding}")
+
+    def decompress(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._decoder.process(data)
+        if self.encoding == "deflate" and self._first_chunk:
+            # Some servers send raw deflate streams without the zlib header
+            self._first_chunk = False
+            try:
+                return self._decoder.decompress(data)
+            except zlib.error:
+                self._decoder = zlib.decompressobj(-zlib.MAX_WBITS)
+        return self._decoder.decompress(data)
+
+    def flush(self) -> bytes:
+        if self.encoding == "br":
+            return b""
+        return self._decoder.flush()
+
+
+class _DecodingStream(httpx.AsyncByteStream):
+    """Response stream that decompresses chunks and records decode metrics."""
+
+    def __init__(
+        self,
+        stream: httpx.AsyncByteStream,
+        encoding: str,
+        metrics: ClientMetrics,
+    ) -> None:
+        self._stream = stream
+        self._encoding = encoding
+        self._decompressor = _Decompressor(encoding) if encoding != "identity" else None
+        self._metrics = metrics
+        self._compressed_bytes = 0
+        self._decoded_bytes = 0
+        self._decode_seconds = 0.0
+        self._recorded = False
+
+    def _decode(self, chunk: bytes, final: bool = False) -> bytes:
+        started = time.perf_counter()
+        if self._decompressor is None:
+            decoded = chunk
+        elif final:
+            decoded = self._decompressor.flush()
+        else:
+            decoded = self._decompressor.decompress(chunk)
+        self._decode_seconds += time.perf_counter() - started
+        self._decoded_bytes += len(decoded)
+        return decoded
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            self._compressed_bytes += len(chunk)
+            decoded = self._decode(chunk)
+            if decoded:
+                yield decoded
+        tail = self._decode(b"", final=True)
+        if tail:
+            yield tail
+        self._record()
+
+    def _record(self) -> None:
+        if self._recorded:
+            return
+        self._recorded = True
+        labels = {"encoding": self._encoding}
+        self._metrics.increment(
+            "content_bytes_compressed", self._compressed_bytes, **labels
+        )
+        self._metrics.increment("content_bytes_decoded", self._decoded_bytes, **labels)
+        self._metrics.observe("content_decode_seconds", self._decode_seconds, **labels)
+        if self._compressed_bytes:
+            self._metrics.observe(
+                "content_compression_ratio",
+                self._decoded_bytes / self._compressed_bytes,
+                **labels,
+            )
+
+    async def aclose(self) -> None:
+        await self._stream.aclose()
+
+
+class DecodingTransport(httpx.AsyncBaseTransport):
+    """Transport wrapper that decodes response bodies and records metrics."""
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        metrics: ClientMetrics,
+    ) -> None:
+        """Wrap transport, reporting to metrics."""
+        self._transport = transport
+        self._metrics = metrics
+        self._encodings = set(supported_encodings())
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Send request and wrap the response stream with a decoder."""
+        response = await self._transport.handle_async_request(request)
+        encoding = response.headers.get("Content-Encoding", "identity").lower()
+        encoding = encoding.strip() or "identity"
+        if encoding != "identity" and encoding not in self._encodings:
+            # Stacked or unknown encodings are left to httpx
+            return response
+
+        headers = response.headers
+        if encoding != "identity":
+            headers = httpx.Headers(
+                [
+                    (name, value)
+                    for name, value in response.headers.multi_items()
+                    if name.lower() not in ("content-encoding", "content-length")
+                ]
+            )
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=headers,
+            stream=_DecodingStream(response.stream, encoding, self._metrics),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        """Close the wrapped transport."""
+        await self._transport.aclose()
@@ -0,0 +1,152 @@
+"""
+Adaptive concurrency control for requests sent to Wakapi.
+
+The limit follows AIMD (additive increase, multiplicative decrease): it grows
+by a fixed step after every window of requests whose p95 latency stayed under
+the target, and is cut by a factor when Wakapi answers 429, 5xx or times out.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Optional
+
+from .metrics import ClientMetrics, percentile
+
+
+@dataclass
+class AdaptiveConcurrencyConfig:
+    """Adaptive concurrency configuration data class."""
+
+    enabled: bool = True
+    initial_limit: int = 4
+    min_limit: int = 1
+    max_limit: int = 32
+    target_p95_seconds: float = 1.0
+    increase_step: float = 1.0
+    decrease_factor: float = 0.5
+    window: int = 20
+
+
+@dataclass
+class ConcurrencyTicket:
+    """Slot handed out by AdaptiveConcurrencyLimiter."""
+
+    epoch: int
+    waited: float
+
+
+class AdaptiveConcurrencyLimiter:
+    """Concurrency limiter whose limit adapts to upstream latency and overload."""
+
+    def __init__(
+        self,
+        config: Optional[AdaptiveConcurrencyConfig] = None,
+        metrics: Optional[ClientMetrics] = None,
+    ) -> None:
+        """Initialize the limiter at its initial limit."""
+        self.config = config or AdaptiveConcurrencyConfig()
+        self.enabled = bool(self.config.enabled)
+        self.min_limit = max(1, int(self.config.min_limit))
+        self.max_limit = max(self.min_limit, int(self.config.max_limit))
+        self.target_p95_seconds = float(self.config.target_p95_seconds)
+        self.increase_step = float(self.config.increase_step)
+        self.decrease_factor = float(self.config.decrease_factor)
+        self.window = max(1, int(self.config.window))
+        self.metrics = metrics
+        self._limit = float(
+            min(self.max_limit, max(self.min_limit, int(self.config.initial_limit)))
+        )
+        self._in_flight = 0
+        # Bumped on every decrease; overload signals from requests started in
+        # an earlier epoch are ignored so one burst of failures cuts only once.
+        self._epoch = 0
+        self._latencies: list[float] = []
+        self._condition = asyncio.Condition()
+        self._publish()
+
+    @property
+    def limit(self) -> int:
+        """Current concurrency limit."""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        """Number of slots currently held."""
+        return self._in_flight
+
+    def _publish(self) -> None:
+        if self.metrics is None:
+            return
+        self.metrics.set_gauge("concurrency_limit", self.limit)
+        self.metrics.set_gauge("concurrency_in_flight", self._in_flight)
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[ConcurrencyTicket]:
+        """Hold one concurrency slot for the duration of the block."""
+        started = time.perf_counter()
+        if self.enabled:
+            async with self._condition:
+                await self._condition.wait_for(lambda: self._in_flight < self.limit)
+                self._in_flight += 1
+        else:
+            self._in_flight += 1
+        self._publish()
+        try:
+            yield ConcurrencyTicket(
+                epoch=self._epoch, waited=time.perf_counter() - started
+            )
+        finally:
+            await self._release()
+
+    @asynccontextmanager
+    async def try_slot(self) -> AsyncIterator[Optional[ConcurrencyTicket]]:
+        """Hold a slot if one is free right now; yields None otherwise."""
+        if self.enabled and self._in_flight >= self.limit:
+            yield None
+            return
+        self._in_flight += 1
+        self._publish()
+        try:
+            yield ConcurrencyTicket(epoch=self._epoch, waited=0.0)
+        finally:
+            await self._release()
+
+    async def _release(self) -> None:
+        self._in_flight -= 1
+        self._publish()
+        if self.enabled:
+            async with self._condition:
+                self._condition.notify_all()
+
+    def record_success(self, ticket: ConcurrencyTicket, latency: float) -> None:
+        """
+        Feed the latency of a successful request into the controller.
+
+        Must be called before the ticket's slot is released.
+        """
+        if not self.enabled or ticket.epoch != self._epoch:
+            return
+        self._latencies.append(latency)
+        if len(self._latencies) < self.window:
+            return
+        p95 = percentile(self._latencies, 95)
+        self._latencies.clear()
+        if p95 <= self.target_p95_seconds:
+            self._set_limit(self._limit + self.increase_step)
+
+    def record_overload(self, ticket: ConcurrencyTicket) -> None:
+        """Cut the limit after a 429, 5xx or timeout."""
+        if not self.enabled or ticket.epoch != self._epoch:
+            return
+        self._epoch += 1
+        self._latencies.clear()
+        self._set_limit(self._limit * self.decrease_factor)
+        if self.metrics is not None:
+            self.metrics.increment("concurrency_decreases")
+
+    def _set_limit(self, value: float) -> None:
+        # Waiters are woken when the reporting request releases its slot
+        self._limit = min(float(self.max_limit), max(float(self.min_limit), value))
+        self._publish()
@@ -5,9 +5,20 @@ import json
 import toml
 from pathlib import Path
 from typing import Optional, Any
-from dataclasses import dataclass
-
+from dataclasses import dataclass, field, fields
+
+from .cache import RevalidationCacheConfig
+from .cassette import CassetteConfig
+from .circuit_breaker import CircuitBreakerConfig
+from .compression import CompressionConfig
+from .concurrency import AdaptiveConcurrencyConfig
+from .connections import ConnectionWarmingConfig
+from .deadline import DeadlineConfig, TimeoutConfig
 from .exceptions import ConfigurationError
+from .hedging import HedgingConfig
+from .rate_limit import RateLimitConfig
+from .store import LocalStoreConfig
+from .streaming import HeartbeatStreamConfig
 
 
 @dataclass
@@ -19,6 +30,26 @@ class WakapiConfig:
     api_path: str = "/compat/wakatime/v1"
     timeout: int = 30
     retry_count: int = 3
+    rate_limit: RateLimitConfig = field(default_factory=RateLimitConfig)
+    adaptive_concurrency: AdaptiveConcurrencyConfig = field(
+        default_factory=AdaptiveConcurrencyConfig
+    )
+    circuit_breaker: CircuitBreakerConfig = field(default_factory=CircuitBreakerConfig)
+    revalidation_cache: RevalidationCacheConfig = field(
+        default_factory=RevalidationCacheConfig
+    )
+    compression: CompressionConfig = field(default_factory=CompressionConfig)
+    cassette: CassetteConfig = field(default_factory=CassetteConfig)
+    heartbeat_stream: HeartbeatStreamConfig = field(
+        default_factory=HeartbeatStreamConfig
+    )
+    timeouts: TimeoutConfig = field(default_factory=TimeoutConfig)
+    deadline: DeadlineConfig = field(default_factory=DeadlineConfig)
+    hedging: HedgingConfig = field(default_factory=HedgingConfig)
+    connections: ConnectionWarmingConfig = field(
+        default_factory=ConnectionWarmingConfig
+    )
+    local_store: LocalStoreConfig = field(default_factory=LocalStoreConfig)
 
 
 @dataclass
@@ -177,6 +208,38 @@ api_key = "your-api-key"
                     flat_config.get("WAKAPI_CONNECTION_RETRY_COUNT", 3),
                 )
             ),
+            rate_limit=self._build_section(
+                RateLimitConfig, flat_config, "WAKAPI_RATE_LIMIT"
+            ),
+            adaptive_concurrency=self._build_section(
+                AdaptiveConcurrencyConfig, flat_config, "WAKAPI_ADAPTIVE_CONCURRENCY"
+            ),
+            circuit_breaker=self._build_section(
+                CircuitBreakerConfig, flat_config, "WAKAPI_CIRCUIT_BREAKER"
+            ),
+            revalidation_cache=self._build_section(
+                RevalidationCacheConfig, flat_config, "WAKAPI_REVALIDATION_CACHE"
+            ),
+            compression=self._build_section(
+                CompressionConfig, flat_config, "WAKAPI_COMPRESSION"
+            ),
+            cassette=self._build_section(
+                CassetteConfig, flat_config, "WAKAPI_CASSETTE"
+            ),
+            heartbeat_stream=self._build_section(
+                HeartbeatStreamConfig, flat_config, "WAKAPI_HEARTBEAT_STREAM"
+            ),
+            timeouts=self._build_section(TimeoutConfig, flat_config, "WAKAPI_TIMEOUTS"),
+            deadline=self._build_section(
+                DeadlineConfig, flat_config, "WAKAPI_DEADLINE"
+            ),
+            hedging=self._build_section(HedgingConfig, flat_config, "WAKAPI_HEDGING"),
+            connections=self._build_section(
+                ConnectionWarmingConfig, flat_config, "WAKAPI_CONNECTIONS"
+            ),
+            local_store=self._build_section(
+                LocalStoreConfig, flat_config, "WAKAPI_LOCAL_STORE"
+            ),
         )
 
         # Server configuration
@@ -220,6 +283,38 @@ api_key = "your-api-key"
             return LoggingConfig()
         return self._logging_config
 
+    def _build_section(self, section_class, flat_config: dict[str, Any], prefix: str):
+        """
+        Build a configuration dataclass from flattened `PREFIX_FIELD` keys.
+
+        Values are coerced to the type of the field default; fields without a
+        matching key keep their default.
+        """
+        values = {}
+        for section_field in fields(section_class):
+            key = f"{prefix}_{section_field.name.upper()}"
+            if key not in flat_config:
+                continue
+            value = flat_config[key]
+            annotation = str(section_field.type)
+            try:
+                if "bool" in annotation:
+                    if isinstance(value, str):
+                        value = value.strip().lower() in ("1", "true", "yes", "on")
+                    else:
+                        value = bool(value)
+                elif "float" in annotation:
+                    value = float(value)
+                elif "int" in annotation:
+                    value = int(value)
+            except (TypeError, ValueError) as e:
+                raise ConfigurationError(
+                    f"Invalid value for {key}: {value!r}",
+                    details={"key": key},
+                ) from e
+            values[section_field.name] = value
+        return section_class(**values)
+
     def _flatten_config(self, config_data: dict[str, Any]) -> dict[str, Any]:
         """Convert nested configuration to a flat dictionary."""
         flat_config = {}
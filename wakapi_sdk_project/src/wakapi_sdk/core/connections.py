@@ -0,0 +1,247 @@
+"""
+Warm connections to Wakapi.
+
+The first request after start, and the first after the pool dropped its idle
+connections, pays for DNS resolution, the TCP connect and the TLS handshake.
+`ConnectionWarmer` opens `min_connections` keep-alive connections up front
+and sends a lightweight probe over each of them every `keepalive_interval`
+seconds, so they never sit idle long enough to expire. Since warm connections
+are reused, their TLS sessions are too: no new handshake is needed while
+they stay open.
+
+`DnsCachingBackend` resolves host names once per `dns_ttl` seconds for all
+new connections. It connects to the resolved addresses in the order the
+resolver returned them, moving on to the next (e.g. from IPv6 to IPv4) when
+one refuses, while TLS still verifies the original host name.
+"""
+
+import asyncio
+import ipaddress
+import socket
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Iterable, Optional
+
+import httpcore
+import httpx
+
+from .exceptions import ConfigurationError
+from .logging import get_logger
+from .metrics import ClientMetrics
+from .rate_limit import BACKGROUND, request_budget
+
+logger = get_logger("connections")
+
+
+@dataclass
+class ConnectionWarmingConfig:
+    """Connection warming configuration data class."""
+
+    enabled: bool = False
+    # Keep-alive connections opened at start and kept open
+    min_connections: int = 2
+    # Seconds between keep-alive probes; below keepalive_expiry
+    keepalive_interval: float = 20.0
+    # Seconds the pool keeps an idle connection open
+    keepalive_expiry: float = 60.0
+    # Seconds a DNS answer is reused; 0 resolves for every connection
+    dns_ttl: float = 300.0
+
+    def __post_init__(self):
+        """Validate configuration."""
+        if float(self.keepalive_interval) >= float(self.keepalive_expiry):
+            raise ConfigurationError(
+                "keepalive_interval must be below keepalive_expiry",
+                details={
+                    "keepalive_interval": self.keepalive_interval,
+                    "keepalive_expiry": self.keepalive_expiry,
+                },
+            )
+
+
+class DnsCache:
+    """Resolved addresses per host and port, reused for ttl seconds."""
+
+    def __init__(
+        self,
+        ttl: float,
+        metrics: Optional[ClientMetrics] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize an empty cache."""
+        self.ttl = float(ttl)
+        self.metrics = metrics
+        self._clock = clock
+        self._entries: dict[tuple[str, int], tuple[float, list[str]]] = {}
+
+    async def resolve(self, host: str, port: int) -> list[str]:
+        """Return the addresses of host, resolving it if not cached."""
+        try:
+            ipaddress.ip_address(host)
+            return [host]
+        except ValueError:
+            pass
+        entry = self._entries.get((host, port))
+        if entry is not None and self._clock() < entry[0]:
+            return entry[1]
+        infos = await asyncio.get_running_loop().getaddrinfo(
+            host, port, type=socket.SOCK_STREAM
+        )
+        # Keep the resolver's order, which already prefers the better family
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        if self.ttl > 0:
+            self._entries[(host, port)] = (self._clock() + self.ttl, addresses)
+        if self.metrics is not None:
+            self.metrics.increment("dns_lookups", host=host)
+        return addresses
+
+    def forget(self, host: str, port: int) -> None:
+        """Drop the cached addresses of host, e.g. after all refused."""
+        self._entries.pop((host, port), None)
+
+
+class DnsCachingBackend(httpcore.AsyncNetworkBackend):
+    """Network backend connecting to addresses from a `DnsCache`."""
+
+    def __init__(self, backend: httpcore.AsyncNetworkBackend, cache: DnsCache):
+        """Wrap backend."""
+        self.backend = backend
+        self.cache = cache
+
+    async def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: Optional[float] = None,
+        local_address: Optional[str] = None,
+        socket_options: Optional[Iterable[Any]] = None,
+    ) -> httpcore.AsyncNetworkStream:
+        """Connect to the first cached address of host that accepts."""
+        addresses = await self.cache.resolve(host, port)
+        for index, address in enumerate(addresses):
+            try:
+                return await self.backend.connect_tcp(
+                    address,
+                    port,
+                    timeout=timeout,
+                    local_address=local_address,
+                    socket_options=socket_options,
+                )
+            except httpcore.ConnectError:
+                if index == len(addresses) - 1:
+                    # The host may have moved; resolve again next time
+                    self.cache.forget(host, port)
+                    raise
+        raise httpcore.ConnectError(f"No address found for {host}")
+
+    async def connect_unix_socket(
+        self,
+        path: str,
+        timeout: Optional[float] = None,
+        socket_options: Optional[Iterable[Any]] = None,
+    ) -> httpcore.AsyncNetworkStream:
+        """Connect to a Unix socket, unchanged."""
+        return await self.backend.connect_unix_socket(
+            path, timeout=timeout, socket_options=socket_options
+        )
+
+    async def sleep(self, seconds: float) -> None:
+        """Sleep with the wrapped backend."""
+        await self.backend.sleep(seconds)
+
+
+def network_transport(
+    config: ConnectionWarmingConfig, metrics: Optional[ClientMetrics] = None
+) -> httpx.AsyncHTTPTransport:
+    """Create the pooled network transport, warming-aware if enabled."""
+    if not config.enabled:
+        return httpx.AsyncHTTPTransport()
+    transport = httpx.AsyncHTTPTransport(
+        limits=httpx.Limits(
+            max_connections=100,
+            max_keepalive_connections=max(20, int(config.min_connections)),
+            keepalive_expiry=float(config.keepalive_expiry),
+        )
+    )
+    if not install_dns_cache(transport, DnsCache(config.dns_ttl, metrics)):
+        logger.warning("DNS cache not installed; resolving for every connection")
+    return transport
+
+
+def install_dns_cache(transport: Any, cache: DnsCache) -> bool:
+    """
+    Make the connection pool of an httpx transport resolve through cache.
+
+    httpx has no public hook for the network backend of its pool, so this
+    replaces the `_pool._network_backend` attribute of an
+    `httpx.AsyncHTTPTransport`. That layout is that of the httpx and
+    httpcore versions pinned in pyproject.toml; on any other transport, or
+    if the layout changes, nothing is installed. Returns whether it was.
+    """
+    pool = getattr(transport, "_pool", None)
+    backend = getattr(pool, "_network_backend", None)
+    if backend is None:
+        return False
+    pool._network_backend = DnsCachingBackend(backend, cache)
+    return True
+
+
+class ConnectionWarmer:
+    """Opens and keeps alive a minimum number of pooled connections."""
+
+    def __init__(
+        self,
+        config: ConnectionWarmingConfig,
+        probe: Callable[[], Awaitable[Any]],
+        metrics: ClientMetrics,
+    ) -> None:
+        """
+        Initialize from config.
+
+        Args:
+            config: Warming configuration.
+            probe: Sends one lightweight request through the pool.
+            metrics: Records probes sent and failed.
+        """
+        self.config = config
+        self.enabled = bool(config.enabled)
+        self.probe = probe
+        self.metrics = metrics
+        self._task: Optional[asyncio.Task] = None
+
+    async def warm(self) -> None:
+        """Probe min_connections times at once, opening missing connections."""
+        count = max(1, int(self.config.min_connections))
+        # Probes are charged to the background budget, not to tool calls
+        with request_budget(BACKGROUND):
+            results = await asyncio.gather(
+                *(self.probe() for _ in range(count)), return_exceptions=True
+            )
+        for result in results:
+            if isinstance(result, asyncio.CancelledError):
+                raise result
+            if isinstance(result, Exception):
+                self.metrics.increment("keepalive_probe_errors")
+                logger.debug("Keep-alive probe failed", error=str(result))
+            else:
+                self.metrics.increment("keepalive_probes")
+
+    def start(self, delay: float = 0.0) -> None:
+        """Start warming in delay seconds, if enabled and not running yet."""
+        if not self.enabled or (self._task is not None and not self._task.done()):
+            return
+        self._task = asyncio.ensure_future(self._run(delay))
+
+    async def _run(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+        while True:
+            await self.warm()
+            await asyncio.sleep(float(self.config.keepalive_interval))
+
+    async def stop(self) -> None:
+        """Stop the keep-alive probes."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
@@ -0,0 +1,76 @@
+"""
+Deadlines and per-endpoint request timeouts.
+
+Each request gets the timeout configured for its endpoint (stats and
+summaries are computed on the fly by Wakapi and take longer than user or
+project lookups). An operation such as an MCP tool call can also run under a
+`deadline`: it is kept in a context variable, so it follows the operation
+into every task it starts, and caps each request at the time remaining.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+# Monotonic time at which the current operation's deadline passes
+_deadline: ContextVar[Optional[float]] = ContextVar("wakapi_deadline", default=None)
+
+
+@dataclass
+class TimeoutConfig:
+    """Per-endpoint request timeout configuration data class."""
+
+    # Seconds, for endpoints without their own value
+    default: float = 10.0
+    get_stats: float = 30.0
+    get_summaries: float = 30.0
+    get_all_time_since_today: float = 30.0
+    get_leaders: float = 15.0
+    get_heartbeats: float = 15.0
+    get_user: float = 5.0
+    get_projects: float = 5.0
+    get_project_detail: float = 5.0
+
+    def for_endpoint(self, endpoint: str) -> float:
+        """Return the request timeout of endpoint in seconds."""
+        return float(getattr(self, endpoint, self.default))
+
+
+@dataclass
+class DeadlineConfig:
+    """Tool call deadline configuration data class."""
+
+    # Seconds a multi-request tool call may take; None for no deadline
+    tool_seconds: Optional[float] = None
+
+
+@contextmanager
+def deadline(seconds: Optional[float]) -> Iterator[None]:
+    """
+    Run the enclosed operation with a deadline seconds from now.
+
+    A nested deadline can only shorten the enclosing one. None leaves the
+    current deadline (if any) in place.
+    """
+    if seconds is None:
+        yield
+        return
+    expires = time.monotonic() + float(seconds)
+    current = _deadline.get()
+    if current is not None:
+        expires = min(expires, current)
+    token = _deadline.set(expires)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining_seconds() -> Optional[float]:
+    """Return the seconds left until the current deadline, or None."""
+    expires = _deadline.get()
+    if expires is None:
+        return None
+    return expires - time.monotonic()
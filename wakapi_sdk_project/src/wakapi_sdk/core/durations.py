@@ -0,0 +1,190 @@
+"""
+Durations derived from heartbeats.
+
+Wakapi turns heartbeats into time with its keystroke timeout rule: the time
+between a heartbeat and the next one counts towards the earlier heartbeat,
+but never more than the timeout, and nothing is counted across day
+boundaries. The functions here apply that rule to whole batches at once with
+NumPy, so a month of heartbeats is a handful of array operations rather than
+a Python loop per heartbeat.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timezone, tzinfo
+from typing import Iterable, Optional, Sequence
+
+import numpy as np
+
+# Wakapi's default heartbeat timeout (10 minutes)
+DEFAULT_TIMEOUT_SECONDS = 600.0
+
+GROUP_FIELDS = ("project", "entity", "branch", "language")
+
+SECONDS_PER_DAY = 86400
+
+HOURS_PER_DAY = 24
+
+
+@dataclass
+class GroupDuration:
+    """Time attributed to one value of the grouping field."""
+
+    name: Optional[str]
+    total_seconds: float
+    heartbeats: int
+
+
+def heartbeat_durations(
+    times: np.ndarray,
+    timeout: float = DEFAULT_TIMEOUT_SECONDS,
+    segments: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Return the time each heartbeat contributes.
+
+    Args:
+        times: Heartbeat timestamps in seconds, sorted ascending.
+        timeout: Longest gap counted between two heartbeats.
+        segments: Day (or other segment) id per heartbeat; gaps between
+            heartbeats of different segments count nothing.
+
+    Returns:
+        Array of the same length: min(gap to the next heartbeat, timeout), and
+        0 for the last heartbeat of each segment.
+    """
+    durations = np.zeros(len(times), dtype=np.float64)
+    if len(times) < 2:
+        return durations
+    gaps = np.diff(times)
+    np.minimum(gaps, timeout, out=durations[:-1])
+    if segments is not None:
+        durations[:-1][np.diff(segments) != 0] = 0.0
+    return durations
+
+
+def day_segments(times: np.ndarray, utc_offset_seconds: float = 0.0) -> np.ndarray:
+    """Return the local day number of each timestamp."""
+    return np.floor_divide(times + utc_offset_seconds, SECONDS_PER_DAY).astype(np.int64)
+
+
+def _factorize(values: Sequence[Optional[str]]) -> tuple[np.ndarray, list]:
+    index: dict[Optional[str], int] = {}
+    codes = np.fromiter(
+        (index.setdefault(value, len(index)) for value in values),
+        dtype=np.int64,
+        count=len(values),
+    )
+    return codes, list(index)
+
+
+def group_durations(
+    heartbeats: Sequence,
+    group_by: str = "project",
+    timeout: float = DEFAULT_TIMEOUT_SECONDS,
+    segments: Optional[Sequence[int]] = None,
+    utc_offset_seconds: float = 0.0,
+) -> list[GroupDuration]:
+    """
+    Total the time of heartbeats per value of a field.
+
+    Args:
+        heartbeats: Heartbeat entries in any order.
+        group_by: Field to group by: project, entity, branch or language.
+        timeout: Longest gap counted between two heartbeats.
+        segments: Day id per heartbeat (for example the day it was fetched
+            for); defaults to the day of each timestamp at utc_offset_seconds.
+        utc_offset_seconds: Offset used to derive days when segments is None.
+
+    Returns:
+        Groups sorted by total time, longest first.
+    """
+    if group_by not in GROUP_FIELDS:
+        raise ValueError(
+            f"Cannot group by {group_by!r}; expected one of {', '.join(GROUP_FIELDS)}"
+        )
+    if not heartbeats:
+        return []
+
+    times = np.fromiter(
+        (heartbeat.time for heartbeat in heartbeats),
+        dtype=np.float64,
+        count=len(heartbeats),
+    )
+    order = np.argsort(times, kind="stable")
+    times = times[order]
+    if segments is None:
+        segment_ids = day_segments(times, utc_offset_seconds)
+    else:
+        segment_ids = np.asarray(segments, dtype=np.int64)[order]
+
+    durations = heartbeat_durations(times, timeout, segment_ids)
+    codes, names = _factorize([getattr(heartbeats[i], group_by) for i in order])
+    totals = np.bincount(codes, weights=durations, minlength=len(names))
+    counts = np.bincount(codes, minlength=len(names))
+
+    ranking = np.argsort(-totals, kind="stable")
+    return [
+        GroupDuration(
+            name=names[i], total_seconds=float(totals[i]), heartbeats=int(counts[i])
+        )
+        for i in ranking
+    ]
+
+
+def merge_group_durations(groups: Iterable[GroupDuration]) -> list[GroupDuration]:
+    """Sum groups of the same name (e.g. from separate days), longest first."""
+    merged: dict[Optional[str], GroupDuration] = {}
+    for group in groups:
+        total = merged.get(group.name)
+        if total is None:
+            merged[group.name] = GroupDuration(
+                group.name, group.total_seconds, group.heartbeats
+            )
+        else:
+            total.total_seconds += group.total_seconds
+            total.heartbeats += group.heartbeats
+    return sorted(merged.values(), key=lambda group: -group.total_seconds)
+
+
+def _utc_offsets(times: np.ndarray, tz: tzinfo) -> np.ndarray:
+    def offset(timestamp: float) -> float:
+        moment = datetime.fromtimestamp(timestamp, tz)
+        return moment.utcoffset().total_seconds()
+
+    first, last = offset(times[0]), offset(times[-1])
+    if first == last:
+        return np.full(len(times), first)
+    # The range crosses a DST change; resolve each heartbeat
+    return np.fromiter((offset(t) for t in times), dtype=np.float64, count=len(times))
+
+
+def hourly_durations(
+    heartbeats: Sequence,
+    timeout: float = DEFAULT_TIMEOUT_SECONDS,
+    tz: tzinfo = timezone.utc,
+) -> np.ndarray:
+    """
+    Total the time of one day's heartbeats per local hour.
+
+    Args:
+        heartbeats: Heartbeat entries of a single day, in any order.
+        timeout: Longest gap counted between two heartbeats.
+        tz: Timezone the hours are taken in.
+
+    Returns:
+        Array of 24 seconds totals; each gap counts towards the hour of the
+        heartbeat it follows.
+    """
+    if not heartbeats:
+        return np.zeros(HOURS_PER_DAY)
+    times = np.sort(
+        np.fromiter(
+            (heartbeat.time for heartbeat in heartbeats),
+            dtype=np.float64,
+            count=len(heartbeats),
+        )
+    )
+    durations = heartbeat_durations(times, timeout)
+    local = times + _utc_offsets(times, tz)
+    hours = (np.floor_divide(local, 3600) % HOURS_PER_DAY).astype(np.int64)
+    return np.bincount(hours, weights=durations, minlength=HOURS_PER_DAY)
@@ -169,3 +169,16 @@ class PermissionError(WakapiError):
             http_status=403,
             details=super_details,
         )
+
+
+class DeadlineExceededError(WakapiError):
+    """The deadline of the current operation passed before a request finished."""
+
+    def __init__(self, message: str, details: Optional[dict[str, Any]] = None) -> None:
+        """Initialize the DeadlineExceededError."""
+        super().__init__(
+            message=message,
+            error_code=ErrorCode.NETWORK,
+            http_status=504,
+            details=details,
+        )
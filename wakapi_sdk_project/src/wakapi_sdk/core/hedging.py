@@ -0,0 +1,169 @@
+"""
+Hedged requests against slow Wakapi replicas.
+
+When Wakapi runs behind a load balancer, an occasional slow replica sets the
+tail latency. A hedged request sends a duplicate of a GET that has not
+answered within the `percentile` latency of its endpoint, takes whichever
+response arrives first and cancels the other. Only reads are hedged, so a
+duplicate has no side effect.
+
+Duplicates are paid from a budget: every request earns `budget_ratio` of a
+hedge, up to `budget_burst`, so hedging adds at most that fraction of
+upstream requests however slow Wakapi gets. A duplicate also needs a free
+client-side request slot; it is skipped rather than waited for.
+"""
+
+import asyncio
+import time
+from contextlib import AsyncExitStack
+from dataclasses import dataclass
+from typing import AsyncContextManager, Awaitable, Callable, Optional, TypeVar
+
+from .exceptions import ConfigurationError
+from .metrics import ClientMetrics
+
+R = TypeVar("R")
+
+
+@dataclass
+class HedgingConfig:
+    """Request hedging configuration data class."""
+
+    enabled: bool = False
+    # Latency percentile of an endpoint after which a duplicate is sent
+    percentile: float = 95.0
+    # Requests measured before an endpoint is hedged
+    min_samples: int = 20
+    # Lower bound of the hedge delay in seconds
+    min_delay: float = 0.01
+    # Hedges earned per request, and the most that can be saved up
+    budget_ratio: float = 0.05
+    budget_burst: float = 10.0
+
+    def __post_init__(self):
+        """Validate configuration."""
+        if not 0 < float(self.percentile) <= 100:
+            raise ConfigurationError(
+                "percentile must be in (0, 100]",
+                details={"percentile": self.percentile},
+            )
+        if float(self.budget_ratio) < 0:
+            raise ConfigurationError(
+                "budget_ratio must not be negative",
+                details={"budget_ratio": self.budget_ratio},
+            )
+
+
+class HedgeBudget:
+    """Hedges earned as a fraction of the requests sent."""
+
+    def __init__(self, ratio: float, burst: float) -> None:
+        """Initialize an empty budget."""
+        self.ratio = float(ratio)
+        self.burst = max(1.0, float(burst))
+        self.tokens = 0.0
+
+    def record_request(self) -> None:
+        """Earn the share of a hedge one request pays for."""
+        self.tokens = min(self.burst, self.tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        """Take one hedge if the budget allows it."""
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+    def refund(self) -> None:
+        """Return a hedge that was spent but could not be sent."""
+        self.tokens = min(self.burst, self.tokens + 1)
+
+
+class Hedger:
+    """Sends hedged requests, with delays calibrated from client metrics."""
+
+    def __init__(self, config: HedgingConfig, metrics: ClientMetrics) -> None:
+        """Initialize from config, reading latencies from metrics."""
+        self.config = config
+        self.enabled = bool(config.enabled)
+        self.metrics = metrics
+        self.budget = HedgeBudget(config.budget_ratio, config.budget_burst)
+
+    def delay(self, endpoint: str) -> Optional[float]:
+        """Seconds to wait before hedging a request to endpoint, or None."""
+        if not self.enabled:
+            return None
+        samples = self.metrics.samples("request_seconds", endpoint=endpoint)
+        if len(samples) < int(self.config.min_samples):
+            return None
+        return max(
+            float(self.config.min_delay),
+            self.metrics.percentile(
+                "request_seconds", float(self.config.percentile), endpoint=endpoint
+            ),
+        )
+
+    async def send(
+        self,
+        endpoint: str,
+        request: Callable[[], Awaitable[R]],
+        try_slot: Optional[Callable[[], AsyncContextManager[bool]]] = None,
+    ) -> R:
+        """
+        Await request(), hedging it with a second call if it is slow.
+
+        The first call to finish successfully wins; the other is cancelled.
+        If both fail, the error of the first call is raised.
+
+        Args:
+            endpoint: Endpoint name, used to calibrate the delay and as the
+                metrics label.
+            request: Sends the request; called once more for the hedge.
+            try_slot: Context manager factory yielding whether a request slot
+                is free right now; held while the hedge is in flight.
+        """
+        delay = self.delay(endpoint)
+        if delay is None:
+            return await request()
+        self.budget.record_request()
+        primary = asyncio.ensure_future(request())
+        tasks = {primary}
+        slot = AsyncExitStack()
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done or not self.budget.try_spend():
+                return await primary
+            if try_slot is not None and not await slot.enter_async_context(try_slot()):
+                self.budget.refund()
+                self.metrics.increment("hedges_skipped", endpoint=endpoint)
+                return await primary
+            self.metrics.increment("hedged_requests", endpoint=endpoint)
+            hedge = asyncio.ensure_future(self._timed(endpoint, request))
+            tasks.add(hedge)
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.metrics.increment("hedge_wins", endpoint=endpoint)
+                        return task.result()
+            return primary.result()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await slot.aclose()
+
+    async def _timed(self, endpoint: str, request: Callable[[], Awaitable[R]]) -> R:
+        # The hedge is an upstream request of its own
+        started = time.perf_counter()
+        try:
+            return await request()
+        finally:
+            self.metrics.increment("requests", endpoint=endpoint)
+            self.metrics.observe(
+                "request_seconds", time.perf_counter() - started, endpoint=endpoint
+            )
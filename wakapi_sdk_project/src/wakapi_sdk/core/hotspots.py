@@ -0,0 +1,169 @@
+"""
+File hot-spot ranking.
+
+`HotspotCounter` streams time-sorted heartbeats and keeps one small record per
+file: time spent (Wakapi's keystroke timeout rule), heartbeats, writes and
+lines added and deleted. Memory grows with the number of distinct files, not
+heartbeats, and the top files are taken with a bounded heap. `PathTrie` rolls
+the per-file records up into directories.
+"""
+
+import heapq
+from dataclasses import dataclass, field
+
+from .durations import DEFAULT_TIMEOUT_SECONDS
+
+SORT_KEYS = ("seconds", "writes", "lines_changed", "heartbeats")
+
+
+@dataclass
+class FileActivity:
+    """Activity on one file or directory."""
+
+    path: str
+    seconds: float = 0.0
+    heartbeats: int = 0
+    writes: int = 0
+    line_additions: int = 0
+    line_deletions: int = 0
+
+    @property
+    def lines_changed(self) -> int:
+        """Lines added plus lines deleted."""
+        return self.line_additions + self.line_deletions
+
+    def add(self, other: "FileActivity") -> None:
+        """Add the counts of other to this record."""
+        self.seconds += other.seconds
+        self.heartbeats += other.heartbeats
+        self.writes += other.writes
+        self.line_additions += other.line_additions
+        self.line_deletions += other.line_deletions
+
+
+def top_activities(
+    activities, limit: int, sort_by: str = "seconds"
+) -> list[FileActivity]:
+    """Return the limit largest activities by sort_by."""
+    if sort_by not in SORT_KEYS:
+        raise ValueError(
+            f"Cannot sort by {sort_by!r}; expected one of {', '.join(SORT_KEYS)}"
+        )
+    return heapq.nlargest(
+        limit, activities, key=lambda activity: getattr(activity, sort_by)
+    )
+
+
+class HotspotCounter:
+    """Per-file activity over a stream of time-sorted heartbeats."""
+
+    def __init__(self, timeout: float = DEFAULT_TIMEOUT_SECONDS) -> None:
+        """Initialize an empty counter using the given keystroke timeout."""
+        self.timeout = timeout
+        self.files: dict[str, FileActivity] = {}
+        self._last = None
+
+    def feed(self, heartbeat) -> None:
+        """Count the next heartbeat."""
+        if self._last is not None:
+            gap = heartbeat.time - self._last.time
+            if gap < 0:
+                raise ValueError("Heartbeats must be fed in time order")
+            self.files[self._last.entity].seconds += min(gap, self.timeout)
+        activity = self.files.get(heartbeat.entity)
+        if activity is None:
+            activity = self.files[heartbeat.entity] = FileActivity(heartbeat.entity)
+        activity.heartbeats += 1
+        if heartbeat.is_write:
+            activity.writes += 1
+        activity.line_additions += heartbeat.line_additions or 0
+        activity.line_deletions += heartbeat.line_deletions or 0
+        self._last = heartbeat
+
+    def end_segment(self) -> None:
+        """End a day; no time is counted across the boundary."""
+        self._last = None
+
+    def top(self, limit: int, sort_by: str = "seconds") -> list[FileActivity]:
+        """Return the limit most active files."""
+        return top_activities(self.files.values(), limit, sort_by)
+
+
+@dataclass
+class _Node:
+    activity: FileActivity
+    children: dict[str, "_Node"] = field(default_factory=dict)
+
+
+class PathTrie:
+    """Trie of path components aggregating activity at every directory."""
+
+    def __init__(self) -> None:
+        """Initialize an empty trie."""
+        self.root = _Node(FileActivity(""))
+
+    @staticmethod
+    def split(path: str) -> list[str]:
+        """Split a file path into components."""
+        return [part for part in path.replace("\\", "/").split("/") if part]
+
+    def insert(self, activity: FileActivity) -> None:
+        """Add a file's activity to each of its directories."""
+        node = self.root
+        node.activity.add(activity)
+        prefix = "/" if activity.path.startswith("/") else ""
+        for part in self.split(activity.path)[:-1]:
+            prefix = f"{prefix}{part}/"
+            child = node.children.get(part)
+            if child is None:
+                child = node.children[part] = _Node(FileActivity(prefix))
+            child.activity.add(activity)
+            node = child
+
+    def _common_root(self) -> _Node:
+        node = self.root
+        # Skip the directories every file shares (home, checkout path, ...)
+        while len(node.children) == 1:
+            (child,) = node.children.values()
+            if child.activity.heartbeats != node.activity.heartbeats:
+                break
+            node = child
+        return node
+
+    def directories(self, depth: int) -> list[FileActivity]:
+        """
+        Return directories depth levels below the common root.
+
+        Files in shallower directories are reported under their own
+        directory, so the totals always add up.
+        """
+        result = []
+
+        def visit(node: _Node, level: int) -> None:
+            if level >= depth or not node.children:
+                result.append(node.activity)
+                return
+            direct = FileActivity(node.activity.path)
+            direct.add(node.activity)
+            for child in node.children.values():
+                visit(child, level + 1)
+                direct.seconds -= child.activity.seconds
+                direct.heartbeats -= child.activity.heartbeats
+                direct.writes -= child.activity.writes
+                direct.line_additions -= child.activity.line_additions
+                direct.line_deletions -= child.activity.line_deletions
+            if direct.heartbeats:
+                result.append(direct)
+
+        visit(self._common_root(), 0)
+        return result
+
+
+def rollup_directories(
+    files: dict[str, FileActivity], depth: int, limit: int, sort_by: str = "seconds"
+) -> list[FileActivity]:
+    """Return the limit most active directories at depth."""
+    trie = PathTrie()
+    for activity in files.values():
+        trie.insert(activity)
+    return top_activities(trie.directories(max(0, depth)), limit, sort_by)
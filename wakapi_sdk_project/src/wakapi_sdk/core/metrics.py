@@ -0,0 +1,107 @@
+"""In-process metrics registry for the Wakapi client."""
+
+import math
+from collections import defaultdict, deque
+from typing import Any
+
+# Number of samples kept per timing series for percentile estimation
+DEFAULT_SAMPLE_WINDOW = 1024
+
+
+def _series_key(name: str, labels: dict[str, Any]) -> str:
+    """Build a Prometheus-style series key such as `name{endpoint=get_stats}`."""
+    if not labels:
+        return name
+    rendered = ",".join(f"{key}={labels[key]}" for key in sorted(labels))
+    return f"{name}{{{rendered}}}"
+
+
+def percentile(samples: list[float], q: float) -> float:
+    """
+    Return the q-th percentile (0-100) of samples using nearest-rank.
+
+    Args:
+        samples: Observed values.
+        q: Percentile to compute.
+
+    Returns:
+        Percentile value, or 0.0 when there are no samples.
+    """
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class ClientMetrics:
+    """Counters, gauges and timing samples recorded by WakapiClient."""
+
+    def __init__(self, sample_window: int = DEFAULT_SAMPLE_WINDOW) -> None:
+        """Initialize an empty registry."""
+        self._sample_window = sample_window
+        self._counters: dict[str, float] = defaultdict(float)
+        self._gauges: dict[str, float] = {}
+        self._samples: dict[str, deque] = {}
+        self._sample_counts: dict[str, int] = defaultdict(int)
+        self._sample_sums: dict[str, float] = defaultdict(float)
+
+    def increment(self, name: str, value: float = 1.0, **labels: Any) -> None:
+        """Increase a counter."""
+        self._counters[_series_key(name, labels)] += value
+
+    def set_gauge(self, name: str, value: float, **labels: Any) -> None:
+        """Set a gauge to an absolute value."""
+        self._gauges[_series_key(name, labels)] = value
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        """Record a timing or size sample."""
+        key = _series_key(name, labels)
+        if key not in self._samples:
+            self._samples[key] = deque(maxlen=self._sample_window)
+        self._samples[key].append(value)
+        self._sample_counts[key] += 1
+        self._sample_sums[key] += value
+
+    def counter(self, name: str, **labels: Any) -> float:
+        """Return the current value of a counter."""
+        return self._counters.get(_series_key(name, labels), 0.0)
+
+    def gauge(self, name: str, **labels: Any) -> float:
+        """Return the current value of a gauge."""
+        return self._gauges.get(_series_key(name, labels), 0.0)
+
+    def samples(self, name: str, **labels: Any) -> list[float]:
+        """Return the retained samples of a series."""
+        return list(self._samples.get(_series_key(name, labels), ()))
+
+    def percentile(self, name: str, q: float, **labels: Any) -> float:
+        """Return the q-th percentile of a series."""
+        return percentile(self.samples(name, **labels), q)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return all metrics as a JSON-serializable dictionary."""
+        summaries = {}
+        for key, window in self._samples.items():
+            values = list(window)
+            summaries[key] = {
+                "count": self._sample_counts[key],
+                "sum": self._sample_sums[key],
+                "p50": percentile(values, 50),
+                "p95": percentile(values, 95),
+                "p99": percentile(values, 99),
+                "max": max(values) if values else 0.0,
+            }
+        return {
+            "counters": dict(self._counters),
+            "gauges": dict(self._gauges),
+            "samples": summaries,
+        }
+
+    def reset(self) -> None:
+        """Drop every recorded value."""
+        self._counters.clear()
+        self._gauges.clear()
+        self._samples.clear()
+        self._sample_counts.clear()
+        self._sample_sums.clear()
@@ -0,0 +1,192 @@
+"""
+Query planning across Wakapi data sources.
+
+The same "how much time went where" question can be answered from several
+sources at very different cost: local rollups (free once synced), one stats
+request (fixed ranges only), one summaries request, or one heartbeats
+request per day. `QueryPlanner` picks the cheapest source able to answer a
+query, using a `CostModel` whose per-request latencies start from defaults
+and are calibrated from the client metrics as requests are made.
+"""
+
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Optional
+
+from .metrics import ClientMetrics
+
+LOCAL_ROLLUPS = "local_rollups"
+STATS = "stats"
+SUMMARIES = "summaries"
+HEARTBEATS = "heartbeats"
+
+# Filters each upstream endpoint accepts
+SUMMARY_FILTERS = frozenset(
+    {"project", "language", "editor", "operating_system", "machine", "label"}
+)
+HEARTBEAT_FILTERS = frozenset({"project", "language", "branch", "entity"})
+
+# Endpoint per source, as labelled in the client metrics
+SOURCE_ENDPOINTS = {
+    STATS: "get_stats",
+    SUMMARIES: "get_summaries",
+    HEARTBEATS: "get_heartbeats",
+}
+
+# Median request latencies assumed until enough requests were measured
+DEFAULT_REQUEST_SECONDS = {
+    "get_stats": 0.3,
+    "get_summaries": 0.3,
+    "get_heartbeats": 0.2,
+}
+
+# Client metrics summed into the cost of one request
+CALIBRATION_SERIES = ("request_seconds", "json_decode_seconds", "validate_seconds")
+
+# Requests measured before an endpoint's latency replaces the default
+MIN_CALIBRATION_SAMPLES = 5
+
+
+@dataclass
+class Query:
+    """A time-per-dimension question over a date range."""
+
+    start: date
+    end: date
+    today: date
+    filters: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def days(self) -> int:
+        """Number of days in the range."""
+        return (self.end - self.start).days + 1
+
+
+@dataclass
+class Plan:
+    """The chosen source and the estimated cost of every candidate."""
+
+    source: str
+    estimated_seconds: float
+    upstream_requests: int
+    stats_range: Optional[str] = None
+    candidates: dict[str, float] = field(default_factory=dict)
+
+    def as_metadata(self) -> dict:
+        """Describe the decision for response metadata."""
+        return {
+            "source": self.source,
+            "estimated_seconds": round(self.estimated_seconds, 4),
+            "upstream_requests": self.upstream_requests,
+            "candidates": {
+                name: round(cost, 4) for name, cost in self.candidates.items()
+            },
+        }
+
+
+def fixed_stats_range(start: date, end: date, today: date) -> Optional[str]:
+    """Return the stats range identifier covering exactly start..end, if any."""
+    if end == today:
+        if start == today:
+            return "today"
+        for days, name in ((7, "last_7_days"), (30, "last_30_days")):
+            if start == today - timedelta(days=days - 1):
+                return name
+    yesterday = today - timedelta(days=1)
+    if start == end == yesterday:
+        return "yesterday"
+    return None
+
+
+class CostModel:
+    """Estimated request latencies, calibrated from client metrics."""
+
+    def __init__(self, metrics: Optional[ClientMetrics] = None) -> None:
+        """Initialize with default latencies, calibrating from metrics if given."""
+        self.request_seconds = dict(DEFAULT_REQUEST_SECONDS)
+        # Reading a few dozen rollup rows from SQLite
+        self.local_seconds = 0.002
+        if metrics is not None:
+            self.calibrate(metrics)
+
+    def calibrate(self, metrics: ClientMetrics) -> None:
+        """Replace defaults with measured median latencies where available."""
+        for endpoint in DEFAULT_REQUEST_SECONDS:
+            samples = metrics.samples("request_seconds", endpoint=endpoint)
+            if len(samples) < MIN_CALIBRATION_SAMPLES:
+                continue
+            # Decoding and validating a response costs as much as fetching it
+            # for large bodies such as a day of heartbeats
+            self.request_seconds[endpoint] = sum(
+                metrics.percentile(name, 50, endpoint=endpoint)
+                for name in CALIBRATION_SERIES
+                if metrics.samples(name, endpoint=endpoint)
+            )
+
+    def source_cost(self, source: str, requests: int) -> float:
+        """Estimated seconds for requests sequential requests of a source."""
+        if source == LOCAL_ROLLUPS:
+            return self.local_seconds
+        return self.request_seconds[SOURCE_ENDPOINTS[source]] * requests
+
+
+class QueryPlanner:
+    """Chooses the cheapest source able to answer a query."""
+
+    def __init__(self, cost_model: Optional[CostModel] = None) -> None:
+        """Initialize with a cost model (defaults when omitted)."""
+        self.cost_model = cost_model or CostModel()
+
+    def plan(self, query: Query, missing_local_days: int) -> Plan:
+        """
+        Plan query.
+
+        Args:
+            query: The question.
+            missing_local_days: Days of the range not in the local rollups.
+
+        Returns:
+            The cheapest plan; ties go to the source listed first: local
+            rollups, stats, summaries, heartbeats.
+        """
+        filters = set(query.filters)
+        candidates: dict[str, tuple[float, int]] = {}
+
+        if not filters:
+            # Missing days are synced with one summaries request, which
+            # dominates reading the stored rows
+            if missing_local_days:
+                candidates[LOCAL_ROLLUPS] = (
+                    self.cost_model.source_cost(SUMMARIES, 1),
+                    1,
+                )
+            else:
+                candidates[LOCAL_ROLLUPS] = (
+                    self.cost_model.source_cost(LOCAL_ROLLUPS, 0),
+                    0,
+                )
+
+        stats_range = fixed_stats_range(query.start, query.end, query.today)
+        if stats_range and filters <= SUMMARY_FILTERS:
+            candidates[STATS] = (self.cost_model.source_cost(STATS, 1), 1)
+        if filters <= SUMMARY_FILTERS:
+            candidates[SUMMARIES] = (self.cost_model.source_cost(SUMMARIES, 1), 1)
+        if filters <= HEARTBEAT_FILTERS:
+            candidates[HEARTBEATS] = (
+                self.cost_model.source_cost(HEARTBEATS, query.days),
+                query.days,
+            )
+        if not candidates:
+            raise ValueError(
+                "No source supports filtering by " + ", ".join(sorted(filters))
+            )
+
+        source = min(candidates, key=lambda name: candidates[name][0])
+        cost, requests = candidates[source]
+        return Plan(
+            source=source,
+            estimated_seconds=cost,
+            upstream_requests=requests,
+            stats_range=stats_range if source == STATS else None,
+            candidates={name: value[0] for name, value in candidates.items()},
+        )
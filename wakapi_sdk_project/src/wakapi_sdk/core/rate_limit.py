@@ -0,0 +1,194 @@
+"""
+Client-side rate limiting for requests sent to Wakapi.
+
+Each request is charged against a named budget. Interactive tool calls use
+the "interactive" budget; background work, such as the connection warmer's
+keep-alive probes, wraps its calls in `request_budget(BACKGROUND)` so it cannot
+starve tool calls.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Iterator, Optional
+
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+
+_current_budget: ContextVar[str] = ContextVar(
+    "wakapi_request_budget", default=INTERACTIVE
+)
+
+
+def current_budget() -> str:
+    """Return the budget requests in the current context are charged to."""
+    return _current_budget.get()
+
+
+@contextmanager
+def request_budget(name: str) -> Iterator[None]:
+    """Charge requests issued inside the block to the given budget."""
+    token = _current_budget.set(name)
+    try:
+        yield
+    finally:
+        _current_budget.reset(token)
+
+
+@dataclass
+class RateLimitConfig:
+    """Rate limit configuration data class. None disables a limit."""
+
+    requests_per_second: Optional[float] = None
+    burst: Optional[int] = None
+    max_concurrency: Optional[int] = None
+    background_requests_per_second: Optional[float] = None
+    background_max_concurrency: Optional[int] = None
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at a fixed rate."""
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize a full bucket."""
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity else max(1.0, rate)
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        elapsed = now - self._updated
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> float:
+        """
+        Take one token, sleeping until one is available.
+
+        Returns:
+            Seconds spent waiting.
+        """
+        async with self._lock:
+            self._refill()
+            waited = 0.0
+            if self._tokens < 1.0:
+                waited = (1.0 - self._tokens) / self.rate
+                await asyncio.sleep(waited)
+                self._refill()
+            self._tokens -= 1.0
+            return waited
+
+    def try_acquire(self) -> bool:
+        """Take one token if one is available right now, without waiting."""
+        if self._lock.locked():
+            # A waiting acquire() has first claim on the next token
+            return False
+        self._refill()
+        if self._tokens < 1.0:
+            return False
+        self._tokens -= 1.0
+        return True
+
+
+class _Budget:
+    """Request rate and concurrency limits for one budget."""
+
+    def __init__(
+        self,
+        requests_per_second: Optional[float],
+        burst: Optional[int],
+        max_concurrency: Optional[int],
+    ) -> None:
+        self.bucket = (
+            TokenBucket(float(requests_per_second), float(burst) if burst else None)
+            if requests_per_second
+            else None
+        )
+        self.semaphore = (
+            asyncio.Semaphore(int(max_concurrency)) if max_concurrency else None
+        )
+
+
+class RateLimiter:
+    """Token-bucket and concurrency limiter with separate request budgets."""
+
+    def __init__(self, config: Optional[RateLimitConfig] = None) -> None:
+        """Initialize the limiter from config."""
+        self.config = config or RateLimitConfig()
+        self._budgets = {
+            INTERACTIVE: _Budget(
+                self.config.requests_per_second,
+                self.config.burst,
+                self.config.max_concurrency,
+            ),
+            BACKGROUND: _Budget(
+                self.config.background_requests_per_second,
+                self.config.burst,
+                self.config.background_max_concurrency,
+            ),
+        }
+
+    def _limits(self, budget: Optional[str]) -> _Budget:
+        name = budget or current_budget()
+        limits = self._budgets.get(name)
+        if limits is None:
+            raise ValueError(f"Unknown request budget: {name}")
+        return limits
+
+    @asynccontextmanager
+    async def slot(self, budget: Optional[str] = None) -> AsyncIterator[float]:
+        """
+        Hold a request slot of the given budget for the duration of the block.
+
+        Args:
+            budget: Budget name (defaults to the current context budget).
+
+        Yields:
+            Seconds spent waiting for the slot.
+        """
+        limits = self._limits(budget)
+        started = time.perf_counter()
+        if limits.semaphore is not None:
+            await limits.semaphore.acquire()
+        try:
+            if limits.bucket is not None:
+                await limits.bucket.acquire()
+            yield time.perf_counter() - started
+        finally:
+            if limits.semaphore is not None:
+                limits.semaphore.release()
+
+    @asynccontextmanager
+    async def try_slot(self, budget: Optional[str] = None) -> AsyncIterator[bool]:
+        """
+        Hold a request slot of the given budget if one is free right now.
+
+        Args:
+            budget: Budget name (defaults to the current context budget).
+
+        Yields:
+            Whether a slot is held; False when it would have to be waited for.
+        """
+        limits = self._limits(budget)
+        if limits.semaphore is not None:
+            if limits.semaphore.locked():
+                yield False
+                return
+            await limits.semaphore.acquire()
+        try:
+            yield limits.bucket is None or limits.bucket.try_acquire()
+        finally:
+            if limits.semaphore is not None:
+                limits.semaphore.release()
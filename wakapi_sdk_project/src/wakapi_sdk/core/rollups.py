@@ -0,0 +1,96 @@
+"""
+Stats rollups from Wakapi summaries.
+
+Daily summaries are reduced to `{dimension: {name: seconds}}` totals, the
+shape the local store keeps per day, week and month. Summed totals of any
+range are rendered back into the fields of a `StatsData`.
+"""
+
+from typing import Any
+
+STATS_DIMENSIONS = (
+    "projects",
+    "languages",
+    "editors",
+    "operating_systems",
+    "machines",
+    "branches",
+    "categories",
+)
+
+Totals = dict[str, dict[str, float]]
+
+
+def summary_totals(summary) -> Totals:
+    """Return the seconds per dimension value of one daily summary (or stats)."""
+    return {
+        dimension: {
+            entry.name: entry.total_seconds
+            for entry in getattr(summary, dimension) or []
+        }
+        for dimension in STATS_DIMENSIONS
+    }
+
+
+def merge_totals(target: Totals, other: Totals) -> Totals:
+    """Add other into target and return target."""
+    for dimension, names in other.items():
+        merged = target.setdefault(dimension, {})
+        for name, seconds in names.items():
+            merged[name] = merged.get(name, 0.0) + seconds
+    return target
+
+
+def human_readable(seconds: float) -> str:
+    """Format seconds as hours and minutes, e.g. `1h 5m`."""
+    minutes = int(seconds // 60)
+    return f"{minutes // 60}h {minutes % 60}m"
+
+
+def summaries_entry(name: str, seconds: float, total: float) -> dict[str, Any]:
+    """Build a `SummariesEntry` for name."""
+    hours, minutes = int(seconds // 3600), int(seconds % 3600 // 60)
+    return {
+        "name": name,
+        "percent": round(seconds / total * 100, 2) if total else 0.0,
+        "total_seconds": seconds,
+        "text": human_readable(seconds),
+        "digital": f"{hours}:{minutes:02d}",
+        "hours": hours,
+        "minutes": minutes,
+        "seconds": int(seconds % 60),
+    }
+
+
+def stats_data(
+    totals: Totals, start: str, end: str, days: int, user: str
+) -> dict[str, Any]:
+    """Render totals of a date range as the fields of a `StatsData`."""
+    # Every second is attributed to exactly one project
+    total = sum(totals.get("projects", {}).values())
+    average = total / days if days else 0.0
+    data: dict[str, Any] = {
+        "total_seconds": total,
+        "human_readable_total": human_readable(total),
+        "daily_average": average,
+        "human_readable_daily_average": human_readable(average),
+        "range": "custom",
+        "human_readable_range": f"{start} - {end}",
+        "start": start,
+        "end": end,
+        "status": "ok",
+        "is_coding_activity_visible": True,
+        "is_other_usage_visible": True,
+        "days_including_holidays": days,
+        "user_id": user,
+        "username": user,
+    }
+    for dimension in STATS_DIMENSIONS:
+        names = totals.get(dimension, {})
+        data[dimension] = [
+            summaries_entry(name, seconds, total)
+            for name, seconds in sorted(
+                names.items(), key=lambda item: item[1], reverse=True
+            )
+        ]
+    return data
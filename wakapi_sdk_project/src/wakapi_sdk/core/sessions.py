@@ -0,0 +1,100 @@
+"""
+Coding session detection.
+
+A session is a run of heartbeats in which no two consecutive heartbeats are
+further apart than the gap threshold. `SessionDetector` consumes heartbeats
+in time order, one at a time, and hands back each session as soon as a gap
+closes it, so only the open session is ever held in memory.
+"""
+
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator, Optional
+
+# Gap that ends a session when none is configured
+DEFAULT_SESSION_GAP_SECONDS = 15 * 60
+
+
+@dataclass
+class Session:
+    """A closed coding session."""
+
+    start: float
+    end: float
+    heartbeats: int
+    # Seconds per project, language and file; the gap to the next heartbeat
+    # is credited to the earlier one
+    projects: Counter = field(default_factory=Counter)
+    languages: Counter = field(default_factory=Counter)
+    files: Counter = field(default_factory=Counter)
+
+    @property
+    def duration(self) -> float:
+        """Seconds from the first to the last heartbeat."""
+        return self.end - self.start
+
+    @property
+    def dominant_project(self) -> Optional[str]:
+        """Project the most time went to."""
+        if not self.projects:
+            return None
+        return self.projects.most_common(1)[0][0]
+
+
+class SessionDetector:
+    """Streaming session detection over time-sorted heartbeats."""
+
+    def __init__(self, gap: float = DEFAULT_SESSION_GAP_SECONDS) -> None:
+        """Initialize the detector; a gap longer than gap seconds ends a session."""
+        self.gap = gap
+        self._session: Optional[Session] = None
+        self._last = None
+
+    def feed(self, heartbeat) -> Optional[Session]:
+        """Add the next heartbeat; returns the session it closed, if any."""
+        closed = None
+        session = self._session
+        if session is not None:
+            elapsed = heartbeat.time - session.end
+            if elapsed < 0:
+                raise ValueError("Heartbeats must be fed in time order")
+            if elapsed > self.gap:
+                closed = session
+                session = None
+            else:
+                self._credit(session, self._last, elapsed)
+                session.end = heartbeat.time
+                session.heartbeats += 1
+        if session is None:
+            session = Session(start=heartbeat.time, end=heartbeat.time, heartbeats=1)
+        # Its time is only known once the next heartbeat arrives, but the
+        # heartbeat's project, language and file were touched either way
+        self._credit(session, heartbeat, 0.0)
+        self._session = session
+        self._last = heartbeat
+        return closed
+
+    def close(self) -> Optional[Session]:
+        """Close and return the open session, if any."""
+        session, self._session, self._last = self._session, None, None
+        return session
+
+    @staticmethod
+    def _credit(session: Session, heartbeat, seconds: float) -> None:
+        session.projects[heartbeat.project] += seconds
+        session.languages[heartbeat.language] += seconds
+        session.files[heartbeat.entity] += seconds
+
+
+def detect_sessions(
+    heartbeats: Iterable, gap: float = DEFAULT_SESSION_GAP_SECONDS
+) -> Iterator[Session]:
+    """Yield the sessions of time-sorted heartbeats as they close."""
+    detector = SessionDetector(gap)
+    for heartbeat in heartbeats:
+        session = detector.feed(heartbeat)
+        if session is not None:
+            yield session
+    session = detector.close()
+    if session is not None:
+        yield session
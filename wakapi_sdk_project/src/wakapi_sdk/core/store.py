@@ -0,0 +1,308 @@
+"""
+Local SQLite store for data derived from Wakapi.
+
+Analytics tools cache per-day rollups here so repeated questions over
+overlapping ranges only compute the days not seen before. Rollups are keyed
+by a scope string describing everything that affects them (user, filters,
+timeout, timezone), so differently configured queries never share rows.
+Only complete days should be saved; the current day is still changing.
+
+Stats rollups (seconds per project, language, editor, ...) are stored per day
+and summed into week and month rows whenever days are saved, so any date
+range is answered from a few dozen rows: whole months, then whole weeks,
+then single days.
+"""
+
+import calendar
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Iterable, Optional, Sequence
+
+HOURS_PER_DAY = 24
+
+DAY = "day"
+WEEK = "week"
+MONTH = "month"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS hourly_rollups (
+    scope TEXT NOT NULL,
+    day TEXT NOT NULL,
+    hour INTEGER NOT NULL,
+    seconds REAL NOT NULL,
+    PRIMARY KEY (scope, day, hour)
+);
+CREATE TABLE IF NOT EXISTS sketches (
+    scope TEXT NOT NULL,
+    day TEXT NOT NULL,
+    name TEXT NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (scope, day, name)
+);
+CREATE TABLE IF NOT EXISTS stats_rollups (
+    period TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    start TEXT NOT NULL,
+    dimension TEXT NOT NULL,
+    name TEXT NOT NULL,
+    seconds REAL NOT NULL,
+    PRIMARY KEY (period, scope, start, dimension, name)
+);
+CREATE TABLE IF NOT EXISTS stats_periods (
+    period TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    start TEXT NOT NULL,
+    days INTEGER NOT NULL,
+    PRIMARY KEY (period, scope, start)
+);
+CREATE TABLE IF NOT EXISTS rollup_days (
+    kind TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    day TEXT NOT NULL,
+    PRIMARY KEY (kind, scope, day)
+);
+"""
+
+
+@dataclass
+class LocalStoreConfig:
+    """Local store configuration data class."""
+
+    # SQLite database file; None keeps the store in memory for the process
+    path: Optional[str] = None
+
+
+def scope_key(**parts) -> str:
+    """Build a scope string from the parameters a rollup depends on."""
+    return "|".join(
+        f"{name}={'' if value is None else value}"
+        for name, value in sorted(parts.items())
+    )
+
+
+def period_bounds(period: str, day: date) -> tuple[date, date]:
+    """Return the first and last day of the week (Monday first) or month of day."""
+    if period == WEEK:
+        first = day - timedelta(days=day.weekday())
+        return first, first + timedelta(days=6)
+    if period == MONTH:
+        last = calendar.monthrange(day.year, day.month)[1]
+        return day.replace(day=1), day.replace(day=last)
+    return day, day
+
+
+class LocalStore:
+    """SQLite-backed store of per-day rollups."""
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        """Open (and create if needed) the store at path, or in memory."""
+        self.path = ":memory:"
+        if path:
+            location = Path(path).expanduser()
+            location.parent.mkdir(parents=True, exist_ok=True)
+            self.path = str(location)
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._db:
+            self._db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Close the database."""
+        self._db.close()
+
+    def stored_days(self, kind: str, scope: str, days: Iterable[str]) -> set[str]:
+        """Return which of days already have a rollup of kind for scope."""
+        days = list(days)
+        if not days:
+            return set()
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT day FROM rollup_days WHERE kind = ? AND scope = ? "
+                f"AND day IN ({','.join('?' * len(days))})",
+                [kind, scope, *days],
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def hourly_rollups(self, scope: str, days: Iterable[str]) -> dict[str, list[float]]:
+        """Return the stored seconds per hour of each day that has a rollup."""
+        stored = self.stored_days("hourly", scope, days)
+        rollups = {day: [0.0] * HOURS_PER_DAY for day in stored}
+        if not stored:
+            return rollups
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT day, hour, seconds FROM hourly_rollups WHERE scope = ? "
+                f"AND day IN ({','.join('?' * len(stored))})",
+                [scope, *stored],
+            ).fetchall()
+        for day, hour, seconds in rows:
+            rollups[day][hour] = seconds
+        return rollups
+
+    def save_hourly_rollups(
+        self, scope: str, rollups: dict[str, Sequence[float]]
+    ) -> None:
+        """Store seconds per hour for complete days, replacing earlier rows."""
+        with self._lock, self._db:
+            for day, hours in rollups.items():
+                self._db.execute(
+                    "DELETE FROM hourly_rollups WHERE scope = ? AND day = ?",
+                    (scope, day),
+                )
+                self._db.executemany(
+                    "INSERT INTO hourly_rollups VALUES (?, ?, ?, ?)",
+                    [
+                        (scope, day, hour, float(seconds))
+                        for hour, seconds in enumerate(hours)
+                        if seconds
+                    ],
+                )
+                self._db.execute(
+                    "INSERT OR REPLACE INTO rollup_days VALUES ('hourly', ?, ?)",
+                    (scope, day),
+                )
+
+    def sketches(self, scope: str, days: Iterable[str]) -> dict[str, dict[str, bytes]]:
+        """Return the stored sketch blobs of each day that has them."""
+        stored = self.stored_days("sketch", scope, days)
+        blobs: dict[str, dict[str, bytes]] = {day: {} for day in stored}
+        if not stored:
+            return blobs
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT day, name, data FROM sketches WHERE scope = ? "
+                f"AND day IN ({','.join('?' * len(stored))})",
+                [scope, *stored],
+            ).fetchall()
+        for day, name, data in rows:
+            blobs[day][name] = data
+        return blobs
+
+    def save_sketches(self, scope: str, sketches: dict[str, dict[str, bytes]]) -> None:
+        """Store named sketch blobs for complete days, replacing earlier ones."""
+        with self._lock, self._db:
+            for day, blobs in sketches.items():
+                self._db.execute(
+                    "DELETE FROM sketches WHERE scope = ? AND day = ?", (scope, day)
+                )
+                self._db.executemany(
+                    "INSERT INTO sketches VALUES (?, ?, ?, ?)",
+                    [(scope, day, name, data) for name, data in blobs.items()],
+                )
+                self._db.execute(
+                    "INSERT OR REPLACE INTO rollup_days VALUES ('sketch', ?, ?)",
+                    (scope, day),
+                )
+
+    def save_stats_rollups(
+        self, scope: str, rollups: dict[str, dict[str, dict[str, float]]]
+    ) -> None:
+        """
+        Store seconds per dimension value for complete days.
+
+        rollups maps days (YYYY-MM-DD) to `{dimension: {name: seconds}}`.
+        The week and month rows containing those days are rebuilt.
+        """
+        periods = set()
+        with self._lock, self._db:
+            for day, dimensions in rollups.items():
+                self._db.execute(
+                    "DELETE FROM stats_rollups WHERE period = ? AND scope = ? "
+                    "AND start = ?",
+                    (DAY, scope, day),
+                )
+                self._db.executemany(
+                    "INSERT INTO stats_rollups VALUES (?, ?, ?, ?, ?, ?)",
+                    [
+                        (DAY, scope, day, dimension, name, float(seconds))
+                        for dimension, names in dimensions.items()
+                        for name, seconds in names.items()
+                    ],
+                )
+                self._db.execute(
+                    "INSERT OR REPLACE INTO stats_periods VALUES (?, ?, ?, 1)",
+                    (DAY, scope, day),
+                )
+                for period in (WEEK, MONTH):
+                    periods.add(
+                        (period, period_bounds(period, date.fromisoformat(day)))
+                    )
+            for period, (first, last) in periods:
+                self._rebuild_period(scope, period, first.isoformat(), last.isoformat())
+
+    def _rebuild_period(self, scope: str, period: str, first: str, last: str) -> None:
+        self._db.execute(
+            "DELETE FROM stats_rollups WHERE period = ? AND scope = ? AND start = ?",
+            (period, scope, first),
+        )
+        self._db.execute(
+            "INSERT INTO stats_rollups SELECT ?, scope, ?, dimension, name, "
+            "SUM(seconds) FROM stats_rollups WHERE period = ? AND scope = ? "
+            "AND start BETWEEN ? AND ? GROUP BY scope, dimension, name",
+            (period, first, DAY, scope, first, last),
+        )
+        self._db.execute(
+            "INSERT OR REPLACE INTO stats_periods SELECT ?, ?, ?, COUNT(*) "
+            "FROM stats_periods WHERE period = ? AND scope = ? "
+            "AND start BETWEEN ? AND ?",
+            (period, scope, first, DAY, scope, first, last),
+        )
+
+    def plan_stats_periods(
+        self, scope: str, start: date, end: date
+    ) -> tuple[list[tuple[str, str]], list[date]]:
+        """
+        Cover start..end with the fewest stored rollup periods.
+
+        Returns the `(period, start)` pairs to sum, preferring complete months,
+        then complete weeks, then days, and the days that are not stored.
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT period, start, days FROM stats_periods WHERE scope = ? "
+                "AND start BETWEEN ? AND ?",
+                (scope, (start - timedelta(days=6)).isoformat(), end.isoformat()),
+            ).fetchall()
+        stored = {(period, first): days for period, first, days in rows}
+
+        periods: list[tuple[str, str]] = []
+        missing: list[date] = []
+        day = start
+        while day <= end:
+            for period in (MONTH, WEEK):
+                first, last = period_bounds(period, day)
+                length = (last - first).days + 1
+                if first == day and last <= end:
+                    if stored.get((period, first.isoformat())) == length:
+                        periods.append((period, first.isoformat()))
+                        day = last + timedelta(days=1)
+                        break
+            else:
+                if (DAY, day.isoformat()) in stored:
+                    periods.append((DAY, day.isoformat()))
+                else:
+                    missing.append(day)
+                day += timedelta(days=1)
+        return periods, missing
+
+    def sum_stats_periods(
+        self, scope: str, periods: list[tuple[str, str]]
+    ) -> dict[str, dict[str, float]]:
+        """Return `{dimension: {name: seconds}}` summed over periods."""
+        totals: dict[str, dict[str, float]] = {}
+        if not periods:
+            return totals
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT dimension, name, SUM(seconds) FROM stats_rollups "
+                "WHERE scope = ? AND (period, start) IN "
+                f"(VALUES {','.join(['(?, ?)'] * len(periods))}) "
+                "GROUP BY dimension, name",
+                [scope, *(value for pair in periods for value in pair)],
+            ).fetchall()
+        for dimension, name, seconds in rows:
+            totals.setdefault(dimension, {})[name] = seconds
+        return totals
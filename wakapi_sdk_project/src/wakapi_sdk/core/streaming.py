@@ -0,0 +1,256 @@
+"""
+Streaming heartbeats across date ranges.
+
+Wakapi serves heartbeats one day per request. `prefetched` walks a sequence
+of days in order while keeping a bounded number of upcoming requests in
+flight, so a range is streamed at the speed of concurrent requests but only
+the lookahead window of days is ever held in memory. Fan-outs stop early:
+the first failure, or cancellation of the caller, cancels the requests still
+in flight.
+
+A single heavy day can still be many MB. `JsonArrayParser` parses one array
+member of a JSON object (the `data` of a heartbeats response) incrementally
+from text chunks, handing out each element as soon as it is complete, so a
+response is never buffered, decoded or validated as a whole.
+"""
+
+import asyncio
+import codecs
+import json
+import re
+from collections import deque
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Coroutine,
+    Iterable,
+    TypeVar,
+)
+
+from .exceptions import ConfigurationError
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_DONE = object()
+
+
+@dataclass
+class HeartbeatStreamConfig:
+    """Heartbeat streaming configuration data class."""
+
+    # Days requested ahead of the day being consumed
+    prefetch_days: int = 4
+    # Parse heartbeats responses incrementally instead of buffering them
+    incremental_parse: bool = False
+
+    def __post_init__(self):
+        """Validate configuration."""
+        if int(self.prefetch_days) < 1:
+            raise ConfigurationError(
+                "prefetch_days must be at least 1",
+                details={"prefetch_days": self.prefetch_days},
+            )
+
+
+def date_range(start: date, end: date) -> Iterable[date]:
+    """Yield every day from start to end, inclusive."""
+    day = start
+    while day <= end:
+        yield day
+        day += timedelta(days=1)
+
+
+async def prefetched(
+    items: Iterable[T], fetch: Callable[[T], Awaitable[R]], lookahead: int
+) -> AsyncIterator[tuple[T, R]]:
+    """
+    Yield (item, await fetch(item)) in the order of items.
+
+    Up to lookahead fetches run ahead of the consumer. The first failing
+    fetch is raised as soon as it fails; fetches still in flight when the
+    consumer stops, is cancelled or a fetch fails are cancelled.
+    """
+    pending: deque[tuple[T, asyncio.Task]] = deque()
+    iterator = iter(items)
+    try:
+        while True:
+            while len(pending) < lookahead:
+                item = next(iterator, _DONE)
+                if item is _DONE:
+                    break
+                pending.append((item, asyncio.ensure_future(fetch(item))))
+            if not pending:
+                return
+            item, task = pending[0]
+            while not task.done():
+                await asyncio.wait(
+                    [other for _, other in pending if not other.done()],
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                # A failed prefetch fails the stream now, not when reached
+                for _, other in pending:
+                    if other.done() and not other.cancelled() and other.exception():
+                        other.result()
+            pending.popleft()
+            yield item, task.result()
+    finally:
+        for _, task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*(task for _, task in pending), return_exceptions=True)
+
+
+async def gather_or_cancel(*coroutines: Coroutine[Any, Any, R]) -> list[R]:
+    """
+    Run coroutines concurrently and return their results in order.
+
+    Unlike `asyncio.gather`, the first failure cancels the others (so their
+    requests stop using upstream capacity) and is raised as is. Cancellations,
+    also inside nested exception groups, are not failures; if nothing else
+    went wrong, CancelledError is raised.
+    """
+    try:
+        async with asyncio.TaskGroup() as group:
+            tasks = [group.create_task(coroutine) for coroutine in coroutines]
+    except BaseExceptionGroup as e:
+        # Nested groups are recursed into rather than matched as a whole
+        failures = e.subgroup(
+            lambda error: not isinstance(
+                error, (asyncio.CancelledError, BaseExceptionGroup)
+            )
+        )
+        if failures is None:
+            raise asyncio.CancelledError() from None
+        raise failures.exceptions[0] from None
+    return [task.result() for task in tasks]
+
+
+_NON_WHITESPACE = re.compile(r"[^ \t\n\r]")
+
+# Parser states
+_OBJECT, _KEY, _COLON, _VALUE, _AFTER_VALUE = range(5)
+_ITEM, _AFTER_ITEM, _END = range(5, 8)
+
+
+class JsonArrayParser:
+    """
+    Incremental parser for the array member key of a top-level JSON object.
+
+    Text is passed to `feed` in chunks of any size; complete array elements
+    are returned as soon as their closing character arrives and dropped from
+    the buffer, so memory is bounded by the largest element rather than the
+    document. Other members are decoded whole into `fields`.
+    """
+
+    def __init__(self, key: str) -> None:
+        """Parse the array stored under key."""
+        self.key = key
+        self.fields: dict[str, Any] = {}
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._state = _OBJECT
+        self._current_key: str = ""
+
+    def feed(self, text: str, final: bool = False) -> list[Any]:
+        """
+        Add text and return the array elements it completed.
+
+        Args:
+            text: The next chunk of the document.
+            final: Whether this is the last chunk.
+
+        Raises:
+            ValueError: On malformed JSON, or when the document ends early.
+        """
+        self._buffer += text
+        items: list[Any] = []
+        pos = 0
+        buffer = self._buffer
+        while True:
+            match = _NON_WHITESPACE.search(buffer, pos)
+            if match is None:
+                pos = len(buffer)
+                break
+            pos = match.start()
+            char = buffer[pos]
+            state = self._state
+            if state == _END:
+                raise ValueError(f"Unexpected data after JSON document at {pos}")
+            if state == _OBJECT:
+                self._expect(char, "{")
+                self._state, pos = _KEY, pos + 1
+            elif state in (_COLON, _AFTER_VALUE, _AFTER_ITEM):
+                pos = self._punctuation(char, pos)
+            elif state == _VALUE and char == "[" and self._current_key == self.key:
+                self._state, pos = _ITEM, pos + 1
+            elif state == _KEY and char == "}":
+                self._state, pos = _END, pos + 1
+            elif state == _ITEM and char == "]":
+                self._state, pos = _AFTER_VALUE, pos + 1
+            else:
+                decoded = self._decode(buffer, pos, final)
+                if decoded is None:
+                    break
+                value, pos = decoded
+                if state == _KEY:
+                    if not isinstance(value, str):
+                        raise ValueError(f"Expected an object key at {pos}")
+                    self._current_key, self._state = value, _COLON
+                elif state == _VALUE:
+                    self.fields[self._current_key] = value
+                    self._state = _AFTER_VALUE
+                else:
+                    items.append(value)
+                    self._state = _AFTER_ITEM
+        # Only the unparsed tail is kept
+        self._buffer = buffer[pos:]
+        if final and self._state != _END:
+            raise ValueError("JSON document ended early")
+        return items
+
+    def _punctuation(self, char: str, pos: int) -> int:
+        state = self._state
+        if state == _COLON:
+            self._expect(char, ":")
+            self._state = _VALUE
+        elif state == _AFTER_VALUE:
+            self._expect(char, ",}")
+            self._state = _KEY if char == "," else _END
+        else:
+            self._expect(char, ",]")
+            self._state = _ITEM if char == "," else _AFTER_VALUE
+        return pos + 1
+
+    def _decode(self, buffer: str, pos: int, final: bool) -> Any:
+        """Decode the value at pos, or return None if more text is needed."""
+        try:
+            value, end = self._decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError as e:
+            if final:
+                raise ValueError(f"Malformed JSON: {e}") from e
+            return None
+        # A number may continue in the next chunk
+        if not final and _NON_WHITESPACE.search(buffer, end) is None:
+            return None
+        return value, end
+
+    def _expect(self, char: str, allowed: str) -> None:
+        if char not in allowed:
+            raise ValueError(f"Expected one of {allowed!r}, got {char!r}")
+
+
+async def iter_json_array(
+    chunks: AsyncIterator[bytes], parser: JsonArrayParser
+) -> AsyncIterator[Any]:
+    """Yield the elements of parser's array from UTF-8 byte chunks."""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    async for chunk in chunks:
+        for item in parser.feed(decoder.decode(chunk)):
+            yield item
+    for item in parser.feed(decoder.decode(b"", final=True), final=True):
+        yield item
@@ -0,0 +1,124 @@
+import pytest
+import httpx
+
+from wakapi_sdk.client import WakapiClient, WakapiConfig
+from wakapi_sdk.core.cache import RevalidationCacheConfig, request_key
+
+PROJECTS_BODY = {
+    "data": [
+        {
+            "id": "1",
+            "name": "project1",
+            "urlencoded_name": "project1",
+            "created_at": "2023-01-01",
+            "last_heartbeat_at": "2023-01-01",
+            "human_readable_last_heartbeat_at": "1 day ago",
+        }
+    ]
+}
+PROJECTS_URL = "http://localhost:3000/api/compat/wakatime/v1/users/current/projects"
+
+
+def make_client(handler, enabled: bool = True) -> WakapiClient:
+    """Create a WakapiClient with the revalidation cache served by handler."""
+    client = WakapiClient(
+        WakapiConfig(
+            base_url="http://localhost:3000/",
+            api_key="test_api_key",
+            revalidation_cache=RevalidationCacheConfig(enabled=enabled),
+        )
+    )
+    client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+class TestRevalidationCache:
+    """Test suite for conditional request revalidation."""
+
+    @pytest.mark.asyncio
+    async def test_etag_revalidation(self):
+        """A 304 answer to If-None-Match reuses the cached model."""
+        seen_headers = []
+
+        def handler(request):
+            seen_headers.append(request.headers.get("If-None-Match"))
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304, headers={"ETag": '"v1"'})
+            return httpx.Response(200, json=PROJECTS_BODY, headers={"ETag": '"v1"'})
+
+        client = make_client(handler)
+        first = await client.get_projects()
+        second = await client.get_projects()
+
+        assert seen_headers == [None, '"v1"']
+        assert second is first
+        assert (
+            client.metrics.counter("revalidation_not_modified", endpoint="get_projects")
+            == 1
+        )
+
+    @pytest.mark.asyncio
+    async def test_last_modified_revalidation(self):
+        """Last-Modified is sent back as If-Modified-Since."""
+        seen_headers = []
+        last_modified = "Mon, 02 Jan 2023 00:00:00 GMT"
+
+        def handler(request):
+            seen_headers.append(request.headers.get("If-Modified-Since"))
+            if request.headers.get("If-Modified-Since"):
+                return httpx.Response(304)
+            return httpx.Response(
+                200, json=PROJECTS_BODY, headers={"Last-Modified": last_modified}
+            )
+
+        client = make_client(handler)
+        await client.get_projects()
+        projects = await client.get_projects()
+
+        assert seen_headers == [None, last_modified]
+        assert projects.data[0].name == "project1"
+
+    @pytest.mark.asyncio
+    async def test_body_hash_fallback(self):
+        """Without validators an unchanged body skips decoding and validation."""
+        client = make_client(lambda request: httpx.Response(200, json=PROJECTS_BODY))
+
+        first = await client.get_projects()
+        second = await client.get_projects()
+
+        assert second is first
+        assert (
+            client.metrics.counter(
+                "revalidation_body_unchanged", endpoint="get_projects"
+            )
+            == 1
+        )
+        entry = client.revalidation_cache.get(request_key(PROJECTS_URL, {}))
+        assert entry.etag is None and entry.model is first
+
+    @pytest.mark.asyncio
+    async def test_changed_body_is_revalidated(self):
+        """A changed body replaces the cached model."""
+        bodies = [PROJECTS_BODY, {"data": []}]
+
+        client = make_client(lambda request: httpx.Response(200, json=bodies.pop(0)))
+        await client.get_projects()
+        projects = await client.get_projects()
+
+        assert projects.data == []
+
+    @pytest.mark.asyncio
+    async def test_disabled_by_default(self):
+        """No conditional headers are sent unless the cache is enabled."""
+        seen_headers = []
+
+        def handler(request):
+            seen_headers.append(request.headers.get("If-None-Match"))
+            return httpx.Response(200, json=PROJECTS_BODY, headers={"ETag": '"v1"'})
+
+        client = make_client(handler, enabled=False)
+        await client.get_projects()
+        await client.get_projects()
+
+        assert seen_headers == [None, None]
+        assert len(client.revalidation_cache) == 0
@@ -0,0 +1,151 @@
+import gzip
+
+import pytest
+import httpx
+
+from wakapi_sdk.client import WakapiClient, WakapiConfig
+from wakapi_sdk.core.cassette import (
+    Cassette,
+    CassetteConfig,
+    CassetteMissError,
+    RecordingTransport,
+    ReplayTransport,
+)
+from wakapi_sdk.core.exceptions import ConfigurationError
+
+PROJECTS_BODY = (
+    b'{"data": [{"id": "1", "name": "mcp-wakapi", "urlencoded_name": "mcp-wakapi",'
+    b' "created_at": "2024-01-01T00:00:00Z",'
+    b' "last_heartbeat_at": "2024-01-02T00:00:00Z",'
+    b' "human_readable_last_heartbeat_at": "1 day ago"}]}'
+)
+
+
+def make_client(cassette: CassetteConfig, transport=None) -> WakapiClient:
+    """Create a WakapiClient using the given cassette configuration."""
+    return WakapiClient(
+        WakapiConfig(
+            base_url="http://localhost:3000/",
+            api_key="test_api_key",
+            cassette=cassette,
+        ),
+        transport=transport,
+    )
+
+
+async def record_projects(path, queries=("a",)) -> int:
+    """Record one get_projects call per query and return the upstream calls."""
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(
+            200,
+            content=gzip.compress(PROJECTS_BODY),
+            headers={"Content-Encoding": "gzip"},
+        )
+
+    client = make_client(
+        CassetteConfig(mode="record", path=str(path)), httpx.MockTransport(handler)
+    )
+    for query in queries:
+        await client.get_projects(q=query)
+    await client.aclose()
+    return len(calls)
+
+
+class TestCassette:
+    """Test suite for the record/replay cassette transports."""
+
+    def test_unknown_mode(self):
+        """Unknown modes are rejected."""
+        with pytest.raises(ConfigurationError):
+            CassetteConfig(mode="rewind")
+
+    @pytest.mark.asyncio
+    async def test_record_then_replay(self, tmp_path):
+        """Recorded responses are replayed without the original transport."""
+        path = tmp_path / "wakapi.jsonl.gz"
+        assert await record_projects(path) == 1
+
+        cassette = Cassette.load(str(path))
+        assert len(cassette) == 1
+        entry = cassette.entries[0]
+        assert entry["path"] == "/api/compat/wakatime/v1/users/current/projects"
+        assert entry["params"] == [["q", "a"]]
+        assert "body_b64" in entry  # stored still gzip-encoded
+
+        client = make_client(CassetteConfig(mode="replay", path=str(path)))
+        projects = await client.get_projects(q="a")
+        assert projects.data[0].name == "mcp-wakapi"
+
+    @pytest.mark.asyncio
+    async def test_flush_in_batches(self, tmp_path):
+        """Entries are appended as gzip members and read back in order."""
+        path = tmp_path / "wakapi.jsonl.gz"
+        cassette = Cassette(str(path), flush_every=2)
+        transport = RecordingTransport(
+            httpx.MockTransport(lambda request: httpx.Response(200, text="[]")),
+            cassette,
+        )
+        async with httpx.AsyncClient(transport=transport) as http:
+            for query in ("a", "b", "c"):
+                await http.get("http://localhost:3000/api/x", params={"q": query})
+            assert len(Cassette.load(str(path))) == 2
+            # Recording holds only the entries not written yet
+            assert cassette.entries == []
+            assert len(cassette._pending) == 1
+
+        cassette = Cassette.load(str(path))
+        assert [entry["params"] for entry in cassette.entries] == [
+            [["q", "a"]],
+            [["q", "b"]],
+            [["q", "c"]],
+        ]
+
+    @pytest.mark.asyncio
+    async def test_unmatched_params_fall_back_to_path(self, tmp_path):
+        """Without strict matching, other parameters reuse the path's response."""
+        path = tmp_path / "wakapi.jsonl.gz"
+        await record_projects(path)
+
+        client = make_client(CassetteConfig(mode="replay", path=str(path)))
+        projects = await client.get_projects(q="other")
+        assert projects.data[0].name == "mcp-wakapi"
+
+    @pytest.mark.asyncio
+    async def test_strict_miss(self, tmp_path):
+        """Strict replay raises on requests that were never recorded."""
+        path = tmp_path / "wakapi.jsonl.gz"
+        await record_projects(path)
+
+        transport = ReplayTransport(Cassette.load(str(path)), strict=True)
+        request = httpx.Request(
+            "GET", "http://localhost:3000/api/compat/wakatime/v1/users/current/projects"
+        )
+        with pytest.raises(CassetteMissError):
+            await transport.handle_async_request(request)
+
+    @pytest.mark.asyncio
+    async def test_replay_timing(self, tmp_path, monkeypatch):
+        """Recorded elapsed time is slept, scaled by timing_scale."""
+        path = tmp_path / "wakapi.jsonl.gz"
+        await record_projects(path)
+        cassette = Cassette.load(str(path))
+        cassette.entries[0]["elapsed"] = 0.5
+
+        slept = []
+
+        async def fake_sleep(seconds):
+            slept.append(seconds)
+
+        monkeypatch.setattr("wakapi_sdk.core.cassette.asyncio.sleep", fake_sleep)
+        transport = ReplayTransport(cassette, replay_timing=True, timing_scale=0.5)
+        request = httpx.Request(
+            "GET",
+            "http://localhost:3000/api/compat/wakatime/v1/users/current/projects?q=a",
+        )
+        response = await transport.handle_async_request(request)
+
+        assert response.status_code == 200
+        assert slept == [0.25]
@@ -0,0 +1,175 @@
+import pytest
+import httpx
+
+from wakapi_sdk.client import WakapiClient, WakapiConfig
+from wakapi_sdk.core.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerConfig,
+    CircuitState,
+)
+from wakapi_sdk.core.exceptions import ApiError, NetworkError
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_breaker(clock: FakeClock) -> CircuitBreaker:
+    """Create a breaker that opens after two failures for ten seconds."""
+    return CircuitBreaker(
+        "get_stats",
+        CircuitBreakerConfig(failure_threshold=2, recovery_timeout=10.0),
+        clock=clock,
+    )
+
+
+class TestCircuitBreaker:
+    """Test suite for the circuit breaker state machine."""
+
+    def test_opens_after_threshold(self):
+        """Consecutive failures open the breaker."""
+        breaker = make_breaker(FakeClock())
+
+        breaker.record(False)
+        assert breaker.state is CircuitState.CLOSED
+        breaker.record(False)
+
+        assert breaker.state is CircuitState.OPEN
+        assert not breaker.allow_request()
+
+    def test_success_resets_failure_count(self):
+        """A success between failures keeps the breaker closed."""
+        breaker = make_breaker(FakeClock())
+
+        breaker.record(False)
+        breaker.record(True)
+        breaker.record(False)
+
+        assert breaker.state is CircuitState.CLOSED
+
+    def test_half_open_probe(self):
+        """After recovery one probe is allowed and its success closes the breaker."""
+        clock = FakeClock()
+        breaker = make_breaker(clock)
+        breaker.record(False)
+        breaker.record(False)
+
+        clock.now = 10.0
+        assert breaker.state is CircuitState.HALF_OPEN
+        assert breaker.allow_request()
+        assert not breaker.allow_request()
+
+        breaker.record(True)
+        assert breaker.state is CircuitState.CLOSED
+
+    def test_half_open_failure_reopens(self):
+        """A failed probe reopens the breaker for another recovery period."""
+        clock = FakeClock()
+        breaker = make_breaker(clock)
+        breaker.record(False)
+        breaker.record(False)
+
+        clock.now = 10.0
+        assert breaker.allow_request()
+        breaker.record(False)
+
+        assert breaker.state is CircuitState.OPEN
+        assert breaker.retry_after() == 10.0
+
+
+class TestClientCircuitBreaker:
+    """Test suite for circuit breaking inside WakapiClient."""
+
+    @staticmethod
+    def make_client(handler) -> WakapiClient:
+        client = WakapiClient(
+            WakapiConfig(
+                base_url="http://localhost:3000/",
+                api_key="test_api_key",
+                circuit_breaker=CircuitBreakerConfig(
+                    failure_threshold=2, recovery_timeout=60.0
+                ),
+            )
+        )
+        client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        return client
+
+    @pytest.mark.asyncio
+    async def test_fast_fail_when_open(self):
+        """An open breaker raises NetworkError without contacting Wakapi."""
+        calls = 0
+
+        def handler(request):
+            nonlocal calls
+            calls += 1
+            raise httpx.ConnectError("connection refused", request=request)
+
+        client = self.make_client(handler)
+        for _ in range(2):
+            with pytest.raises(httpx.ConnectError):
+                await client.get_projects()
+
+        with pytest.raises(NetworkError, match="circuit breaker is open"):
+            await client.get_projects()
+
+        assert calls == 2
+        assert (
+            client.metrics.counter("circuit_rejections", endpoint="get_projects") == 1
+        )
+
+    @pytest.mark.asyncio
+    async def test_serves_stale_response_when_open(self):
+        """An open breaker answers from the last successful response."""
+        healthy = True
+
+        def handler(request):
+            if healthy:
+                return httpx.Response(200, json={"data": []})
+            return httpx.Response(503)
+
+        client = self.make_client(handler)
+        await client.get_projects()
+
+        healthy = False
+        url = "http://localhost:3000/api/compat/wakatime/v1/users/current/projects"
+        for _ in range(2):
+            with pytest.raises(httpx.HTTPStatusError):
+                await client._get("get_projects", url, params={})
+
+        response = await client._get("get_projects", url, params={})
+        assert response.headers["Warning"] == '110 - "Response is Stale"'
+        assert response.json() == {"data": []}
+
+        projects = await client.get_projects()
+        assert projects.data == []
+        assert projects.stale
+        assert client.metrics.counter("stale_responses", endpoint="get_projects") == 2
+
+    def test_stale_cache_is_bounded_by_bytes(self):
+        """The oldest responses are dropped once their bodies exceed the cap."""
+        client = self.make_client(lambda request: httpx.Response(200))
+        client.config.circuit_breaker.stale_cache_bytes = 10
+
+        for key in ("a", "b", "c"):
+            client._remember_response((key,), httpx.Response(200, content=b"12345"))
+        client._remember_response(("d",), httpx.Response(200, content=b"x" * 11))
+
+        assert list(client._stale_responses) == [("b",), ("c",)]
+        assert client._stale_bytes == 10
+
+    @pytest.mark.asyncio
+    async def test_client_errors_do_not_open(self):
+        """4xx answers prove Wakapi is up and do not count as failures."""
+        client = self.make_client(lambda request: httpx.Response(404))
+
+        for _ in range(3):
+            with pytest.raises(ApiError):
+                await client.get_user()
+
+        assert client.breakers["get_user"].state is CircuitState.CLOSED
@@ -0,0 +1,89 @@
+import gzip
+import zlib
+
+import pytest
+import httpx
+
+from wakapi_sdk.client import WakapiClient, WakapiConfig
+from wakapi_sdk.core.compression import CompressionConfig, supported_encodings
+
+PROJECTS_BODY = (
+    b'{"data": [{"id": "1", "name": "mcp-wakapi", "urlencoded_name": "mcp-wakapi",'
+    b' "created_at": "2024-01-01T00:00:00Z",'
+    b' "last_heartbeat_at": "2024-01-02T00:00:00Z",'
+    b' "human_readable_last_heartbeat_at": "1 day ago"}]}'
+)
+
+
+def make_client(handler, compression: CompressionConfig) -> WakapiClient:
+    """Create a WakapiClient served by handler through the decoding transport."""
+    return WakapiClient(
+        WakapiConfig(
+            base_url="http://localhost:3000/",
+            api_key="test_api_key",
+            compression=compression,
+        ),
+        transport=httpx.MockTransport(handler),
+    )
+
+
+class TestCompression:
+    """Test suite for compression negotiation and decode metrics."""
+
+    def test_supported_encodings(self):
+        """gzip and deflate are always available."""
+        assert {"gzip", "deflate"} <= set(supported_encodings())
+
+    @pytest.mark.asyncio
+    async def test_accept_encoding_sent(self):
+        """The configured Accept-Encoding header is sent."""
+        seen = {}
+
+        def handler(request):
+            seen["accept_encoding"] = request.headers["Accept-Encoding"]
+            return httpx.Response(200, content=PROJECTS_BODY)
+
+        client = make_client(handler, CompressionConfig(accept_encoding="identity"))
+        await client.get_projects()
+
+        assert seen["accept_encoding"] == "identity"
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "encoding, encode",
+        [("gzip", gzip.compress), ("deflate", zlib.compress)],
+    )
+    async def test_decodes_and_records_metrics(self, encoding, encode):
+        """Compressed bodies are decoded and both sizes are recorded."""
+        body = encode(PROJECTS_BODY)
+
+        def handler(request):
+            return httpx.Response(
+                200, content=body, headers={"Content-Encoding": encoding}
+            )
+
+        client = make_client(handler, CompressionConfig(accept_encoding=encoding))
+        projects = await client.get_projects()
+
+        assert projects.data[0].name == "mcp-wakapi"
+        metrics = client.metrics
+        assert metrics.counter("content_bytes_compressed", encoding=encoding) == len(
+            body
+        )
+        assert metrics.counter("content_bytes_decoded", encoding=encoding) == len(
+            PROJECTS_BODY
+        )
+        assert len(metrics.samples("content_decode_seconds", encoding=encoding)) == 1
+
+    @pytest.mark.asyncio
+    async def test_identity_recorded(self):
+        """Uncompressed responses are recorded under the identity encoding."""
+        client = make_client(
+            lambda request: httpx.Response(200, content=PROJECTS_BODY),
+            CompressionConfig(),
+        )
+        await client.get_projects()
+
+        assert client.metrics.counter(
+            "content_bytes_decoded", encoding="identity"
+        ) == len(PROJECTS_BODY)
@@ -0,0 +1,108 @@
+import asyncio
+import pytest
+import httpx
+
+from wakapi_sdk.client import WakapiClient, WakapiConfig
+from wakapi_sdk.core.concurrency import (
+    AdaptiveConcurrencyConfig,
+    AdaptiveConcurrencyLimiter,
+)
+from wakapi_sdk.core.exceptions import ApiError
+from wakapi_sdk.core.metrics import ClientMetrics
+
+
+def make_limiter(**overrides) -> AdaptiveConcurrencyLimiter:
+    """Create a limiter with a small window for fast adaptation."""
+    options = {"initial_limit": 4, "min_limit": 1, "max_limit": 8, "window": 2}
+    options.update(overrides)
+    return AdaptiveConcurrencyLimiter(
+        AdaptiveConcurrencyConfig(**options), ClientMetrics()
+    )
+
+
+class TestAdaptiveConcurrencyLimiter:
+    """Test suite for the AIMD concurrency limiter."""
+
+    @pytest.mark.asyncio
+    async def test_additive_increase_under_target(self):
+        """A full window of fast requests raises the limit by one step."""
+        limiter = make_limiter(target_p95_seconds=1.0)
+
+        for _ in range(2):
+            async with limiter.slot() as ticket:
+                limiter.record_success(ticket, 0.05)
+
+        assert limiter.limit == 5
+        assert limiter.metrics.gauge("concurrency_limit") == 5
+
+    @pytest.mark.asyncio
+    async def test_no_increase_over_target(self):
+        """Slow windows keep the limit unchanged."""
+        limiter = make_limiter(target_p95_seconds=0.1)
+
+        for _ in range(2):
+            async with limiter.slot() as ticket:
+                limiter.record_success(ticket, 0.5)
+
+        assert limiter.limit == 4
+
+    @pytest.mark.asyncio
+    async def test_multiplicative_decrease_once_per_burst(self):
+        """Concurrent overloads from the same epoch cut the limit only once."""
+        limiter = make_limiter(initial_limit=8, decrease_factor=0.5)
+
+        async with limiter.slot() as first, limiter.slot() as second:
+            limiter.record_overload(first)
+            limiter.record_overload(second)
+
+        assert limiter.limit == 4
+        assert limiter.metrics.counter("concurrency_decreases") == 1
+
+    @pytest.mark.asyncio
+    async def test_limit_bounds(self):
+        """The limit never drops below min_limit."""
+        limiter = make_limiter(initial_limit=2, min_limit=2)
+
+        async with limiter.slot() as ticket:
+            limiter.record_overload(ticket)
+
+        assert limiter.limit == 2
+
+    @pytest.mark.asyncio
+    async def test_enforces_limit(self):
+        """No more than `limit` slots are held at once."""
+        limiter = make_limiter(initial_limit=3, window=1000)
+        peak = 0
+
+        async def work():
+            nonlocal peak
+            async with limiter.slot():
+                peak = max(peak, limiter.in_flight)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(work() for _ in range(10)))
+        assert peak == 3
+
+
+class TestClientAdaptiveConcurrency:
+    """Test suite for adaptive concurrency inside WakapiClient."""
+
+    @pytest.mark.asyncio
+    async def test_429_cuts_limit(self):
+        """A 429 from Wakapi halves the client concurrency limit."""
+        client = WakapiClient(
+            WakapiConfig(
+                base_url="http://localhost:3000/",
+                api_key="test_api_key",
+                adaptive_concurrency=AdaptiveConcurrencyConfig(initial_limit=8),
+            )
+        )
+        client.client = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: httpx.Response(429))
+        )
+
+        with pytest.raises(ApiError):
+            await client.get_projects()
+
+        assert client.concurrency.limit == 4
+        assert client.metrics.gauge("concurrency_limit") == 4
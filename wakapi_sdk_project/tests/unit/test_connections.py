@@ -0,0 +1,145 @@
+import asyncio
+
+import httpcore
+import httpx
+import pytest
+
+from wakapi_sdk.client import WakapiClient, WakapiConfig
+from wakapi_sdk.core.connections import (
+    ConnectionWarmer,
+    ConnectionWarmingConfig,
+    DnsCache,
+    DnsCachingBackend,
+    install_dns_cache,
+    network_transport,
+)
+from wakapi_sdk.core.exceptions import ConfigurationError
+from wakapi_sdk.core.metrics import ClientMetrics
+from wakapi_sdk.core.rate_limit import BACKGROUND, current_budget
+
+
+class RecordingBackend(httpcore.AsyncMockBackend):
+    """Mock backend remembering the hosts it connected to."""
+
+    def __init__(self, refuse: tuple[str, ...] = ()) -> None:
+        super().__init__([])
+        self.hosts: list[str] = []
+        self.refuse = refuse
+
+    async def connect_tcp(self, host, port, **kwargs):
+        self.hosts.append(host)
+        if host in self.refuse:
+            raise httpcore.ConnectError("refused")
+        return await super().connect_tcp(host, port, **kwargs)
+
+
+class TestConnections:
+    """Test suite for connection warming and DNS caching."""
+
+    @pytest.mark.asyncio
+    async def test_dns_cache_ttl(self):
+        """Host names are resolved again only once their answer expired."""
+        now = 0.0
+        metrics = ClientMetrics()
+        cache = DnsCache(ttl=60, metrics=metrics, clock=lambda: now)
+
+        addresses = await cache.resolve("localhost", 3000)
+        assert set(addresses) <= {"127.0.0.1", "::1"}
+        await cache.resolve("localhost", 3000)
+        assert metrics.counter("dns_lookups", host="localhost") == 1
+        now = 61.0
+        await cache.resolve("localhost", 3000)
+        assert metrics.counter("dns_lookups", host="localhost") == 2
+        assert await cache.resolve("10.0.0.1", 3000) == ["10.0.0.1"]
+
+    @pytest.mark.asyncio
+    async def test_backend_connects_to_cached_address(self):
+        """Connections fail over between addresses; refusal by all drops them."""
+        cache = DnsCache(ttl=60)
+        addresses = ["2001:db8::7", "10.0.0.7"]
+        cache._entries[("wakapi.example", 443)] = (float("inf"), addresses)
+        backend = RecordingBackend()
+        await DnsCachingBackend(backend, cache).connect_tcp("wakapi.example", 443)
+        assert backend.hosts == ["2001:db8::7"]
+
+        backend = RecordingBackend(refuse=("2001:db8::7",))
+        await DnsCachingBackend(backend, cache).connect_tcp("wakapi.example", 443)
+        assert backend.hosts == addresses
+        assert ("wakapi.example", 443) in cache._entries
+
+        with pytest.raises(httpcore.ConnectError):
+            await DnsCachingBackend(
+                RecordingBackend(refuse=tuple(addresses)), cache
+            ).connect_tcp("wakapi.example", 443)
+        assert ("wakapi.example", 443) not in cache._entries
+
+    def test_network_transport(self):
+        """Warming keeps idle connections longer and resolves through the cache."""
+        transport = network_transport(
+            ConnectionWarmingConfig(enabled=True, keepalive_expiry=90)
+        )
+        assert transport._pool._keepalive_expiry == 90
+        assert isinstance(transport._pool._network_backend, DnsCachingBackend)
+        assert not install_dns_cache(httpx.MockTransport(lambda r: None), DnsCache(1))
+
+    @pytest.mark.asyncio
+    async def test_warmer_probes_and_stops(self):
+        """Each round sends min_connections probes at once."""
+        metrics = ClientMetrics()
+        in_flight = 0
+        peak = 0
+
+        async def probe():
+            nonlocal in_flight, peak
+            assert current_budget() == BACKGROUND
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.001)
+            in_flight -= 1
+
+        warmer = ConnectionWarmer(
+            ConnectionWarmingConfig(
+                enabled=True, min_connections=3, keepalive_interval=0.01
+            ),
+            probe,
+            metrics,
+        )
+        warmer.start()
+        await asyncio.sleep(0.05)
+        await warmer.stop()
+        probes = metrics.counter("keepalive_probes")
+        assert peak == 3
+        assert probes >= 6
+        await asyncio.sleep(0.03)
+        assert metrics.counter("keepalive_probes") == probes
+
+    @pytest.mark.asyncio
+    async def test_client_warms_connections(self):
+        """Probes hit the health check and failures are only counted."""
+        paths = []
+
+        def handler(request):
+            paths.append(request.url.path)
+            if len(paths) == 2:
+                raise httpx.ConnectError("refused")
+            return httpx.Response(200, text="app=1\ndb=1\n")
+
+        async with WakapiClient(
+            WakapiConfig(
+                base_url="http://localhost:3000/",
+                api_key="key",
+                connections=ConnectionWarmingConfig(enabled=True, min_connections=2),
+            ),
+            transport=httpx.MockTransport(handler),
+        ) as client:
+            await client.warm_connections()
+            assert paths == ["/api/health", "/api/health"]
+            assert client.metrics.counter("keepalive_probes") == 1
+            assert client.metrics.counter("keepalive_probe_errors") == 1
+            # Probes are ordinary requests to the client's metrics
+            assert client.metrics.counter("requests", endpoint="warm_connections") == 2
+
+    def test_rejects_interval_above_expiry(self):
+        """Probes must come before idle connections expire."""
+        with pytest.raises(ConfigurationError):
+            ConnectionWarmingConfig(keepalive_interval=60, keepalive_expiry=30)
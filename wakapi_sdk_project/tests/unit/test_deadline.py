@@ -0,0 +1,96 @@
+import asyncio
+
+import httpx
+import pytest
+
+from wakapi_sdk.client import WakapiClient, WakapiConfig
+from wakapi_sdk.core.deadline import TimeoutConfig, deadline, remaining_seconds
+from wakapi_sdk.core.exceptions import DeadlineExceededError
+
+
+def heartbeats_response(request: httpx.Request) -> httpx.Response:
+    """An empty heartbeats response."""
+    day = request.url.params["date"]
+    return httpx.Response(
+        200, json={"data": [], "start": day, "end": day, "timezone": "UTC"}
+    )
+
+
+class TestDeadline:
+    """Test suite for deadlines and per-endpoint timeouts."""
+
+    def test_nested_deadlines_only_tighten(self):
+        """An inner deadline cannot extend the outer one."""
+        assert remaining_seconds() is None
+        with deadline(1):
+            with deadline(60):
+                assert remaining_seconds() <= 1
+            with deadline(0.5):
+                assert remaining_seconds() <= 0.5
+            with deadline(None):
+                assert 0.5 < remaining_seconds() <= 1
+        assert remaining_seconds() is None
+
+    def test_endpoint_timeouts(self):
+        """Endpoints without their own timeout use the default."""
+        timeouts = TimeoutConfig(default=7.0, get_stats=45.0)
+        assert timeouts.for_endpoint("get_stats") == 45.0
+        assert timeouts.for_endpoint("get_user") == 5.0
+        assert timeouts.for_endpoint("get_user_agents") == 7.0
+
+    @pytest.mark.asyncio
+    async def test_deadline_caps_request_timeout(self):
+        """Requests get the smaller of their timeout and the time remaining."""
+        timeouts = []
+
+        def handler(request):
+            timeouts.append(request.extensions["timeout"]["read"])
+            return heartbeats_response(request)
+
+        client = WakapiClient(
+            WakapiConfig(base_url="http://localhost:3000/", api_key="key"),
+            transport=httpx.MockTransport(handler),
+        )
+        await client.get_heartbeats(date="2024-01-01")
+        with deadline(2):
+            await client.get_heartbeats(date="2024-01-02")
+        assert timeouts[0] == 15.0
+        assert 1 < timeouts[1] <= 2
+
+    @pytest.mark.asyncio
+    async def test_expired_deadline_skips_request(self):
+        """No request is sent once the deadline passed."""
+        requested = []
+
+        def handler(request):
+            requested.append(request)
+            return heartbeats_response(request)
+
+        client = WakapiClient(
+            WakapiConfig(base_url="http://localhost:3000/", api_key="key"),
+            transport=httpx.MockTransport(handler),
+        )
+        with deadline(0):
+            with pytest.raises(DeadlineExceededError):
+                await client.get_heartbeats(date="2024-01-01")
+        assert requested == []
+        assert (
+            client.metrics.counter("deadline_exceeded", endpoint="get_heartbeats") == 1
+        )
+
+    @pytest.mark.asyncio
+    async def test_deadline_timeout_is_not_an_upstream_failure(self):
+        """A request cut short by the deadline does not count as an error."""
+
+        async def handler(request):
+            await asyncio.sleep(1)
+            return heartbeats_response(request)
+
+        client = WakapiClient(
+            WakapiConfig(base_url="http://localhost:3000/", api_key="key"),
+            transport=httpx.MockTransport(handler),
+        )
+        with deadline(0.05):
+            with pytest.raises(DeadlineExceededError):
+                await client.get_heartbeats(date="2024-01-01")
+        assert client.metrics.counter("request_errors", endpoint="get_heartbeats") == 0
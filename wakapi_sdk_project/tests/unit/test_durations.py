@@ -0,0 +1,78 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from wakapi_sdk.core.durations import (
+    day_segments,
+    group_durations,
+    heartbeat_durations,
+    merge_group_durations,
+)
+
+
+def heartbeat(time, project="api", entity="main.py", language="Python"):
+    """Create a minimal heartbeat."""
+    return SimpleNamespace(
+        time=time, project=project, entity=entity, language=language, branch="main"
+    )
+
+
+class TestDurations:
+    """Test suite for the heartbeat duration engine."""
+
+    def test_gaps_capped_at_timeout(self):
+        """Each heartbeat counts the gap to the next one, at most the timeout."""
+        times = np.array([0.0, 60.0, 1000.0, 1030.0])
+        durations = heartbeat_durations(times, timeout=120)
+
+        assert durations.tolist() == [60.0, 120.0, 30.0, 0.0]
+
+    def test_nothing_counted_across_segments(self):
+        """The last heartbeat of a day counts nothing."""
+        times = np.array([86340.0, 86390.0, 86410.0])
+        durations = heartbeat_durations(
+            times, timeout=600, segments=day_segments(times)
+        )
+
+        assert durations.tolist() == [50.0, 0.0, 0.0]
+
+    def test_time_attributed_to_earlier_heartbeat(self):
+        """Switching groups credits the gap to the group switched away from."""
+        heartbeats = [
+            heartbeat(100, entity="b.py"),
+            heartbeat(0, entity="a.py"),
+            heartbeat(130, entity="b.py"),
+        ]
+        groups = group_durations(heartbeats, group_by="entity", timeout=600)
+
+        assert [(g.name, g.total_seconds, g.heartbeats) for g in groups] == [
+            ("a.py", 100.0, 1),
+            ("b.py", 30.0, 2),
+        ]
+
+    def test_explicit_segments(self):
+        """Segments given per heartbeat follow their heartbeats when sorting."""
+        heartbeats = [heartbeat(50, project="web"), heartbeat(0), heartbeat(10)]
+        groups = group_durations(heartbeats, segments=[1, 0, 0])
+
+        assert {g.name: g.total_seconds for g in groups} == {"api": 10.0, "web": 0.0}
+
+    def test_invalid_group(self):
+        """Unknown grouping fields are rejected."""
+        with pytest.raises(ValueError, match="Cannot group by"):
+            group_durations([heartbeat(0)], group_by="editor")
+
+    def test_merge_days(self):
+        """Groups totalled per day sum to the same result as one pass."""
+        day_one = [heartbeat(0.0), heartbeat(60.0, project="web"), heartbeat(90.0)]
+        day_two = [heartbeat(86400.0), heartbeat(86520.0, project="web")]
+
+        merged = merge_group_durations(
+            group_durations(day_one, segments=[0] * 3)
+            + group_durations(day_two, segments=[0] * 2)
+        )
+        whole = group_durations(day_one + day_two, segments=[0, 0, 0, 1, 1])
+        assert [(g.name, g.total_seconds, g.heartbeats) for g in merged] == [
+            (g.name, g.total_seconds, g.heartbeats) for g in whole
+        ]
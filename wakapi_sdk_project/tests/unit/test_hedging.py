@@ -0,0 +1,195 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import httpx
+import pytest
+
+from wakapi_sdk.client import WakapiClient, WakapiConfig
+from wakapi_sdk.core.concurrency import AdaptiveConcurrencyConfig
+from wakapi_sdk.core.exceptions import ConfigurationError
+from wakapi_sdk.core.hedging import HedgeBudget, Hedger, HedgingConfig
+from wakapi_sdk.core.metrics import ClientMetrics
+
+
+def calibrated_metrics(seconds: float, samples: int = 20) -> ClientMetrics:
+    """Metrics with samples get_stats requests of seconds each."""
+    metrics = ClientMetrics()
+    for _ in range(samples):
+        metrics.observe("request_seconds", seconds, endpoint="get_stats")
+    return metrics
+
+
+class TestHedging:
+    """Test suite for hedged requests."""
+
+    def test_delay_needs_calibration(self):
+        """Endpoints are only hedged once enough latencies were measured."""
+        config = HedgingConfig(enabled=True, min_samples=20)
+        assert Hedger(config, calibrated_metrics(0.2, 19)).delay("get_stats") is None
+        assert Hedger(config, calibrated_metrics(0.2)).delay("get_stats") == 0.2
+        assert Hedger(config, calibrated_metrics(0.2)).delay("get_user") is None
+        disabled = Hedger(HedgingConfig(), calibrated_metrics(0.2))
+        assert disabled.delay("get_stats") is None
+
+    def test_rejects_invalid_config(self):
+        """Percentiles outside (0, 100] and negative budgets are rejected."""
+        with pytest.raises(ConfigurationError):
+            HedgingConfig(percentile=0)
+        with pytest.raises(ConfigurationError):
+            HedgingConfig(budget_ratio=-1)
+
+    def test_budget_limits_hedges(self):
+        """A hedge is earned by 1 / ratio requests, up to burst."""
+        budget = HedgeBudget(ratio=0.25, burst=2)
+        assert not budget.try_spend()
+        for _ in range(4):
+            budget.record_request()
+        assert budget.try_spend()
+        assert not budget.try_spend()
+        for _ in range(100):
+            budget.record_request()
+        assert budget.try_spend() and budget.try_spend()
+        assert not budget.try_spend()
+
+    @pytest.mark.asyncio
+    async def test_slow_request_is_hedged(self):
+        """The hedge answers first and the slow request is cancelled."""
+        metrics = calibrated_metrics(0.01)
+        hedger = Hedger(
+            HedgingConfig(enabled=True, budget_ratio=1.0, budget_burst=1), metrics
+        )
+        calls = 0
+        cancelled = []
+
+        async def request():
+            nonlocal calls
+            calls += 1
+            call = calls
+            try:
+                await asyncio.sleep(10 if call == 1 else 0)
+            except asyncio.CancelledError:
+                cancelled.append(call)
+                raise
+            return call
+
+        async with asyncio.timeout(1):
+            assert await hedger.send("get_stats", request) == 2
+        assert cancelled == [1]
+        assert metrics.counter("hedged_requests", endpoint="get_stats") == 1
+        assert metrics.counter("hedge_wins", endpoint="get_stats") == 1
+        # The hedge is recorded as a request; the primary is left to the caller
+        assert metrics.counter("requests", endpoint="get_stats") == 1
+        assert len(metrics.samples("request_seconds", endpoint="get_stats")) == 21
+
+        # Without budget left, the next slow request is waited for
+        calls = 0
+        cancelled.clear()
+        hedger.budget.ratio = 0.0
+        with pytest.raises(TimeoutError):
+            async with asyncio.timeout(0.1):
+                await hedger.send("get_stats", request)
+        assert calls == 1
+
+    @pytest.mark.asyncio
+    async def test_hedge_needs_free_slot(self):
+        """Without a free request slot the hedge is skipped, not queued."""
+        metrics = calibrated_metrics(0.01)
+        hedger = Hedger(
+            HedgingConfig(enabled=True, budget_ratio=1.0, budget_burst=1), metrics
+        )
+        calls = 0
+
+        async def request():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return calls
+
+        @asynccontextmanager
+        async def no_slot():
+            yield False
+
+        assert await hedger.send("get_stats", request, no_slot) == 1
+        assert calls == 1
+        assert metrics.counter("hedges_skipped", endpoint="get_stats") == 1
+        assert metrics.counter("hedged_requests", endpoint="get_stats") == 0
+        # The unsent hedge is refunded
+        assert hedger.budget.try_spend()
+
+    @pytest.mark.asyncio
+    async def test_failed_hedge_waits_for_primary(self):
+        """A failing duplicate does not fail a request that then succeeds."""
+        hedger = Hedger(
+            HedgingConfig(enabled=True, budget_ratio=1.0), calibrated_metrics(0.01)
+        )
+        calls = 0
+
+        async def request():
+            nonlocal calls
+            calls += 1
+            if calls == 2:
+                raise httpx.ConnectError("refused")
+            await asyncio.sleep(0.05)
+            return "primary"
+
+        assert await hedger.send("get_stats", request) == "primary"
+
+    @pytest.mark.asyncio
+    async def test_client_hedges_slow_replica(self):
+        """WakapiClient takes the response of the faster replica."""
+        requests = 0
+
+        async def handler(request):
+            nonlocal requests
+            requests += 1
+            # Every other request lands on the slow replica
+            if requests % 2 == 1:
+                await asyncio.sleep(10)
+            day = request.url.params["date"]
+            return httpx.Response(
+                200, json={"data": [], "start": day, "end": day, "timezone": "UTC"}
+            )
+
+        client = WakapiClient(
+            WakapiConfig(
+                base_url="http://localhost:3000/",
+                api_key="key",
+                hedging=HedgingConfig(enabled=True, min_samples=1, budget_ratio=1.0),
+            ),
+            transport=httpx.MockTransport(handler),
+        )
+        client.metrics.observe("request_seconds", 0.01, endpoint="get_heartbeats")
+        async with asyncio.timeout(1):
+            await client.get_heartbeats(date="2024-01-01")
+        assert requests == 2
+        assert client.metrics.counter("hedge_wins", endpoint="get_heartbeats") == 1
+
+    @pytest.mark.asyncio
+    async def test_client_does_not_hedge_past_concurrency_limit(self):
+        """A hedge never exceeds the client's concurrency limit."""
+        requests = 0
+
+        async def handler(request):
+            nonlocal requests
+            requests += 1
+            await asyncio.sleep(0.05)
+            day = request.url.params["date"]
+            return httpx.Response(
+                200, json={"data": [], "start": day, "end": day, "timezone": "UTC"}
+            )
+
+        client = WakapiClient(
+            WakapiConfig(
+                base_url="http://localhost:3000/",
+                api_key="key",
+                hedging=HedgingConfig(enabled=True, min_samples=1, budget_ratio=1.0),
+                adaptive_concurrency=AdaptiveConcurrencyConfig(
+                    initial_limit=1, max_limit=1
+                ),
+            ),
+            transport=httpx.MockTransport(handler),
+        )
+        client.metrics.observe("request_seconds", 0.01, endpoint="get_heartbeats")
+        await client.get_heartbeats(date="2024-01-01")
+        assert requests == 1
+        assert client.metrics.counter("hedges_skipped", endpoint="get_heartbeats") == 1
@@ -0,0 +1,79 @@
+from types import SimpleNamespace
+
+import pytest
+
+from wakapi_sdk.core.hotspots import HotspotCounter, rollup_directories
+
+
+def heartbeat(time, entity, is_write=False, additions=None, deletions=None):
+    """Create a minimal heartbeat."""
+    return SimpleNamespace(
+        time=time,
+        entity=entity,
+        is_write=is_write,
+        line_additions=additions,
+        line_deletions=deletions,
+    )
+
+
+def feed(counter, heartbeats):
+    """Feed heartbeats into counter."""
+    for item in heartbeats:
+        counter.feed(item)
+
+
+class TestHotspots:
+    """Test suite for file hot-spot ranking."""
+
+    def test_counts_per_file(self):
+        """Time, writes and line changes are counted per file."""
+        counter = HotspotCounter(timeout=600)
+        feed(
+            counter,
+            [
+                heartbeat(0, "/repo/src/a.py"),
+                heartbeat(100, "/repo/src/b.py", is_write=True, additions=5),
+                heartbeat(2000, "/repo/src/a.py", is_write=True, deletions=2),
+            ],
+        )
+        counter.end_segment()
+        counter.feed(heartbeat(100000, "/repo/README.md"))
+
+        files = counter.files
+        assert files["/repo/src/a.py"].seconds == 100
+        assert files["/repo/src/a.py"].writes == 1
+        assert files["/repo/src/a.py"].lines_changed == 2
+        assert files["/repo/src/b.py"].seconds == 600
+        assert files["/repo/README.md"].seconds == 0
+        assert [a.path for a in counter.top(2)] == ["/repo/src/b.py", "/repo/src/a.py"]
+        assert counter.top(1, "lines_changed")[0].path == "/repo/src/b.py"
+
+    def test_invalid_sort(self):
+        """Unknown sort keys are rejected."""
+        with pytest.raises(ValueError):
+            HotspotCounter().top(5, "editor")
+
+    def test_directory_rollup(self):
+        """Directories below the shared prefix aggregate their files."""
+        counter = HotspotCounter(timeout=600)
+        feed(
+            counter,
+            [
+                heartbeat(0, "/home/me/repo/src/core/a.py"),
+                heartbeat(60, "/home/me/repo/src/core/b.py"),
+                heartbeat(120, "/home/me/repo/src/cli.py"),
+                heartbeat(150, "/home/me/repo/tests/test_a.py"),
+                heartbeat(200, "/home/me/repo/setup.py"),
+            ],
+        )
+
+        top = rollup_directories(counter.files, depth=1, limit=10)
+        by_path = {a.path: a.seconds for a in top}
+        assert by_path == {
+            "/home/me/repo/src/": 150,
+            "/home/me/repo/tests/": 50,
+            "/home/me/repo/": 0,
+        }
+
+        nested = rollup_directories(counter.files, depth=2, limit=10)
+        assert {a.path: a.heartbeats for a in nested}["/home/me/repo/src/core/"] == 2
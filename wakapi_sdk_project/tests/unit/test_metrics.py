@@ -0,0 +1,37 @@
+from wakapi_sdk.core.metrics import ClientMetrics, percentile
+
+
+class TestClientMetrics:
+    """Test suite for the client metrics registry."""
+
+    def test_counters_and_gauges(self):
+        """Counters accumulate per label set and gauges keep the last value."""
+        metrics = ClientMetrics()
+        metrics.increment("requests", endpoint="get_stats")
+        metrics.increment("requests", endpoint="get_stats")
+        metrics.increment("requests", endpoint="get_user")
+        metrics.set_gauge("concurrency_limit", 4)
+        metrics.set_gauge("concurrency_limit", 6)
+
+        assert metrics.counter("requests", endpoint="get_stats") == 2
+        assert metrics.counter("requests", endpoint="get_user") == 1
+        assert metrics.gauge("concurrency_limit") == 6
+
+    def test_snapshot_summarizes_samples(self):
+        """Snapshots report counts and percentiles of sample series."""
+        metrics = ClientMetrics(sample_window=10)
+        for value in range(1, 21):
+            metrics.observe("request_seconds", float(value), endpoint="get_stats")
+
+        summary = metrics.snapshot()["samples"]["request_seconds{endpoint=get_stats}"]
+        assert summary["count"] == 20
+        assert summary["sum"] == 210.0
+        # Only the last 10 samples are retained for percentiles
+        assert summary["p50"] == 15.0
+        assert summary["max"] == 20.0
+
+    def test_percentile(self):
+        """Nearest-rank percentile of a sample list."""
+        assert percentile([], 95) == 0.0
+        assert percentile([3.0, 1.0, 2.0], 50) == 2.0
+        assert percentile([1.0, 2.0, 3.0, 4.0], 100) == 4.0
@@ -0,0 +1,89 @@
+from datetime import date, timedelta
+
+import pytest
+
+from wakapi_sdk.core.metrics import ClientMetrics
+from wakapi_sdk.core.planner import (
+    HEARTBEATS,
+    LOCAL_ROLLUPS,
+    STATS,
+    SUMMARIES,
+    CostModel,
+    Query,
+    QueryPlanner,
+    fixed_stats_range,
+)
+
+TODAY = date(2024, 3, 20)
+
+
+def query(days: int, end: date = TODAY, **filters) -> Query:
+    """A query of days days up to end."""
+    return Query(end - timedelta(days=days - 1), end, TODAY, filters)
+
+
+class TestQueryPlanner:
+    """Test suite for the query planner."""
+
+    def test_fixed_stats_ranges(self):
+        """Only ranges matching a stats range identifier are recognized."""
+        assert fixed_stats_range(TODAY, TODAY, TODAY) == "today"
+        yesterday = TODAY - timedelta(days=1)
+        assert fixed_stats_range(yesterday, yesterday, TODAY) == "yesterday"
+        assert fixed_stats_range(TODAY - timedelta(days=6), TODAY, TODAY) == (
+            "last_7_days"
+        )
+        assert fixed_stats_range(TODAY - timedelta(days=29), TODAY, TODAY) == (
+            "last_30_days"
+        )
+        assert fixed_stats_range(TODAY - timedelta(days=9), TODAY, TODAY) is None
+
+    def test_unfiltered_prefers_local_rollups(self):
+        """Stored rollups cost no request; missing days one summaries request."""
+        planner = QueryPlanner()
+
+        plan = planner.plan(query(7), missing_local_days=0)
+        assert plan.source == LOCAL_ROLLUPS
+        assert plan.upstream_requests == 0
+        assert set(plan.candidates) == {LOCAL_ROLLUPS, STATS, SUMMARIES, HEARTBEATS}
+
+        plan = planner.plan(query(10), missing_local_days=3)
+        assert plan.source == LOCAL_ROLLUPS
+        assert plan.upstream_requests == 1
+
+    def test_filters_restrict_sources(self):
+        """Filters rule out sources that cannot apply them."""
+        planner = QueryPlanner()
+
+        plan = planner.plan(query(7, project="api"), missing_local_days=0)
+        assert plan.source == STATS
+        assert plan.stats_range == "last_7_days"
+        assert LOCAL_ROLLUPS not in plan.candidates
+
+        plan = planner.plan(query(10, project="api"), missing_local_days=0)
+        assert plan.source == SUMMARIES
+
+        plan = planner.plan(query(3, branch="main"), missing_local_days=0)
+        assert plan.source == HEARTBEATS
+        assert plan.upstream_requests == 3
+
+        with pytest.raises(ValueError, match="editor, entity"):
+            planner.plan(query(3, editor="vim", entity="a.py"), 0)
+
+    def test_calibrated_costs_change_the_plan(self):
+        """Measured latencies replace defaults once enough were recorded."""
+        metrics = ClientMetrics()
+        for _ in range(10):
+            metrics.observe("request_seconds", 0.05, endpoint="get_stats")
+            metrics.observe("request_seconds", 0.8, endpoint="get_summaries")
+        # Too few samples to calibrate
+        metrics.observe("request_seconds", 9.0, endpoint="get_heartbeats")
+
+        model = CostModel(metrics)
+        assert model.request_seconds["get_stats"] == 0.05
+        assert model.request_seconds["get_summaries"] == 0.8
+        assert model.request_seconds["get_heartbeats"] == 0.2
+
+        plan = QueryPlanner(model).plan(query(7), missing_local_days=7)
+        assert plan.source == STATS
+        assert plan.as_metadata()["candidates"][LOCAL_ROLLUPS] == 0.8
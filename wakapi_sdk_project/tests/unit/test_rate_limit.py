@@ -0,0 +1,155 @@
+import asyncio
+import pytest
+import httpx
+
+from wakapi_sdk.client import WakapiClient, WakapiConfig
+from wakapi_sdk.core.rate_limit import (
+    BACKGROUND,
+    INTERACTIVE,
+    RateLimitConfig,
+    RateLimiter,
+    TokenBucket,
+    current_budget,
+    request_budget,
+)
+
+PROJECTS_BODY = {"data": []}
+
+
+def make_client(rate_limit: RateLimitConfig, handler) -> WakapiClient:
+    """Create a WakapiClient whose HTTP layer is served by handler."""
+    client = WakapiClient(
+        WakapiConfig(
+            base_url="http://localhost:3000/",
+            api_key="test_api_key",
+            rate_limit=rate_limit,
+        )
+    )
+    client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+class TestTokenBucket:
+    """Test suite for the token bucket."""
+
+    @pytest.mark.asyncio
+    async def test_burst_then_wait(self):
+        """Tokens beyond the burst capacity are paced at the refill rate."""
+        bucket = TokenBucket(rate=50.0, capacity=2)
+
+        assert await bucket.acquire() == 0.0
+        assert await bucket.acquire() == 0.0
+        assert await bucket.acquire() > 0.0
+
+    @pytest.mark.asyncio
+    async def test_try_acquire_does_not_wait(self):
+        """try_acquire takes a token only if one is available right away."""
+        bucket = TokenBucket(rate=1.0, capacity=1)
+
+        assert bucket.try_acquire()
+        assert not bucket.try_acquire()
+
+    @pytest.mark.asyncio
+    async def test_try_slot_does_not_wait(self):
+        """try_slot reports a full budget instead of queueing."""
+        limiter = RateLimiter(RateLimitConfig(max_concurrency=1))
+
+        async with limiter.slot():
+            async with limiter.try_slot() as admitted:
+                assert not admitted
+        async with limiter.try_slot() as admitted:
+            assert admitted
+
+    def test_rejects_non_positive_rate(self):
+        """A zero rate is a configuration error."""
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
+
+
+class TestRateLimiter:
+    """Test suite for the request budget limiter."""
+
+    @pytest.mark.asyncio
+    async def test_unlimited_by_default(self):
+        """Without configuration slots are granted immediately."""
+        limiter = RateLimiter()
+        async with limiter.slot() as waited:
+            assert waited < 0.01
+
+    @pytest.mark.asyncio
+    async def test_max_concurrency(self):
+        """No more than max_concurrency slots are held at once."""
+        limiter = RateLimiter(RateLimitConfig(max_concurrency=2))
+        in_flight = 0
+        peak = 0
+
+        async def work():
+            nonlocal in_flight, peak
+            async with limiter.slot():
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0.01)
+                in_flight -= 1
+
+        await asyncio.gather(*(work() for _ in range(6)))
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_budgets_are_independent(self):
+        """A saturated background budget does not block interactive calls."""
+        limiter = RateLimiter(RateLimitConfig(background_max_concurrency=1))
+
+        async with limiter.slot(BACKGROUND):
+            async with limiter.slot(INTERACTIVE) as waited:
+                assert waited < 0.01
+
+    @pytest.mark.asyncio
+    async def test_unknown_budget(self):
+        """Unknown budget names are rejected."""
+        with pytest.raises(ValueError):
+            async with RateLimiter().slot("batch"):
+                pass
+
+    def test_request_budget_context(self):
+        """request_budget switches the budget for the enclosed block only."""
+        assert current_budget() == INTERACTIVE
+        with request_budget(BACKGROUND):
+            assert current_budget() == BACKGROUND
+        assert current_budget() == INTERACTIVE
+
+
+class TestClientLimiter:
+    """Test suite for limiter integration in WakapiClient."""
+
+    @pytest.mark.asyncio
+    async def test_wait_time_recorded_in_metrics(self):
+        """Limiter wait time and request counts show up in client metrics."""
+        client = make_client(
+            RateLimitConfig(requests_per_second=50.0, burst=1),
+            lambda request: httpx.Response(200, json=PROJECTS_BODY),
+        )
+
+        await client.get_projects()
+        await client.get_projects()
+
+        waits = client.metrics.samples(
+            "limiter_wait_seconds", endpoint="get_projects", budget=INTERACTIVE
+        )
+        assert len(waits) == 2
+        assert waits[1] > 0.0
+        assert client.metrics.counter("requests", endpoint="get_projects") == 2
+
+    @pytest.mark.asyncio
+    async def test_background_budget_label(self):
+        """Requests inside request_budget are labelled with that budget."""
+        client = make_client(
+            RateLimitConfig(),
+            lambda request: httpx.Response(200, json=PROJECTS_BODY),
+        )
+
+        with request_budget(BACKGROUND):
+            await client.get_projects()
+
+        assert client.metrics.samples(
+            "limiter_wait_seconds", endpoint="get_projects", budget=BACKGROUND
+        )
@@ -0,0 +1,90 @@
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+from wakapi_sdk.client import StatsData
+from wakapi_sdk.core.rollups import stats_data, summary_totals
+from wakapi_sdk.core.store import DAY, MONTH, WEEK, LocalStore
+
+
+def day_totals(seconds: float) -> dict:
+    """Totals of a day with one project and language."""
+    return {"projects": {"api": seconds}, "languages": {"Python": seconds}}
+
+
+class TestStatsRollups:
+    """Test suite for day/week/month stats rollups."""
+
+    def test_plan_prefers_months_then_weeks(self):
+        """Complete months and weeks replace their days."""
+        store = LocalStore()
+        first, last = date(2024, 1, 1), date(2024, 2, 14)
+        store.save_stats_rollups(
+            "scope",
+            {
+                (first + timedelta(days=i)).isoformat(): day_totals(60.0)
+                for i in range((last - first).days + 1)
+            },
+        )
+
+        periods, missing = store.plan_stats_periods(
+            "scope", date(2024, 1, 1), date(2024, 2, 16)
+        )
+        # January, Feb 1-4 as days, the week of Feb 5, then days again since
+        # the week of Feb 12 is not complete
+        assert periods == [
+            (MONTH, "2024-01-01"),
+            (DAY, "2024-02-01"),
+            (DAY, "2024-02-02"),
+            (DAY, "2024-02-03"),
+            (DAY, "2024-02-04"),
+            (WEEK, "2024-02-05"),
+            (DAY, "2024-02-12"),
+            (DAY, "2024-02-13"),
+            (DAY, "2024-02-14"),
+        ]
+        assert missing == [date(2024, 2, 15), date(2024, 2, 16)]
+
+        totals = store.sum_stats_periods("scope", periods)
+        assert totals["projects"]["api"] == 45 * 60.0
+
+    def test_incremental_updates_rebuild_periods(self):
+        """Saving a day again updates the week and month containing it."""
+        store = LocalStore()
+        week = [date(2024, 3, 4) + timedelta(days=i) for i in range(7)]
+        store.save_stats_rollups(
+            "scope", {day.isoformat(): day_totals(10.0) for day in week}
+        )
+        store.save_stats_rollups("scope", {"2024-03-06": day_totals(100.0)})
+
+        periods, missing = store.plan_stats_periods("scope", week[0], week[-1])
+        assert periods == [(WEEK, "2024-03-04")]
+        assert not missing
+        assert store.sum_stats_periods("scope", periods)["languages"] == {
+            "Python": 160.0
+        }
+
+    def test_stats_data_shape(self):
+        """Rendered totals validate as StatsData."""
+        summary = SimpleNamespace(
+            projects=[SimpleNamespace(name="api", total_seconds=5400.0)],
+            languages=[
+                SimpleNamespace(name="Python", total_seconds=3600.0),
+                SimpleNamespace(name="Go", total_seconds=1800.0),
+            ],
+            editors=[],
+            operating_systems=[],
+            machines=[],
+            branches=[],
+            categories=[],
+        )
+        data = StatsData(
+            **stats_data(
+                summary_totals(summary), "2024-01-01", "2024-01-02", 2, "current"
+            )
+        )
+
+        assert data.total_seconds == 5400.0
+        assert data.daily_average == 2700.0
+        assert [entry.name for entry in data.languages] == ["Python", "Go"]
+        assert data.languages[0].percent == 66.67
+        assert data.projects[0].text == "1h 30m"
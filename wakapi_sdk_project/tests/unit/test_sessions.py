@@ -0,0 +1,53 @@
+from types import SimpleNamespace
+
+import pytest
+
+from wakapi_sdk.core.sessions import SessionDetector, detect_sessions
+
+
+def heartbeat(time, project="api", entity="main.py", language="Python"):
+    """Create a minimal heartbeat."""
+    return SimpleNamespace(time=time, project=project, entity=entity, language=language)
+
+
+class TestSessions:
+    """Test suite for streaming session detection."""
+
+    def test_gap_splits_sessions(self):
+        """A gap longer than the threshold starts a new session."""
+        heartbeats = [
+            heartbeat(0),
+            heartbeat(60, project="web", entity="app.ts", language="TypeScript"),
+            heartbeat(600, project="web", entity="app.ts", language="TypeScript"),
+            heartbeat(5000),
+        ]
+        sessions = list(detect_sessions(heartbeats, gap=900))
+
+        assert [(s.start, s.end, s.heartbeats) for s in sessions] == [
+            (0, 600, 3),
+            (5000, 5000, 1),
+        ]
+        first = sessions[0]
+        assert first.duration == 600
+        assert first.dominant_project == "web"
+        assert first.projects == {"api": 60, "web": 540}
+        assert set(first.languages) == {"Python", "TypeScript"}
+        assert sessions[1].dominant_project == "api"
+
+    def test_sessions_emitted_as_they_close(self):
+        """feed returns a session only once a gap closes it."""
+        detector = SessionDetector(gap=100)
+
+        assert detector.feed(heartbeat(0)) is None
+        assert detector.feed(heartbeat(50)) is None
+        closed = detector.feed(heartbeat(500))
+        assert (closed.start, closed.end) == (0, 50)
+        assert detector.close().start == 500
+        assert detector.close() is None
+
+    def test_out_of_order(self):
+        """Heartbeats must arrive sorted by time."""
+        detector = SessionDetector()
+        detector.feed(heartbeat(100))
+        with pytest.raises(ValueError):
+            detector.feed(heartbeat(50))
@@ -0,0 +1,81 @@
+from types import SimpleNamespace
+
+import pytest
+
+from wakapi_sdk.core.sketches import (
+    ActivitySketch,
+    CountMinSketch,
+    HyperLogLog,
+)
+from wakapi_sdk.core.store import LocalStore
+
+
+def heartbeat(time, entity, branch="main", project="api"):
+    """Create a minimal heartbeat."""
+    return SimpleNamespace(time=time, entity=entity, branch=branch, project=project)
+
+
+class TestSketches:
+    """Test suite for the approximate sketches."""
+
+    def test_hyperloglog_merge(self):
+        """Merged sketches estimate the size of the union."""
+        first, second = HyperLogLog(), HyperLogLog()
+        first.update(f"file-{i}" for i in range(6000))
+        second.update(f"file-{i}" for i in range(3000, 10000))
+        first.merge(second)
+
+        assert first.count() == pytest.approx(10000, rel=0.05)
+        assert HyperLogLog.from_bytes(first.to_bytes()).count() == first.count()
+
+    def test_hyperloglog_small_counts(self):
+        """Small cardinalities are close to exact."""
+        sketch = HyperLogLog()
+        sketch.update(["a.py", "b.py", "a.py", "c.py"])
+
+        assert round(sketch.count()) == 3
+
+    def test_count_min_never_underestimates(self):
+        """Estimates are upper bounds that survive merging and serialization."""
+        first, second = CountMinSketch(width=64), CountMinSketch(width=64)
+        for i in range(200):
+            first.add(f"file-{i}", 1.0)
+        first.add("hot.py", 500.0)
+        second.add("hot.py", 250.0)
+        first.merge(second)
+        restored = CountMinSketch.from_bytes(first.to_bytes())
+
+        assert restored.estimate("hot.py") >= 750.0
+        assert restored.estimate("hot.py") < 800.0
+        assert all(restored.estimate(f"file-{i}") >= 1.0 for i in range(200))
+
+    def test_activity_sketch_roundtrip(self, tmp_path):
+        """Daily sketches stored in the local store merge into range answers."""
+        days = {
+            "2024-01-01": [heartbeat(0, "a.py"), heartbeat(300, "b.py")],
+            "2024-01-02": [
+                heartbeat(0, "b.py", branch="dev"),
+                heartbeat(60, "c.py", project="web"),
+                heartbeat(90, "c.py", project="web"),
+            ],
+        }
+        store = LocalStore(str(tmp_path / "store.sqlite"))
+        store.save_sketches(
+            "scope",
+            {
+                day: ActivitySketch.from_heartbeats(heartbeats, 600).to_blobs()
+                for day, heartbeats in days.items()
+            },
+        )
+
+        merged = ActivitySketch()
+        for blobs in store.sketches("scope", list(days) + ["2024-01-03"]).values():
+            merged.merge(ActivitySketch.from_blobs(blobs))
+
+        assert {n: round(h.count()) for n, h in merged.distinct.items()} == {
+            "entity": 3,
+            "branch": 2,
+            "project": 2,
+        }
+        assert merged.heavy_hitters(1) == [("a.py", pytest.approx(300.0))]
+        assert dict(merged.heavy_hitters(3))["b.py"] == pytest.approx(60.0)
@@ -0,0 +1,62 @@
+from datetime import timezone, timedelta
+from types import SimpleNamespace
+from zoneinfo import ZoneInfo
+
+from wakapi_sdk.core.durations import hourly_durations
+from wakapi_sdk.core.store import LocalStore, scope_key
+
+
+def heartbeat(time):
+    """Create a minimal heartbeat."""
+    return SimpleNamespace(time=time)
+
+
+class TestLocalStore:
+    """Test suite for the local rollup store."""
+
+    def test_hourly_rollups_roundtrip(self, tmp_path):
+        """Saved days are returned from a reopened store; others are absent."""
+        scope = scope_key(user="current", tz="UTC")
+        path = tmp_path / "store" / "wakapi.sqlite"
+        store = LocalStore(str(path))
+        hours = [0.0] * 24
+        hours[9] = 1800.0
+        store.save_hourly_rollups(scope, {"2024-01-01": hours})
+        store.close()
+
+        store = LocalStore(str(path))
+        rollups = store.hourly_rollups(scope, ["2024-01-01", "2024-01-02"])
+        assert rollups == {"2024-01-01": hours}
+        assert store.hourly_rollups("other", ["2024-01-01"]) == {}
+
+    def test_scope_key_is_order_independent(self):
+        """Scopes name every parameter, whatever the argument order."""
+        assert scope_key(a=1, b=None) == scope_key(b=None, a=1) == "a=1|b="
+
+
+class TestHourlyDurations:
+    """Test suite for hourly duration totals."""
+
+    def test_buckets_in_local_time(self):
+        """Gaps count towards the local hour of the earlier heartbeat."""
+        # 2024-01-01 09:50 and 10:05 UTC, then a heartbeat after the timeout
+        start = 1704102600.0
+        heartbeats = [heartbeat(start), heartbeat(start + 900), heartbeat(start + 960)]
+
+        utc = hourly_durations(heartbeats, timeout=600, tz=timezone.utc)
+        assert utc[9] == 600 and utc[10] == 60 and utc.sum() == 660
+
+        shifted = hourly_durations(
+            heartbeats, timeout=600, tz=timezone(timedelta(hours=2))
+        )
+        assert shifted[11] == 600 and shifted[12] == 60
+
+    def test_dst_change(self):
+        """Each heartbeat uses its own offset when the day crosses DST."""
+        # 2024-03-31 in Berlin: 00:30 CET (UTC+1), then 03:30 CEST (UTC+2)
+        cet, cest = 1711841400.0, 1711848600.0
+        heartbeats = [heartbeat(cet), heartbeat(cest), heartbeat(cest + 60)]
+        hours = hourly_durations(heartbeats, timeout=600, tz=ZoneInfo("Europe/Berlin"))
+
+        assert hours[0] == 600
+        assert hours[3] == 60
@@ -0,0 +1,315 @@
+import asyncio
+import json
+from datetime import date
+
+import httpx
+import pytest
+
+from wakapi_sdk.client import WakapiClient, WakapiConfig
+from wakapi_sdk.client import HeartbeatEntry
+from wakapi_sdk.core.deadline import deadline
+from wakapi_sdk.core.exceptions import ConfigurationError, DeadlineExceededError
+from wakapi_sdk.core.streaming import (
+    HeartbeatStreamConfig,
+    JsonArrayParser,
+    gather_or_cancel,
+    prefetched,
+)
+
+
+def heartbeat(day: str, time: float) -> dict:
+    """A heartbeat of day as returned by Wakapi."""
+    return {
+        "id": f"{day}-{time}",
+        "project": "api",
+        "language": "Python",
+        "entity": "main.py",
+        "time": time,
+        "is_write": False,
+    }
+
+
+class TestHeartbeatStreaming:
+    """Test suite for prefetching heartbeat streams."""
+
+    @pytest.mark.asyncio
+    async def test_prefetch_is_bounded_and_ordered(self):
+        """At most lookahead fetches run while items are yielded in order."""
+        in_flight = 0
+        peak = 0
+
+        async def fetch(item):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            # Later items finish first
+            await asyncio.sleep(0.001 * (10 - item))
+            in_flight -= 1
+            return item * 2
+
+        results = [pair async for pair in prefetched(range(10), fetch, lookahead=3)]
+        assert results == [(i, i * 2) for i in range(10)]
+        assert peak == 3
+
+    @pytest.mark.asyncio
+    async def test_stopping_cancels_prefetched_fetches(self):
+        """Fetches ahead of a consumer that stops early are cancelled."""
+        cancelled = []
+
+        async def fetch(item):
+            try:
+                await asyncio.sleep(0 if item == 0 else 10)
+            except asyncio.CancelledError:
+                cancelled.append(item)
+                raise
+            return item
+
+        stream = prefetched(range(100), fetch, lookahead=4)
+        assert await stream.__anext__() == (0, 0)
+        await stream.aclose()
+        assert sorted(cancelled) == [1, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_later_failure_stops_stream_early(self):
+        """A failing prefetch is raised without waiting for earlier items."""
+        cancelled = []
+
+        async def fetch(item):
+            if item == 2:
+                raise RuntimeError("boom")
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(item)
+                raise
+
+        with pytest.raises(RuntimeError, match="boom"):
+            async with asyncio.timeout(1):
+                async for _ in prefetched(range(5), fetch, lookahead=3):
+                    pass
+        assert sorted(cancelled) == [0, 1]
+
+    @pytest.mark.asyncio
+    async def test_gather_or_cancel(self):
+        """Results keep their order; the first failure cancels the others."""
+
+        async def value(item, delay):
+            await asyncio.sleep(delay)
+            return item
+
+        assert await gather_or_cancel(value(1, 0.002), value(2, 0)) == [1, 2]
+
+        cancelled = []
+
+        async def slow():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        async def fail():
+            raise KeyError("day")
+
+        with pytest.raises(KeyError):
+            async with asyncio.timeout(1):
+                await gather_or_cancel(slow(), fail(), slow())
+        assert cancelled == [True, True]
+
+    @pytest.mark.asyncio
+    async def test_gather_or_cancel_skips_cancellations(self):
+        """Cancellations in nested groups are not taken for the failure."""
+
+        async def raise_group(*errors):
+            raise BaseExceptionGroup(
+                "nested",
+                [BaseExceptionGroup("inner", [asyncio.CancelledError()])]
+                + list(errors),
+            )
+
+        # A task's own group is its failure, less the cancellations
+        with pytest.raises(ExceptionGroup) as excinfo:
+            await gather_or_cancel(raise_group(KeyError("day")))
+        assert [type(error) for error in excinfo.value.exceptions] == [KeyError]
+        assert excinfo.value.__suppress_context__
+
+        with pytest.raises(asyncio.CancelledError):
+            await gather_or_cancel(raise_group())
+
+    @pytest.mark.asyncio
+    async def test_cancelled_requests_are_counted(self):
+        """Cancelling a caller cancels its request and records it."""
+        started = asyncio.Event()
+
+        async def handler(request):
+            started.set()
+            await asyncio.sleep(10)
+
+        client = WakapiClient(
+            WakapiConfig(base_url="http://localhost:3000/", api_key="key"),
+            transport=httpx.MockTransport(handler),
+        )
+        task = asyncio.create_task(client.get_heartbeats(date="2024-01-01"))
+        await started.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert (
+            client.metrics.counter("requests_cancelled", endpoint="get_heartbeats") == 1
+        )
+        assert client.metrics.counter("request_errors", endpoint="get_heartbeats") == 0
+
+    @pytest.mark.asyncio
+    async def test_iter_heartbeats_across_days(self):
+        """Heartbeats of every day are yielded in time order."""
+        requested = []
+
+        def handler(request):
+            day = request.url.params["date"]
+            requested.append(day)
+            times = [300.0, 100.0] if day == "2024-01-02" else []
+            return httpx.Response(
+                200,
+                json={
+                    "data": [heartbeat(day, t) for t in times],
+                    "start": day,
+                    "end": day,
+                    "timezone": "UTC",
+                },
+            )
+
+        client = WakapiClient(
+            WakapiConfig(
+                base_url="http://localhost:3000/",
+                api_key="key",
+                heartbeat_stream=HeartbeatStreamConfig(prefetch_days=2),
+            ),
+            transport=httpx.MockTransport(handler),
+        )
+        entries = [
+            entry
+            async for entry in client.iter_heartbeats(
+                date(2024, 1, 1), date(2024, 1, 3), project="api"
+            )
+        ]
+        assert [entry.time for entry in entries] == [100.0, 300.0]
+        assert sorted(requested) == ["2024-01-01", "2024-01-02", "2024-01-03"]
+
+    def test_parser_handles_any_chunking(self):
+        """Elements and other members parse the same whatever the chunk size."""
+        document = json.dumps(
+            {
+                "start": "2024-01-01",
+                "data": [{"id": str(i), "entity": 'a "]},' * i} for i in range(20)],
+                "count": 20,
+                "timezone": "Europe/Berlin",
+            }
+        )
+        for size in (1, 3, 17, len(document)):
+            parser = JsonArrayParser("data")
+            items = []
+            for offset in range(0, len(document), size):
+                items.extend(parser.feed(document[offset : offset + size]))
+            items.extend(parser.feed("", final=True))
+            assert items == json.loads(document)["data"]
+            assert parser.fields == {
+                "start": "2024-01-01",
+                "count": 20,
+                "timezone": "Europe/Berlin",
+            }
+
+    def test_parser_rejects_truncated_documents(self):
+        """A document ending inside the array is an error."""
+        parser = JsonArrayParser("data")
+        assert parser.feed('{"data": [{"id": "1"}, {"id"') == [{"id": "1"}]
+        with pytest.raises(ValueError):
+            parser.feed("", final=True)
+
+    @pytest.mark.asyncio
+    async def test_stream_heartbeats_incrementally(self):
+        """Heartbeats are yielded while the response body is still arriving."""
+        body = json.dumps(
+            {
+                "data": [heartbeat("2024-01-02", float(t)) for t in range(50)],
+                "start": "2024-01-02",
+                "end": "2024-01-02",
+                "timezone": "UTC",
+            }
+        ).encode()
+        sent = []
+
+        class Body(httpx.AsyncByteStream):
+            async def __aiter__(self):
+                for offset in range(0, len(body), 256):
+                    sent.append(offset)
+                    yield body[offset : offset + 256]
+
+        client = WakapiClient(
+            WakapiConfig(base_url="http://localhost:3000/", api_key="key"),
+            transport=httpx.MockTransport(
+                lambda request: httpx.Response(200, stream=Body())
+            ),
+        )
+        stream = client.stream_heartbeats(date="2024-01-02")
+        first = await stream.__anext__()
+        assert isinstance(first, HeartbeatEntry)
+        assert len(sent) < len(body) / 256
+        rest = [entry async for entry in stream]
+        assert [entry.time for entry in [first, *rest]] == [float(t) for t in range(50)]
+
+        rows = [
+            row async for row in client.stream_heartbeats("2024-01-02", validate=False)
+        ]
+        assert rows[0]["id"] == "2024-01-02-0.0"
+
+    @pytest.mark.asyncio
+    async def test_stream_covers_body(self):
+        """Slots, timing and the deadline span reading the body."""
+        body = json.dumps({"data": [heartbeat("2024-01-02", 1.0)]}).encode()
+        in_flight = []
+
+        class Body(httpx.AsyncByteStream):
+            async def __aiter__(self):
+                in_flight.append(client.concurrency.in_flight)
+                await asyncio.sleep(0.05)
+                yield body
+
+        client = WakapiClient(
+            WakapiConfig(base_url="http://localhost:3000/", api_key="key"),
+            transport=httpx.MockTransport(
+                lambda request: httpx.Response(200, stream=Body())
+            ),
+        )
+        assert len([entry async for entry in client.stream_heartbeats("2024-01-02")])
+        assert in_flight == [1]
+        assert client.concurrency.in_flight == 0
+        samples = client.metrics.samples("request_seconds", endpoint="get_heartbeats")
+        assert samples[0] >= 0.05
+
+        with pytest.raises(DeadlineExceededError):
+            with deadline(0.01):
+                async for _ in client.stream_heartbeats("2024-01-02"):
+                    pass
+        assert client.concurrency.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_stream_error_payload(self):
+        """Error payloads raise like get_heartbeats."""
+        client = WakapiClient(
+            WakapiConfig(
+                base_url="http://localhost:3000/",
+                api_key="key",
+                heartbeat_stream=HeartbeatStreamConfig(incremental_parse=True),
+            ),
+            transport=httpx.MockTransport(
+                lambda request: httpx.Response(200, json={"error": "bad date"})
+            ),
+        )
+        with pytest.raises(ValueError, match="bad date"):
+            async for _ in client.iter_heartbeats(date(2024, 1, 1), date(2024, 1, 1)):
+                pass
+
+    def test_rejects_empty_window(self):
+        """At least one day must be prefetched."""
+        with pytest.raises(ConfigurationError):
+            HeartbeatStreamConfig(prefetch_days=0)
@@ -31,7 +31,7 @@ class TestWakapiClient:
     @pytest.mark.asyncio
     async def test_get_stats_success(self, config, mock_httpx_client):
         """Test successful retrieval of user statistics for the 'today' range."""
-        mock_response = Mock()
+        mock_response = Mock(headers=httpx.Headers(), content=b"")
         mock_data = {
             "total_seconds": 3600.0,
             "human_readable_total": "1h 0m",
@@ -88,12 +88,13 @@ class TestWakapiClient:
             "http://localhost:3000/api/compat/wakatime/v1/users/current/stats/today",
             params={},
             headers=ANY,
+            timeout=30.0,
         )
 
     @pytest.mark.asyncio
     async def test_get_projects_success(self, config, mock_httpx_client):
         """Test successful retrieval of user's projects."""
-        mock_response = Mock()
+        mock_response = Mock(headers=httpx.Headers(), content=b"")
         mock_data = [
             {
                 "id": "1",
@@ -118,12 +119,13 @@ class TestWakapiClient:
             "http://localhost:3000/api/compat/wakatime/v1/users/current/projects",
             params={},
             headers=ANY,
+            timeout=5.0,
         )
 
     @pytest.mark.asyncio
     async def test_http_error_handling(self, config, mock_httpx_client):
         """Test handling of HTTP errors in API calls."""
-        mock_response = Mock()
+        mock_response = Mock(headers=httpx.Headers(), content=b"")
         mock_response.status_code = 404
         mock_response.raise_for_status.side_effect = httpx.HTTPStatusError(
             message="404 Client Error: Not Found",
@@ -167,7 +169,7 @@ class TestWakapiClient:
     @pytest.mark.asyncio
     async def test_get_heartbeats_success(self, config, mock_httpx_client):
         """Test successful retrieval of heartbeats with parameters."""
-        mock_response = Mock()
+        mock_response = Mock(headers=httpx.Headers(), content=b"")
         mock_data = [
             {
                 "id": "1",
@@ -201,12 +203,13 @@ class TestWakapiClient:
             "http://localhost:3000/api/compat/wakatime/v1/users/current/heartbeats",
             params={"date": "2023-01-01", "project": "test_project", "limit": 10},
             headers=ANY,
+            timeout=15.0,
         )
 
     @pytest.mark.asyncio
     async def test_get_heartbeats_empty(self, config, mock_httpx_client):
         """Test retrieval of heartbeats when no data is present."""
-        mock_response = Mock()
+        mock_response = Mock(headers=httpx.Headers(), content=b"")
         mock_response.json.return_value = {
             "data": [],
             "start": "2023-01-01",
@@ -224,7 +227,7 @@ class TestWakapiClient:
     @pytest.mark.asyncio
     async def test_get_user_success(self, config, mock_httpx_client):
         """Test successful retrieval of user information."""
-        mock_response = Mock()
+        mock_response = Mock(headers=httpx.Headers(), content=b"")
         mock_data = {
             "id": "1",
             "username": "test_user",
@@ -253,13 +256,15 @@ class TestWakapiClient:
         assert user.data.email == "test@example.com"
 
         mock_httpx_client.get.assert_called_once_with(
-            "http://localhost:3000/api/compat/wakatime/v1/users/current", headers=ANY
+            "http://localhost:3000/api/compat/wakatime/v1/users/current",
+            headers=ANY,
+            timeout=5.0,
         )
 
     @pytest.mark.asyncio
     async def test_get_user_not_found(self, config, mock_httpx_client):
         """Test handling of user not found (404) error."""
-        mock_response = Mock()
+        mock_response = Mock(headers=httpx.Headers(), content=b"")
         mock_response.status_code = 404
         mock_response.raise_for_status.side_effect = httpx.HTTPStatusError(
             message="404 Client Error: Not Found",
@@ -276,7 +281,7 @@ class TestWakapiClient:
     @pytest.mark.asyncio
     async def test_get_leaders_success(self, config, mock_httpx_client):
         """Test successful retrieval of leaderboard."""
-        mock_response = Mock()
+        mock_response = Mock(headers=httpx.Headers(), content=b"")
         mock_data = [
             {
                 "rank": 1,
@@ -359,5 +364,7 @@ class TestWakapiClient:
         assert leaders.data[1].user.username == "leader2"
 
         mock_httpx_client.get.assert_called_once_with(
-            "http://localhost:3000/api/compat/wakatime/v1/leaders", headers=ANY
+            "http://localhost:3000/api/compat/wakatime/v1/leaders",
+            headers=ANY,
+            timeout=15.0,
         )